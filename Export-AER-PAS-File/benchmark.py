@@ -0,0 +1,199 @@
+"""Benchmark the PAS validator on synthetic samples.
+
+    python benchmark.py --sizes 1 1000 100000 1000000 --output bench.json
+    python benchmark.py --sizes 1 1000 --baseline bench.json
+
+For each of OAN, WAN and GAN this times subset, then format_data and
+check_pas_data one sample at a time, format_frame and validate_frame in
+batches, and validate_files across worker processes. Samples come from
+pas_samples.SampleGenerator; the format modes use valid samples only, since
+a broken value such as "abc" in a NUMB field cannot be formatted. Per-sample
+modes are timed on at most --scalar-limit samples and files on at most
+--file-limit; estimated_seconds scales those up to the full size. Results
+are written as JSON, and --baseline exits 1 if any mode got slower per
+sample than the tolerance allows.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+from datetime import datetime, timezone
+
+from export_to_pas import PAS, VALIDATOR_VERSION
+from parallel_validate import validate_files
+from pas_samples import SampleGenerator
+from pas_writer import PASWriter
+from spec_cache import SPEC_PATH, load_spec
+
+TYPES = ("OAN", "WAN", "GAN")
+SIZES = (1, 1000, 100000, 1000000)
+
+
+def result(pas_type, mode, size, timed, seconds):
+    per_sample = seconds / timed if timed else None
+    return {
+        "type": pas_type,
+        "mode": mode,
+        "size": size,
+        "timed": timed,
+        "seconds": round(seconds, 6),
+        "per_sample": per_sample,
+        "estimated_seconds": round(per_sample * size, 6) if per_sample is not None and size else None,
+    }
+
+
+def bench_subset(spec, pas_type, repeat):
+    copies = [spec.copy() for _ in range(repeat)]
+    start = time.perf_counter()
+    for pt in copies:
+        PAS(pt).subset(pas_type)
+    return result(pas_type, "subset", None, repeat, time.perf_counter() - start)
+
+
+def bench_scalar(pas, generator, size, limit, broken_fraction):
+    results = []
+
+    samples = [sample for sample, _ in generator.iter_rows(min(size, limit))]
+    start = time.perf_counter()
+    for sample in samples:
+        pas.format_data(sample)
+    results.append(result(pas.pas_type, "format_data", size, len(samples), time.perf_counter() - start))
+
+    samples = [sample for sample, _ in generator.iter_rows(min(size, limit), broken_fraction)]
+    start = time.perf_counter()
+    for sample in samples:
+        pas.data = sample
+        pas.check_pas_data(collect=True)
+    results.append(result(pas.pas_type, "check_pas_data", size, len(samples), time.perf_counter() - start))
+
+    return results
+
+
+def bench_batch(pas, generator, size, chunk_size, broken_fraction):
+    seconds = {"format_frame": 0.0, "validate_frame": 0.0}
+    for offset in range(0, size, chunk_size):
+        rows = min(chunk_size, size - offset)
+
+        frame, _ = generator.frame(rows)
+        start = time.perf_counter()
+        pas.format_frame(frame)
+        seconds["format_frame"] += time.perf_counter() - start
+
+        frame, _ = generator.frame(rows, broken_fraction)
+        start = time.perf_counter()
+        pas.validate_frame(frame)
+        seconds["validate_frame"] += time.perf_counter() - start
+
+    return [result(pas.pas_type, mode, size, size, s) for mode, s in seconds.items()]
+
+
+def bench_files(writer, pas_type, generator, size, limit, jobs, broken_fraction):
+    directory = tempfile.mkdtemp()
+    try:
+        paths = generator.write_files(directory, min(size, limit), broken_fraction, writer)
+
+        start = time.perf_counter()
+        validate_files(paths, workers=jobs, chunksize=max(1, len(paths) // (4 * jobs)))
+        return result(pas_type, "validate_files", size, len(paths), time.perf_counter() - start)
+    finally:
+        shutil.rmtree(directory)
+
+
+def run(sizes=SIZES, types=TYPES, profiles=64, broken_fraction=0.1, scalar_limit=10000,
+        chunk_size=100000, file_limit=1000, jobs=None, seed=0, log=None):
+    """Run every benchmark and return the JSON-ready results document."""
+    jobs = jobs or os.cpu_count() or 1
+    spec = load_spec(SPEC_PATH)
+    writer = PASWriter(spec)
+    results = []
+
+    for pas_type in types:
+        results.append(bench_subset(spec, pas_type, 20))
+
+        pas = PAS(spec.copy())
+        pas.subset(pas_type)
+        generator = SampleGenerator(pas, profiles, seed)
+
+        for size in sizes:
+            results.extend(bench_scalar(pas, generator, size, scalar_limit, broken_fraction))
+            results.extend(bench_batch(pas, generator, size, chunk_size, broken_fraction))
+            results.append(bench_files(writer, pas_type, generator, size, file_limit, jobs, broken_fraction))
+            if log is not None:
+                log.write("%s %d done\n" % (pas_type, size))
+                log.flush()
+
+    import numpy
+    import pandas
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "validator_version": VALIDATOR_VERSION,
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "pandas": pandas.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "jobs": jobs,
+            "profiles": profiles,
+            "broken_fraction": broken_fraction,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def regressions(current, baseline, tolerance=0.25):
+    """(type, mode, size, baseline, current) for each per-sample slowdown past tolerance."""
+    before = {(r["type"], r["mode"], r["size"]): r["per_sample"] for r in baseline["results"]}
+    slower = []
+    for r in current["results"]:
+        old = before.get((r["type"], r["mode"], r["size"]))
+        if old and r["per_sample"] and r["per_sample"] > old * (1 + tolerance):
+            slower.append((r["type"], r["mode"], r["size"], old, r["per_sample"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the PAS validator on synthetic samples.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--types", nargs="+", default=list(TYPES), choices=TYPES)
+    parser.add_argument("--profiles", type=int, default=64, help="valid gate profiles per type")
+    parser.add_argument("--broken-fraction", type=float, default=0.1)
+    parser.add_argument("--scalar-limit", type=int, default=10000, help="max samples timed one at a time")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="rows per validate_frame batch")
+    parser.add_argument("--file-limit", type=int, default=1000, help="max files for validate_files")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    document = run(
+        args.sizes, args.types, args.profiles, args.broken_fraction, args.scalar_limit,
+        args.chunk_size, args.file_limit, args.jobs, args.seed, log=sys.stderr,
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(document, json.load(f), args.tolerance)
+        for pas_type, mode, size, old, new in slower:
+            sys.stderr.write("REGRESSION: %s %s size=%s %.3g -> %.3g s/sample\n" % (pas_type, mode, size, old, new))
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
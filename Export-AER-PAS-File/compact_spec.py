@@ -0,0 +1,125 @@
+import sys
+from array import array
+
+KINDS = ("DAY", "CHAR", "NUMB")
+DAY, CHAR, NUMB = range(len(KINDS))
+
+
+def kind_code(size):
+    """Integer kind of a FIELD SIZE, as PAS.field_kind names it.
+
+    Like field_kind, a missing size is an error (TypeError), not NUMB.
+    """
+    if "YYYY MM DD" in size:
+        return DAY
+    if "CHAR" in size:
+        return CHAR
+    return NUMB
+
+
+class SpecRecord:
+    """One spec row as the validator needs it; kind is an index into KINDS."""
+
+    __slots__ = ("mnemonic", "field", "size", "rule", "kind")
+
+    def __init__(self, mnemonic, field, size, rule, kind):
+        self.mnemonic = mnemonic
+        self.field = field
+        self.size = size
+        self.rule = rule
+        self.kind = kind
+
+    def __repr__(self):
+        return "SpecRecord(%r, %r, %r, kind=%s)" % (self.mnemonic, self.field, self.size, KINDS[self.kind])
+
+    def row(self):
+        """(mnemonic, field, size, rule), as PAS.use_rows takes it."""
+        return self.mnemonic, self.field, self.size, self.rule
+
+
+class CompactSpec:
+    """The spec rows as categorical columns.
+
+    Each column is a tuple of its distinct values, interned, and an array of
+    row codes into that tuple, so a section name or rule text repeated over
+    hundreds of rows is stored once and a row costs a few bytes per column.
+    Field kinds are kept as integer codes (see KINDS) and the rows of each
+    ANALYSIS as an array of row numbers. Pickles are small for the same
+    reason, which keeps handing the spec to pool workers cheap.
+
+    keep names the columns to hold; the free-text description columns are
+    most of the spec's size and the validator never reads them.
+    """
+
+    __slots__ = ("columns", "categories", "codes", "kinds", "partitions")
+
+    def __init__(self, columns, rows, keep=None):
+        columns = list(columns)
+        self.columns = list(keep) if keep is not None else columns
+        self.categories = []
+        self.codes = []
+
+        rows = list(rows)
+        for name in self.columns:
+            i = columns.index(name)
+            lookup = {}
+            for row in rows:
+                lookup.setdefault(row[i], len(lookup))
+            self.categories.append(tuple(sys.intern(v) if isinstance(v, str) else v for v in lookup))
+            self.codes.append(array("H" if len(lookup) <= 0xFFFF else "I", (lookup[row[i]] for row in rows)))
+
+        size = self.column("FIELD SIZE")
+        self.kinds = array("B", (kind_code(self.categories[size][code]) for code in self.codes[size]))
+
+        analysis = self.column("ANALYSIS")
+        self.partitions = {}
+        for number, code in enumerate(self.codes[analysis]):
+            self.partitions.setdefault(self.categories[analysis][code], array("I")).append(number)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def column(self, name):
+        return self.columns.index(name)
+
+    def types(self):
+        return list(self.partitions)
+
+    def value(self, column, number):
+        return self.categories[column][self.codes[column][number]]
+
+    def rows(self, pas_type=None, columns=None):
+        """The rows of pas_type (all rows if None) as tuples of values."""
+        numbers = self.partitions.get(pas_type, ()) if pas_type is not None else range(len(self))
+        columns = [self.column(name) for name in columns] if columns else range(len(self.columns))
+        decoded = [(self.categories[c], self.codes[c]) for c in columns]
+        return [tuple(values[codes[n]] for values, codes in decoded) for n in numbers]
+
+    def records(self, pas_type):
+        """The rows of pas_type as SpecRecords."""
+        return [
+            SpecRecord(*row, kind=self.kinds[number])
+            for number, row in zip(
+                self.partitions.get(pas_type, ()),
+                self.rows(pas_type, ["MNEMONIC NAME", "FIELD", "FIELD SIZE", "BUSINESS RULES AND EDITS"]),
+            )
+        ]
+
+    def frame(self, pas_type=None):
+        """A DataFrame of pas_type's rows with every column categorical."""
+        import numpy as np
+        import pandas as pd
+
+        numbers = (
+            np.frombuffer(self.partitions[pas_type], dtype=np.uint32)
+            if pas_type is not None
+            else np.arange(len(self))
+        )
+        data = {}
+        for name, values, codes in zip(self.columns, self.categories, self.codes):
+            present = {v: i for i, v in enumerate(v for v in values if v is not None)}
+            remap = np.array([present.get(v, -1) for v in values], dtype=np.int32)
+            row_codes = remap[np.frombuffer(codes, dtype=codes.typecode)[numbers]] if values else []
+            column = pd.Categorical.from_codes(row_codes, categories=list(present))
+            data[name] = column.remove_unused_categories()
+        return pd.DataFrame(data)
@@ -1,84 +1,294 @@
+import re
 import sys
 import math
-import pandas as pd
-from datetime import datetime
-
-
-def check_valid_day_format(mnemonic, day):
-    if len(day) != 3 and len(day[0]) != 4 and len(day[1]) != 2 and len(day[2]) != 2:
-        sys.exit("ERROR: %s must be in [YYYY MM DD] format." % (mnemonic))
-
-
-def check_char_size(mnemonic, value, size):
+from datetime import date
+from types import SimpleNamespace
+from collections import namedtuple
+from pas_dates import DAY_LAYOUT, day_parts, parse_day, parse_days
+from pas_rules import compile_gates, gate_holds, gate_mask
+
+
+ValidationFailure = namedtuple(
+    "ValidationFailure", ["mnemonic", "rule", "value", "message", "source"], defaults=[None]
+)
+
+# One compiled spec row. kind is "DAY", "CHAR" or "NUMB"; bounds holds the
+# (min, max) ranges from units_range and mnemonic_range that apply to it and
+# gates the pas_rules.Gates for its cross-field rules.
+MnemonicRule = namedtuple(
+    "MnemonicRule",
+    [
+        "mnemonic",
+        "field",
+        "size",
+        "rule",
+        "kind",
+        "width",
+        "decimals",
+        "nullable",
+        "allow_zero",
+        "non_negative",
+        "codes",
+        "bounds",
+        "pair",
+        "date_dependency",
+        "depth",
+        "gates",
+    ],
+)
+
+FIELD_SIZE = re.compile(r"(?:CHAR|NUMB)\s+(\d+)(?:\s*,\s*(\d+))?")
+
+# Bump whenever a check changes what it reports, so cached results from
+# result_cache are not reused across rule changes.
+VALIDATOR_VERSION = 2
+
+
+def fail(report, mnemonic, rule, value, message):
+    if report is None:
+        sys.exit(message)
+    report.add(mnemonic, rule, value, message)
+
+
+def check_valid_day_format(mnemonic, day, report=None, layout=DAY_LAYOUT):
+    if parse_day(day, day_parts(layout)) is None:
+        fail(report, mnemonic, "day_format", day, "ERROR: %s must be in [%s] format." % (mnemonic, layout))
+
+
+def check_char_size(mnemonic, value, size, report=None):
     if len(value) > size:
-        sys.exit("ERROR: %s size is greater than %s." % (mnemonic, size))
+        fail(report, mnemonic, "char_size", value, "ERROR: %s size is greater than %s." % (mnemonic, size))
 
 
-def check_required_null(mnemonic, value):
+def check_required_null(mnemonic, value, report=None):
     if value is not None:
-        sys.exit("ERROR: %s must be null." % (mnemonic))
+        fail(report, mnemonic, "required_null", value, "ERROR: %s must be null." % (mnemonic))
 
 
-def check_required(mnemonic, value):
+def check_required(mnemonic, value, report=None):
     if value is None:
-        sys.exit("ERROR: %s must not be null." % (mnemonic))
+        fail(report, mnemonic, "required", value, "ERROR: %s must not be null." % (mnemonic))
+
+
+def check_required_two(mnemonics, data, report=None):
+    if data.get(mnemonics[0]) is None and data.get(mnemonics[1]) is None:
+        fail(report, mnemonics[0], "required_two", None, "ERROR: %s and %s must not both be null." % mnemonics)
 
 
-def check_required_two(mnemonics, data):
-    if data[mnemonics[0]] is None and data[mnemonics[1]] is None:
-        sys.exit("ERROR: %s and %s must not both be null." % mnemonics)
+def check_numeric(mnemonic, value, report=None):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        fail(report, mnemonic, "numeric", value, "ERROR: %s must be numeric." % (mnemonic))
 
 
-def check_zero(mnemonic, value):
+def check_zero(mnemonic, value, report=None):
     if value == 0:
-        sys.exit("ERROR: %s must not be 0." % (mnemonic))
+        fail(report, mnemonic, "zero", value, "ERROR: %s must not be 0." % (mnemonic))
 
 
-def check_negative(mnemonic, value):
+def check_negative(mnemonic, value, report=None):
     if value < 0:
-        sys.exit("ERROR: %s must not be negative." % (mnemonic))
+        fail(report, mnemonic, "negative", value, "ERROR: %s must not be negative." % (mnemonic))
 
 
-def check_num_range(mnemonic, value, rmin, rmax):
+def check_num_range(mnemonic, value, rmin, rmax, report=None):
     if not (rmin < value and value < rmax):
-        sys.exit("ERROR: %s must be in valid range." % (mnemonic))
+        fail(report, mnemonic, "num_range", value, "ERROR: %s must be in valid range." % (mnemonic))
 
 
-def check_code(mnemonic, value, codes):
+def check_code(mnemonic, value, codes, report=None):
     if value not in codes:
-        sys.exit("ERROR: %s must be a valid code." % (mnemonic))
+        fail(report, mnemonic, "code", value, "ERROR: %s must be a valid code." % (mnemonic))
 
 
-def check_num_equal(mnemonic, value, expected):
+def check_num_equal(mnemonic, value, expected, report=None):
     if value != expected:
-        sys.exit("ERROR: %s must be %d." % (mnemonic, expected))
+        fail(report, mnemonic, "num_equal", value, "ERROR: %s must be %d." % (mnemonic, expected))
 
 
-def check_less_than(m1, m2, value1, value2):
+def check_less_than(m1, m2, value1, value2, report=None):
     if value1 >= value2:
-        sys.exit("ERROR: %s must be less than %s." % (m1, m2))
+        fail(report, m1, "less_than", value1, "ERROR: %s must be less than %s." % (m1, m2))
 
 
-def check_units_range(mnemonic, value, ranges):
-    check_num_range(mnemonic, value, ranges[0], ranges[1])
+def check_units_range(mnemonic, value, ranges, report=None):
+    check_num_range(mnemonic, value, ranges[0], ranges[1], report=report)
 
 
-def check_depths(depths, data):
-    check_less_than(depths[0], depths[1], data[depths[0]], data[depths[1]])
+def check_depths(depths, data, report=None):
+    top, base = data.get(depths[0]), data.get(depths[1])
 
+    if top is not None and base is not None:
+        top = check_numeric(depths[0], top, report=report)
+        base = check_numeric(depths[1], base, report=report)
+        if top is not None and base is not None:
+            check_less_than(depths[0], depths[1], top, base, report=report)
 
-def is_date_greater(day, min_day):
-    return datetime.strptime(day, "%Y %m %d").date() > min_day
 
+def is_date_greater(day, min_day, layout=None):
+    parsed = parse_day(day, day_parts(layout))
+    return parsed is not None and parsed.date() > min_day
 
-def check_dstloc(SPNT, data):
+
+def detect_pas_type(pastype):
+    """Return the analysis type of a PASTYPE. value, e.g. "PAS-WAN" -> "WAN"."""
+    return str(pastype).strip().upper().rpartition("-")[2]
+
+
+def check_dstloc(SPNT, data, report=None):
     DSTLOC = "DSTLOC."
 
     if DSTLOC in data:
-        if data[SPNT] is None or int(data[SPNT]) != 50:
-            check_required_null(DSTLOC, data[DSTLOC])
+        spnt = data.get(SPNT)
+        number = None if spnt is None else check_numeric(SPNT, spnt, report=report)
+        # As in check_dstloc_frame, a non-numeric SPNT. counts as not 50.
+        if number is None or not 50 <= number < 51:
+            check_required_null(DSTLOC, data.get(DSTLOC), report=report)
         else:
-            check_required(DSTLOC, data[DSTLOC])
+            check_required(DSTLOC, data.get(DSTLOC), report=report)
+
+
+# The check_* helpers as PAS methods call them, through PAS.checks, so that
+# rule_stats can hand one PAS counting copies without rebinding this module.
+CHECKS = SimpleNamespace(
+    check_valid_day_format=check_valid_day_format,
+    check_char_size=check_char_size,
+    check_required_null=check_required_null,
+    check_required=check_required,
+    check_required_two=check_required_two,
+    check_numeric=check_numeric,
+    check_zero=check_zero,
+    check_negative=check_negative,
+    check_num_range=check_num_range,
+    check_code=check_code,
+    check_num_equal=check_num_equal,
+    check_less_than=check_less_than,
+    check_units_range=check_units_range,
+    check_depths=check_depths,
+    check_dstloc=check_dstloc,
+)
+
+
+class ValidationReport:
+    """Every rule failure found by PAS.check_pas_data(collect=True)."""
+
+    def __init__(self):
+        self.failures = []
+        self.seen = set()
+        self.sources = []
+
+    def __len__(self):
+        return len(self.failures)
+
+    def __iter__(self):
+        return iter(self.failures)
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    def add(self, mnemonic, rule, value, message):
+        # Paired rules (TSUL, depths) fire from both of their mnemonics.
+        if (mnemonic, rule, message) not in self.seen:
+            self.seen.add((mnemonic, rule, message))
+            self.failures.append(ValidationFailure(mnemonic, rule, value, message))
+
+    def extend(self, report, source):
+        """Append the failures of another report, tagged with its source."""
+        self.sources.append(source)
+        self.failures.extend(failure._replace(source=source) for failure in report)
+
+    @classmethod
+    def merge(cls, reports):
+        """Merge an iterable of (source, report) pairs into one report."""
+        merged = cls()
+        for source, report in reports:
+            merged.extend(report, source)
+        return merged
+
+    @classmethod
+    def from_dicts(cls, failures):
+        """A report of failure dicts as to_dicts returns them; source may be left out."""
+        report = cls()
+        for failure in failures:
+            report.add(failure["mnemonic"], failure["rule"], failure["value"], failure["message"])
+        return report
+
+    def messages(self):
+        return [failure.message for failure in self.failures]
+
+    def to_dicts(self):
+        return [failure._asdict() for failure in self.failures]
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.failures, columns=ValidationFailure._fields)
+
+
+class FrameData:
+    """Column-wise view of a DataFrame with one lab sample per row."""
+
+    def __init__(self, data_table, mnemonics, numeric, days, stats=None):
+        import numpy as np
+        import pandas as pd
+
+        self.stats = stats
+        if stats is not None:
+            stats.tick()
+
+        self.index = data_table.index
+        self.size = len(data_table)
+        self.columns = {
+            mnemonic: data_table[mnemonic].reset_index(drop=True)
+            if mnemonic in data_table.columns
+            else pd.Series([None] * self.size, dtype=object)
+            for mnemonic in mnemonics
+        }
+        self.values = {m: c.to_numpy(dtype=object) for m, c in self.columns.items()}
+        self.null = {m: c.isna().to_numpy() for m, c in self.columns.items()}
+        self.numbers = {
+            m: pd.to_numeric(self.columns[m], errors="coerce").to_numpy(dtype=float)
+            for m in numeric
+        }
+        self.days = {}
+        layouts = {}
+        for mnemonic, layout in days.items():
+            layouts.setdefault(day_parts(layout), []).append(mnemonic)
+        for parts, group in layouts.items():
+            parsed = parse_days(np.column_stack([self.values[m] for m in group]), parts)
+            self.days.update((m, parsed[:, i]) for i, m in enumerate(group))
+        self.texts = {}
+        self.results = {m: np.full(self.size, None, dtype=object) for m in mnemonics}
+        self.failed = {m: np.zeros(self.size, dtype=bool) for m in mnemonics}
+
+        if stats is not None:
+            stats.tick("frame_data", None, 0, self.size)
+
+    def text(self, mnemonic, width=None):
+        # The column as str, zero-filled to width; rule conditions read the
+        # same columns many times, so each is converted once.
+        key = (mnemonic, width)
+        if key not in self.texts:
+            text = self.columns[mnemonic].astype(str)
+            self.texts[key] = text if width is None else text.str.zfill(width)
+        return self.texts[key]
+
+    def mark(self, mnemonic, mask, message, rule):
+        import numpy as np
+
+        mask = np.asarray(mask, dtype=bool) & ~self.failed[mnemonic]
+        self.results[mnemonic][mask] = message
+        self.failed[mnemonic] |= mask
+
+        if self.stats is not None:
+            self.stats.tick(rule, mnemonic, int(mask.sum()), self.size)
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.results, index=self.index, dtype=object)
 
 
 class PAS:
@@ -90,6 +300,15 @@ class PAS:
         self.pt = pas_spec
         self.pas_format = []
         self.pas_type = ""
+        self.report = None
+        # rule_stats.RuleStats.attach swaps in counting helpers and itself.
+        self.checks = CHECKS
+        self.stats = None
+        self.rows = ()
+        self.plan = ()
+        self.compiled = {}
+        self.kinds = {}
+        self.sample_points = {"OAN": "SPNT.", "WAN": "SPNT.", "GAN": "FS-SPNT."}
         self.pastype_column = "PASTYPE."
         self.field_char = "CHAR"
         self.field_numb = "NUMB"
@@ -156,18 +375,22 @@ class PAS:
             "TAP.": ["F", "P"],
             "TAPL.": ["U", "D"],
             "TMEA.": ["I", "C"],
-            "TTYP.": ["3", "10", "13", "23", "33", "43"],
+            "TTYP.": ["3", "03", "10", "13", "23", "33", "43"],
             "TULD.": ["Y", "N"],
             "UNIT.": ["M"],
             "WSFL.": [1, 2, 6, 17],
             "WTYP.": ["V", "D", "H"],
         }
+        # Codes that differ for one PAS type; None turns the code check off.
+        self.type_codes = {
+            "DST": {"TTYP.": None},
+        }
         self.depths = ("TTOPL.M", "TBASL.M")
         self.pairs = {
             "TSUL.FRAC": ("TSUL.FRAC", "TSUL.GM/KG"),
             "TSUL.GM/KG": ("TSUL.FRAC", "TSUL.GM/KG"),
         }
-        self.min_day = datetime.strptime("2004 09 30", "%Y %m %d").date()
+        self.min_day = date(2004, 9, 30)
         self.date_dependent = {
             "FS-SPRES.KPAA": "FS-SDAT.DAY",
             "FS-STEMP.DEGC": "FS-SDAT.DAY",
@@ -197,177 +420,491 @@ class PAS:
 
     def subset(self, pastype):
         if self.pt["ANALYSIS"].eq(pastype).any():
-            self.pas_type = pastype
-
             column = "BUSINESS RULES AND EDITS"
-            self.pt[column] = [None if pd.isnull(s) else s for s in self.pt[column]]
+            self.pt[column] = [None if s != s else s for s in self.pt[column]]
 
-            self.pt = self.pt[self.pt["ANALYSIS"].str.match(pastype)]
-            self.pas_format = self.pt["FIELD"].unique()
+            self.use_subset(pastype, self.pt[self.pt["ANALYSIS"].str.match(pastype)])
+        else:
+            sys.exit("ERROR: Cannot find PAS type [%s]." % pastype)
 
-            self.pt_zip = zip(
+    def use_subset(self, pastype, pt):
+        """Adopt an already filtered spec frame for pastype and compile its plan."""
+        self.pt = pt
+        self.use_rows(
+            pastype,
+            zip(
                 self.pt["MNEMONIC NAME"],
                 self.pt["FIELD"],
                 self.pt["FIELD SIZE"],
                 self.pt["BUSINESS RULES AND EDITS"],
-            )
+            ),
+        )
+
+    def use_rows(self, pastype, rows):
+        """Adopt (mnemonic, field, size, rule) spec rows for pastype; no pandas needed."""
+        self.pas_type = pastype
+        self.rows = tuple(rows)
+        self.pas_format = list(dict.fromkeys(row[1] for row in self.rows))
+        self.compiled = {}
+        self.kinds = {}
+        self.day_layouts = {}
+        for mnemonic, _, size, _ in self.rows:
+            self.kinds.setdefault(mnemonic, self.field_kind(size))
+            if self.kinds[mnemonic] == "DAY":
+                self.day_layouts.setdefault(mnemonic, size)
+        self.plan = tuple(self.compile_rule(*row) for row in self.rows)
+        self.pt_zip = iter(self.rows)
+
+    def use_plan(self, pastype, plan):
+        """Adopt MnemonicRules already compiled for pastype, e.g. by shared_spec."""
+        self.pas_type = pastype
+        self.plan = tuple(plan)
+        self.rows = tuple((entry.mnemonic, entry.field, entry.size, entry.rule) for entry in self.plan)
+        self.pas_format = list(dict.fromkeys(row[1] for row in self.rows))
+        self.compiled = dict(zip(self.rows, self.plan))
+        self.kinds = {}
+        self.day_layouts = {}
+        for entry in self.plan:
+            self.kinds.setdefault(entry.mnemonic, entry.kind)
+            if entry.kind == "DAY":
+                self.day_layouts.setdefault(entry.mnemonic, entry.size)
+        self.pt_zip = iter(self.rows)
+
+    def format_value(self, entry, value):
+        if value is None or value != value:
+            return None
+        elif entry.kind in {"CHAR", "DAY"}:
+            return str(value)
+        elif entry.decimals is None:
+            return "%02d" % (int(float(value)))
         else:
-            sys.exit("ERROR: Cannot find PAS type [%s]." % pastype)
+            return "{:.{}f}".format(float(value), entry.decimals)
 
     def format_data(self, data_table):
+        """Format one sample into self.data.
+
+        data_table is a DataFrame, whose row 0 is used, or a dict of
+        mnemonic -> raw value such as pas_reader.read_export returns.
+        """
+        if not isinstance(data_table, dict):
+            data_table = {mnemonic: data_table[mnemonic][0] for mnemonic in data_table.columns}
+
         self.data = {
-            mnemonic: (
-                str(data_table[mnemonic][0])
-                if self.field_char in field_size
-                else str(data_table[mnemonic][0])
-                if self.field_day in field_size
-                else "%02d" % (int(data_table[mnemonic][0]))
-                if self.field_numb in field_size and "," not in field_size
-                else "{:.{}f}".format(
-                    float(data_table[mnemonic][0]),
-                    int(field_size.split(" ")[1].split(",")[1]),
-                )
-            )
-            if mnemonic in data_table.columns and not pd.isnull(data_table[mnemonic][0])
-            else None
-            for mnemonic, field_size in zip(
-                self.pt["MNEMONIC NAME"], self.pt["FIELD SIZE"]
-            )
+            entry.mnemonic: self.format_value(entry, data_table.get(entry.mnemonic))
+            for entry in self.plan
         }
 
-    def check_value(self, mnemonic, value, size, rule):
+    def format_frame(self, data_table):
+        """Format every row of data_table the way format_data formats row 0.
+
+        Mnemonics are grouped by field kind (text, integer NUMB, NUMB with N
+        decimals) and each group is converted as one 2-D block rather than
+        through per-cell pandas lookups. NUMB values are then formatted one
+        at a time by a C-level map of the group's %-template, about 0.5 us a
+        value: building the strings with numpy or pandas column operations
+        measured slower and must round exactly as "%.2f" does.
+        """
+        import numpy as np
+        import pandas as pd
+
+        entries = {entry.mnemonic: entry for entry in self.plan}
+        groups = {}
+        for mnemonic, entry in entries.items():
+            if mnemonic in data_table.columns:
+                key = "text" if entry.kind in {"CHAR", "DAY"} else entry.decimals
+                groups.setdefault(key, []).append(mnemonic)
+
+        formatted = {}
+        for key, mnemonics in groups.items():
+            block = data_table[mnemonics]
+            null = block.isna().to_numpy()
+
+            if key == "text":
+                values = block.astype(str).to_numpy(dtype=object)
+            else:
+                numbers = np.where(null, 0.0, block.to_numpy(dtype=float, na_value=np.nan))
+                if key is None:
+                    numbers, template = np.trunc(numbers).astype(np.int64), "%02d"
+                else:
+                    template = "%%.%df" % key
+                values = np.array(
+                    list(map(template.__mod__, numbers.ravel().tolist())), dtype=object
+                ).reshape(numbers.shape)
+
+            values[null] = None
+            formatted.update(zip(mnemonics, values.T))
+
+        return pd.DataFrame(
+            {
+                mnemonic: formatted[mnemonic]
+                if mnemonic in formatted
+                else np.full(len(data_table), None, dtype=object)
+                for mnemonic in entries
+            },
+            index=data_table.index,
+        )
+
+    def field_kind(self, size):
+        if self.field_day in size:
+            return "DAY"
+        elif self.field_char in size:
+            return "CHAR"
+        return "NUMB"
+
+    def compile_rule(self, mnemonic, field, size, rule):
+        """Parse one spec row into a MnemonicRule, once per distinct row."""
+        key = (mnemonic, field, size, rule)
+        if key in self.compiled:
+            return self.compiled[key]
+
+        kind = self.field_kind(size)
+        codes = self.type_codes.get(self.pas_type, {}).get(mnemonic, self.codes.get(mnemonic))
+
+        match = FIELD_SIZE.search(size)
+        width = int(match.group(1)) if match else None
+        decimals = int(match.group(2)) if match and match.group(2) else None
+
+        units = mnemonic.partition(".")[2]
+        bounds = []
+        if kind == "NUMB" and units in self.units_range:
+            bounds.append(self.units_range[units])
+        if kind == "NUMB" and mnemonic in self.mnemonic_range:
+            bounds.append(self.mnemonic_range[mnemonic])
+
+        entry = MnemonicRule(
+            mnemonic=mnemonic,
+            field=field,
+            size=size,
+            rule=rule,
+            kind=kind,
+            width=width,
+            decimals=decimals,
+            nullable=rule is not None and any([r in rule for r in self.test_null]),
+            allow_zero=rule is not None and any([r in rule for r in self.test_zero]),
+            non_negative=rule is not None and any([r in rule for r in self.test_negative]),
+            codes=frozenset(codes) if codes is not None else None,
+            bounds=tuple(bounds),
+            pair=self.pairs.get(mnemonic),
+            date_dependency=self.date_dependent.get(mnemonic),
+            depth=kind == "NUMB" and units in self.units_range and mnemonic in self.depths,
+            gates=compile_gates(self.pas_type, mnemonic, field, kind, self.kinds),
+        )
+        self.compiled[key] = entry
+        return entry
+
+    def check_value(self, entry, value):
+        mnemonic = entry.mnemonic
+        checks = self.checks
+
         # Null Check
-        if mnemonic in self.pairs:
-            check_required_two(self.pairs[mnemonic], self.data)
+        if entry.pair is not None:
+            checks.check_required_two(entry.pair, self.data, report=self.report)
 
-        if mnemonic in self.date_dependent:
-            if is_date_greater(self.data[self.date_dependent[mnemonic]], self.min_day):
-                check_required(mnemonic, value)
+        if entry.date_dependency is not None:
+            day = self.data.get(entry.date_dependency)
+            if day is not None and is_date_greater(day, self.min_day, self.day_layouts.get(entry.date_dependency)):
+                checks.check_required(mnemonic, value, report=self.report)
 
-        if rule is None or all([r not in rule for r in self.test_null]):
-            check_required(mnemonic, value)
+        if not entry.nullable:
+            checks.check_required(mnemonic, value, report=self.report)
 
         # Value check
-        if value is not None and not pd.isnull(value):
-            # DAY check
-            if self.field_day in size:
-                check_valid_day_format(mnemonic, value.split(self.delim))
+        if value is None or value != value:
+            return
+
+        # DAY check
+        if entry.kind == "DAY":
+            checks.check_valid_day_format(mnemonic, value, report=self.report, layout=entry.size)
+
+        # CHAR check
+        elif entry.kind == "CHAR":
+            checks.check_char_size(mnemonic, value, entry.width, report=self.report)
+
+            if entry.codes is not None:
+                checks.check_code(mnemonic, value, entry.codes, report=self.report)
+
+        # NUMB check
+        else:
+            value = checks.check_numeric(mnemonic, value, report=self.report)
+            if value is None:
+                return
+
+            if not entry.allow_zero:
+                checks.check_zero(mnemonic, value, report=self.report)
+
+            if entry.non_negative:
+                checks.check_negative(mnemonic, value, report=self.report)
+
+            if entry.codes is not None:
+                checks.check_code(mnemonic, int(value), entry.codes, report=self.report)
+
+            for rmin, rmax in entry.bounds:
+                checks.check_num_range(mnemonic, value, rmin, rmax, report=self.report)
+
+            if entry.depth:
+                checks.check_depths(self.depths, self.data, report=self.report)
 
-            # CHAR check
-            elif self.field_char in size:
-                check_char_size(mnemonic, value, int(size.split(self.delim)[1]))
 
-                if mnemonic in self.codes:
-                    check_code(mnemonic, value, self.codes[mnemonic])
+    def check_entry(self, entry):
+        """Run every rule of one plan entry against self.data.
 
-            # NUMB check
+        The entry's gates come first; a gate with skip set that fires ends
+        the checks for the entry, otherwise check_value follows.
+        """
+        value = self.data.get(entry.mnemonic)
+
+        for gate in entry.gates:
+            if gate_holds(gate, self.data):
+                self.check_gate(entry, gate, value)
+                if gate.skip:
+                    return
+
+        self.check_value(entry, value)
+
+    def check_gate(self, entry, gate, value):
+        mnemonic = entry.mnemonic
+        checks = self.checks
+
+        if gate.action == "null":
+            checks.check_required_null(mnemonic, value, report=self.report)
+
+        elif gate.action == "required":
+            checks.check_required(mnemonic, value, report=self.report)
+
+        elif value is not None:
+            number = checks.check_numeric(mnemonic, value, report=self.report)
+            if number is None:
+                return
+
+            if gate.action == "range":
+                checks.check_num_range(mnemonic, number, gate.arg[0], gate.arg[1], report=self.report)
             else:
-                value = float(value)
-                units = mnemonic.split(".")[1]
+                checks.check_num_equal(mnemonic, number, gate.arg, report=self.report)
 
-                if rule is None or all([r not in rule for r in self.test_zero]):
-                    check_zero(mnemonic, value)
+    def rule_inputs(self, entry):
+        """The mnemonics check_entry reads for one plan entry.
 
-                if rule is not None and any([r in rule for r in self.test_negative]):
-                    check_negative(mnemonic, value)
+        Mirrors the lookups in check_value; keep the two in step when a
+        check starts reading another field. Gate inputs come from the
+        rule table.
+        """
+        inputs = {entry.mnemonic}
 
-                if mnemonic in self.codes:
-                    check_code(mnemonic, int(value), self.codes[mnemonic])
+        if entry.pair is not None:
+            inputs.update(entry.pair)
+        if entry.date_dependency is not None:
+            inputs.add(entry.date_dependency)
+        if entry.depth:
+            inputs.update(self.depths)
 
-                if units in self.units_range:
-                    check_units_range(mnemonic, value, self.units_range[units])
+        for gate in entry.gates:
+            inputs.update(condition.mnemonic for condition in gate.conditions)
 
-                    if mnemonic in self.depths:
-                        check_depths(self.depths, self.data)
+        return frozenset(inputs)
 
-                if mnemonic in self.mnemonic_range:
-                    check_units_range(mnemonic, value, self.mnemonic_range[mnemonic])
+    def check_pas_data(self, collect=False):
+        """Check self.data against the subset spec.
 
+        By default the first failure exits via sys.exit. With collect=True
+        every rule is run and a ValidationReport of all failures is returned.
+        """
+        self.report = ValidationReport() if collect else None
+        checks = self.checks
 
-    def check_oan_wan_data(self, SPNT):
-        check_dstloc(SPNT, self.data)
+        try:
+            if self.pas_type in self.sample_points:
+                checks.check_dstloc(self.sample_points[self.pas_type], self.data, report=self.report)
 
-        for mnemonic, _, size, rule in self.pt_zip:
-            self.check_value(mnemonic, self.data[mnemonic], size, rule)
+            if self.pas_type == "GAN":
+                checks.check_required("HYDLP.", self.data.get("HYDLP."), report=self.report)
 
+            for row in self.pt_zip:
+                self.check_entry(self.compile_rule(*row))
+        finally:
+            report, self.report = self.report, None
+            self.pt_zip = iter(self.rows)
 
-    def check_gan_data(self, SPNT):
-        check_dstloc(SPNT, self.data)
-        check_required("HYDLP.", self.data["HYDLP."])
+        return report
 
-        for mnemonic, field, size, rule in self.pt_zip:
-            value = self.data[mnemonic]
+    def validate_frame(self, data_table):
+        """Validate one lab sample per row of data_table.
 
-            if field in {"~ HEADER DATA - FIRST STAGE SEPARATOR GAS ANALYSIS"}:
-                if self.data["STYP."] == "C":
-                    check_required_null(mnemonic, value)
-                    continue
+        Returns a DataFrame with the same index and one column per mnemonic,
+        holding the first error message for that value or None if it passed.
+        """
+        import numpy as np
 
-            elif field in {
-                "~ HEADER DATA - SECOND STAGE SEPARATOR - GAS ANALYSIS",
-                "~ SECOND STAGE SEPARATOR - GAS ANALYSIS"
-            }:
-                if self.data["SEPCOND."] != "B":
-                    check_required_null(mnemonic, value)
-                    continue
-                else:
-                    if mnemonic not in self.date_dependent:
-                        check_required(mnemonic, value)
-
-            elif field in {
-                "~ HEADER DATA - CONDENSATE / LIQUID ANALYSIS",
-                "~ CONDENSATE / LIQUID ANALYSIS - DATA PROPERTIES"
-            }:
-                if self.data["HYDLP."] == "N":
-                    check_required_null(mnemonic, value)
-                    continue
-                else:
-                    if mnemonic in {"H2SLP.", "LIQRDN."}:
-                        check_required(mnemonic, value)
-                        if mnemonic == "LIQRDN.":
-                            check_num_range(mnemonic, float(value), -math.inf, 1)
-
-            elif field in {
-                "~ RECOMBINED GAS ANALYSIS - DATA PROPERTIES",
-                "~ RECOMBINED GAS PROPERTIES",
-            }:
-                if self.data["STYP."] != "R":
-                    check_required_null(mnemonic, value)
-                else:
-                    if (mnemonic == "SS-GAS.E3M3/D" and self.data["SEPCOND."] == "B") or mnemonic not in {"R-PPC.KPAA", "R-PTC.DEGK", "SS-GAS.E3M3/D"}:
-                        check_required(mnemonic, value)
+        mnemonics = list(dict.fromkeys(entry.mnemonic for entry in self.plan))
+        frame = FrameData(
+            data_table,
+            mnemonics,
+            {entry.mnemonic for entry in self.plan if entry.kind == "NUMB"},
+            self.day_layouts,
+            self.stats,
+        )
+        everyone = np.ones(frame.size, dtype=bool)
+
+        if self.pas_type in self.sample_points:
+            self.check_dstloc_frame(frame, self.sample_points[self.pas_type])
+
+        if self.pas_type == "GAN":
+            frame.mark("HYDLP.", frame.null["HYDLP."], "ERROR: HYDLP. must not be null.", "required")
+
+        for entry in self.plan:
+            active = self.check_gates_frame(frame, entry) if entry.gates else everyone
+            self.check_value_frame(frame, entry, active)
+
+        return frame.to_frame()
+
+    def check_dstloc_frame(self, frame, SPNT):
+        import numpy as np
+
+        DSTLOC = "DSTLOC."
+
+        if DSTLOC in frame.values:
+            not_fifty = frame.null[SPNT] | (np.trunc(frame.numbers[SPNT]) != 50)
+            frame.mark(DSTLOC, not_fifty & ~frame.null[DSTLOC], "ERROR: %s must be null." % DSTLOC, "dstloc")
+            frame.mark(DSTLOC, ~not_fifty & frame.null[DSTLOC], "ERROR: %s must not be null." % DSTLOC, "dstloc")
+
+    def check_gates_frame(self, frame, entry):
+        """Apply the entry's gates; returns the rows check_value still applies to."""
+        import numpy as np
+
+        mnemonic = entry.mnemonic
+        null = frame.null[mnemonic]
+        active = np.ones(frame.size, dtype=bool)
+
+        for gate in entry.gates:
+            rows = active & gate_mask(gate, frame)
+
+            if gate.action == "null":
+                frame.mark(mnemonic, rows & ~null, "ERROR: %s must be null." % mnemonic, "required_null")
 
-            elif field == "~ RECOMBINED GAS COMPOSITION" and self.data["STYP."] == "R":
-                check_required(mnemonic, value)
+            elif gate.action == "required":
+                frame.mark(mnemonic, rows & null, "ERROR: %s must not be null." % mnemonic, "required")
 
             else:
-                if mnemonic == "GLR.M3/M3" and self.data["STYP."] == "R":
-                    check_required(mnemonic, value)
-                
-                elif mnemonic in {"FLDH2S.PPM", "H2SMT."}:
-                    if self.data["H2SLC."] == "L":
-                        check_required_null(mnemonic, value)
-                    else:
-                        check_required(mnemonic, value)
-                        if self.data["H2SMT."] == "N" and "NUMB" in size:
-                            check_num_equal(mnemonic, float(value), 0)
+                number = frame.numbers[mnemonic]
+                numeric = rows & ~null & ~np.isnan(number)
+                frame.mark(mnemonic, rows & ~null & ~numeric, "ERROR: %s must be numeric." % mnemonic, "numeric")
+
+                if gate.action == "range":
+                    low, high = gate.arg
+                    frame.mark(
+                        mnemonic,
+                        numeric & ~((low < number) & (number < high)),
+                        "ERROR: %s must be in valid range." % mnemonic,
+                        "num_range",
+                    )
+                else:
+                    frame.mark(
+                        mnemonic,
+                        numeric & (number != gate.arg),
+                        "ERROR: %s must be %d." % (mnemonic, gate.arg),
+                        "num_equal",
+                    )
+
+            if gate.skip:
+                active &= ~rows
+
+        return active
 
-                elif mnemonic == "LABH2S.FRAC" and self.data["H2SLC."] != "F":
-                    check_required(mnemonic, value)
+    def check_value_frame(self, frame, entry, active):
+        import numpy as np
 
-            self.check_value(mnemonic, value, size, rule)
+        mnemonic = entry.mnemonic
+        null = frame.null[mnemonic]
+        present = active & ~null
 
-    def check_pas_data(self):
-        if self.pas_type in {"OAN", "WAN"}:
-            self.check_oan_wan_data("SPNT.")
+        # Null Check
+        if entry.pair is not None:
+            first, second = entry.pair
+            frame.mark(
+                mnemonic,
+                active & frame.null[first] & frame.null[second],
+                "ERROR: %s and %s must not both be null." % (first, second),
+                "required_two",
+            )
 
-        elif self.pas_type == "GAN":
-            self.check_gan_data("FS-SPNT.")
+        if entry.date_dependency in frame.days:
+            days = frame.days[entry.date_dependency]
+            # Compare dates, as is_date_greater does, not times of day.
+            recent = days.astype("datetime64[D]") > np.datetime64(self.min_day, "D")
+            frame.mark(mnemonic, active & recent & null, "ERROR: %s must not be null." % mnemonic, "required")
+
+        if not entry.nullable:
+            frame.mark(mnemonic, active & null, "ERROR: %s must not be null." % mnemonic, "required")
+
+        # DAY check
+        if entry.kind == "DAY":
+            frame.mark(
+                mnemonic,
+                present & np.isnat(frame.days[mnemonic]),
+                "ERROR: %s must be in [%s] format." % (mnemonic, entry.size),
+                "day_format",
+            )
 
+        # CHAR check
+        elif entry.kind == "CHAR":
+            text = frame.text(mnemonic)
+            frame.mark(
+                mnemonic,
+                present & (text.str.len() > entry.width).to_numpy(dtype=bool),
+                "ERROR: %s size is greater than %s." % (mnemonic, entry.width),
+                "char_size",
+            )
+
+            if entry.codes is not None:
+                frame.mark(
+                    mnemonic,
+                    present & ~text.isin([str(c) for c in entry.codes]).to_numpy(dtype=bool),
+                    "ERROR: %s must be a valid code." % mnemonic,
+                    "code",
+                )
+
+        # NUMB check
+        else:
+            value = frame.numbers[mnemonic]
+
+            frame.mark(mnemonic, present & np.isnan(value), "ERROR: %s must be numeric." % mnemonic, "numeric")
+
+            if not entry.allow_zero:
+                frame.mark(mnemonic, present & (value == 0), "ERROR: %s must not be 0." % mnemonic, "zero")
+
+            if entry.non_negative:
+                frame.mark(mnemonic, present & (value < 0), "ERROR: %s must not be negative." % mnemonic, "negative")
+
+            if entry.codes is not None:
+                frame.mark(
+                    mnemonic,
+                    present & ~np.isin(np.trunc(value), list(entry.codes)),
+                    "ERROR: %s must be a valid code." % mnemonic,
+                    "code",
+                )
+
+            for rmin, rmax in entry.bounds:
+                frame.mark(
+                    mnemonic,
+                    present & ~((rmin < value) & (value < rmax)),
+                    "ERROR: %s must be in valid range." % mnemonic,
+                    "num_range",
+                )
+
+            if entry.depth:
+                top, base = self.depths
+                frame.mark(
+                    mnemonic,
+                    present & (frame.numbers[top] >= frame.numbers[base]),
+                    "ERROR: %s must be less than %s." % (top, base),
+                    "depths",
+                )
 
 if __name__ == "__main__":
+    import pandas as pd
+    from spec_cache import load_spec
+
     dt = pd.read_csv("example/wan_text.txt", sep="\t")
-    pt = pd.read_csv("unittest/pas_lookup.csv", sep=",", header=0)
+    pt = load_spec()
 
     pas = PAS(pt)
     pas.subset("WAN")
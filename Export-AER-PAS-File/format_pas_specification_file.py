@@ -1,39 +1,47 @@
-import re
+import sys
+import json
+import hashlib
+import argparse
 import pandas as pd
 import numpy as np
 
+from spec_cache import CACHE_SUFFIX, NA_VALUES, read_cache, read_spec_csv, write_cache
+
+
+# Bump whenever format_pas_sheet changes its output, so cached sheets are rebuilt.
+FORMAT_VERSION = 1
+KEY_COLUMNS = ["ANALYSIS", "FIELD", "MNEMONIC NAME"]
+PAS_TYPES = ["OAN", "WAN", "DST", "PRD", "GAN", "GRD", "TRG"]
+COLUMNS = [
+    "MNEMONIC NAME",
+    "FIELD SIZE",
+    "DATA ELEMENT DESCRIPTION",
+    "BUSINESS RULES AND EDITS",
+    "CLARIFICATION / EXPLANATION OF MNEMONIC",
+]
 
-def format_pas_analysis(xls, analysis):
-    df = pd.read_excel(
-        io=xls,
-        sheet_name=analysis,
-        header=None,
-        dtype=str,
-        names=[
-            "MNEMONIC NAME",
-            "FIELD SIZE",
-            "DATA ELEMENT DESCRIPTION",
-            "BUSINESS RULES AND EDITS",
-            "CLARIFICATION / EXPLANATION OF MNEMONIC",
-        ],
-    )
 
+def read_pas_sheets(xls, analyses=PAS_TYPES):
+    """Read the sheets of every analysis in one pass over the workbook."""
+    return pd.read_excel(io=xls, sheet_name=list(analyses), header=None, dtype=str, names=COLUMNS)
+
+
+def format_pas_sheet(df, analysis):
     # Replace values in the entire DataFrame
-    df.replace(
+    df = df.replace(
         {
             r"^\s*$": np.nan,
-            "^\s": "",
+            r"^\s": "",
             "–": "-",
             "’": "'",
             "\n": " ",
             ".DGEK": ".DEGK",
         },
         regex=True,
-        inplace=True,
     )
 
     # Drop rows with all NaN values and with "#" or "~ (DT" (These are comments).
-    df.dropna(axis=0, how="all", inplace=True)
+    df = df.dropna(axis=0, how="all")
     df = df[~df["MNEMONIC NAME"].str.startswith("#", na=False)]
     df = df[~df["MNEMONIC NAME"].str.startswith("~ (DT", na=False)]
 
@@ -52,36 +60,29 @@ def format_pas_analysis(xls, analysis):
             df = df.loc[: index[0] - 1, :]
             break
 
-    # Add new section column.
-    info = ""
-    info_list = []
-    for _, row in df.iterrows():
-        if row["MNEMONIC NAME"].startswith("~"):
-            info = row["MNEMONIC NAME"]
-        else:
-            info_list.append(info)
+    # Section of each row: the last "~" header above it, forward filled.
+    header = df["MNEMONIC NAME"].str.startswith("~", na=False)
+    section = df["MNEMONIC NAME"].where(header).ffill().fillna("")
 
     # Remove rows starting with "~" in MNEMONIC NAME
-    df = df[~df["MNEMONIC NAME"].str.startswith("~")]
-    df["MNEMONIC NAME"] = df["MNEMONIC NAME"].str.replace(" ", "", regex=True)
-    df["MNEMONIC NAME"] = [s + "." if s.count(".") == 0 else s for s in df["MNEMONIC NAME"]]
+    df = df[~header].copy()
+    mnemonic = df["MNEMONIC NAME"].str.replace(" ", "", regex=False)
+    df["MNEMONIC NAME"] = mnemonic.where(mnemonic.str.contains(".", regex=False), mnemonic + ".")
 
     # Add new column FIELD
     # Remove ~ FILE VERIFICATION. This is for AER
     # Remove rows starting with ~ DT or ~DT in FIELD
-    df["FIELD"] = info_list
-    df = df[~df["FIELD"].str.startswith("~ FILE VERIFICATION")]
-    df = df[~df["FIELD"].str.startswith("~ DT")]
-    df = df[~df["FIELD"].str.startswith("~DT")]
+    df["FIELD"] = section[~header]
+    df = df[~df["FIELD"].str.startswith(("~ FILE VERIFICATION", "~ DT", "~DT"))]
     df["FIELD"] = df["FIELD"].str.replace(r"^ +| +$", r"", regex=True)
 
-    # Lower case this column
-    df["BUSINESS RULES AND EDITS"] = df["BUSINESS RULES AND EDITS"].str.casefold()
-    df["BUSINESS RULES AND EDITS"] = [re.sub(' +', ' ', str(s)) for s in df["BUSINESS RULES AND EDITS"]]
+    # Lower case this column; missing rules become the text "nan" as before.
+    rules = df["BUSINESS RULES AND EDITS"].str.casefold().astype(str)
+    df["BUSINESS RULES AND EDITS"] = rules.str.replace(" +", " ", regex=True)
 
     # Remove brackets in FIELD SIZE
-    df["FIELD SIZE"] = df["FIELD SIZE"].str.replace("[", "", regex=True)
-    df["FIELD SIZE"] = df["FIELD SIZE"].str.replace("]", "", regex=True)
+    df["FIELD SIZE"] = df["FIELD SIZE"].str.replace("[", "", regex=False)
+    df["FIELD SIZE"] = df["FIELD SIZE"].str.replace("]", "", regex=False)
 
     # Add new column of the PAS type.
     df["ANALYSIS"] = analysis
@@ -89,11 +90,128 @@ def format_pas_analysis(xls, analysis):
     return df
 
 
-if __name__ == "__main__":
-    pas_file = "PASFileFormats.xls"
-    pas_type = ["OAN", "WAN", "DST", "PRD", "GAN", "GRD", "TRG"]
+def format_pas_analysis(xls, analysis):
+    return format_pas_sheet(read_pas_sheets(xls, [analysis])[analysis], analysis)
+
+
+def format_pas_specification(xls, analyses=PAS_TYPES):
+    """The combined spec of every analysis, opening the workbook once."""
+    sheets = read_pas_sheets(xls, analyses)
+    return pd.concat([format_pas_sheet(sheets[analysis], analysis) for analysis in analyses], ignore_index=True)
+
+
+def sheet_hash(df):
+    """SHA-256 of a sheet's raw cells as read by read_pas_sheets."""
+    return hashlib.sha256(df.to_csv(index=False, header=False).encode()).hexdigest()
+
+
+def cached_specification(xls, cache_path=None, analyses=PAS_TYPES):
+    """format_pas_specification, reformatting only the sheets that changed.
+
+    Each sheet's formatted frame is cached in a pickle (xls + ".cache" by
+    default) under a hash of its raw cells; a sheet is formatted again only
+    when that hash or FORMAT_VERSION differs. Returns the combined spec and
+    the list of analyses that were rebuilt.
+    """
+    cache_path = cache_path or str(xls) + CACHE_SUFFIX
+    cache = read_cache(cache_path)
+    if cache is None or cache.get("version") != FORMAT_VERSION:
+        cache = {"version": FORMAT_VERSION, "sheets": {}}
+
+    sheets = read_pas_sheets(xls, analyses)
+    frames, rebuilt = [], []
+    for analysis in analyses:
+        digest = sheet_hash(sheets[analysis])
+        cached = cache["sheets"].get(analysis)
+        if cached is None or cached["hash"] != digest:
+            cached = cache["sheets"][analysis] = {
+                "hash": digest,
+                "frame": format_pas_sheet(sheets[analysis], analysis),
+            }
+            rebuilt.append(analysis)
+        frames.append(cached["frame"])
+
+    if rebuilt:
+        write_cache(cache_path, cache)
+    return pd.concat(frames, ignore_index=True), rebuilt
+
+
+def keyed_rows(columns, rows):
+    """{(analysis, field, mnemonic, occurrence): {column: value}} for spec rows.
+
+    occurrence tells apart a mnemonic listed twice in the same section.
+    """
+    keys = [columns.index(column) for column in KEY_COLUMNS]
+    keyed, seen = {}, {}
+    for row in rows:
+        key = tuple(row[i] for i in keys)
+        seen[key] = seen.get(key, -1) + 1
+        keyed[key + (seen[key],)] = {
+            column: value for column, value in zip(columns, row) if column not in KEY_COLUMNS
+        }
+    return keyed
+
+
+def spec_diff(old, new):
+    """Added, removed and changed rows between two (columns, rows) specs."""
+    old, new = keyed_rows(*old), keyed_rows(*new)
+
+    def describe(key):
+        return dict(zip(["analysis", "field", "mnemonic", "occurrence"], key))
+
+    changed = []
+    for key in old.keys() & new.keys():
+        for column, value in new[key].items():
+            if old[key].get(column) != value:
+                changed.append(dict(describe(key), column=column, old=old[key].get(column), new=value))
+
+    return {
+        "added": [describe(key) for key in sorted(new.keys() - old.keys(), key=str)],
+        "removed": [describe(key) for key in sorted(old.keys() - new.keys(), key=str)],
+        "changed": sorted(changed, key=lambda change: str(tuple(change.values()))),
+    }
+
+
+def spec_rows(df):
+    """A formatted spec as read_spec_csv would read it back from pas_lookup.csv."""
+    rows = [
+        tuple(None if v is None or v != v or v in NA_VALUES else v for v in row)
+        for row in df.itertuples(index=False)
+    ]
+    return list(df.columns), rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build pas_lookup.csv from the AER PAS workbook.")
+    parser.add_argument("--xls", default="PASFileFormats.xls")
+    parser.add_argument("--output", default="pas_lookup.csv")
+    parser.add_argument("--cache", help="per-sheet cache (default: the workbook path + .cache)")
+    parser.add_argument("--diff", help="also write the diff against the previous output as JSON")
+    args = parser.parse_args(argv)
+
+    combined_pas, rebuilt = cached_specification(args.xls, args.cache)
+    try:
+        previous = read_spec_csv(args.output)
+    except FileNotFoundError:
+        previous = (list(combined_pas.columns), [])
+    diff = spec_diff(previous, spec_rows(combined_pas))
 
-    all_pas = [format_pas_analysis(pas_file, pas) for pas in pas_type]
+    print("rebuilt sheets: %s" % (", ".join(rebuilt) or "none"))
+    for row in diff["added"]:
+        print("+ %(analysis)s %(field)s %(mnemonic)s" % row)
+    for row in diff["removed"]:
+        print("- %(analysis)s %(field)s %(mnemonic)s" % row)
+    for row in diff["changed"]:
+        print("~ %(analysis)s %(field)s %(mnemonic)s %(column)s: %(old)r -> %(new)r" % row)
 
-    combined_pas = pd.concat(all_pas, ignore_index=True)
-    combined_pas.to_csv("pas_lookup.csv", index=False, header=True, sep=",")
+    if args.diff:
+        with open(args.diff, "w") as f:
+            json.dump(diff, f, indent=2)
+
+    if diff["added"] or diff["removed"] or diff["changed"] or not previous[1]:
+        combined_pas.to_csv(args.output, index=False, header=True, sep=",")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import os
+import sys
+import glob
+from itertools import repeat
+
+from export_to_pas import ValidationReport, detect_pas_type
+from pas_reader import iter_pas_paths, read_export, read_pas, reader_kind
+from shared_spec import SharedSpec, publish_spec
+from spec_cache import SPEC_PATH, load_spec_rows
+from spec_registry import SpecRegistry
+
+# Spec loaded once per worker process by init_worker.
+worker_registry = None
+
+
+def init_worker(spec_path, shared_name=None):
+    """Load spec_path, or attach to the block a parent published as shared_name."""
+    global worker_registry
+    if shared_name is not None:
+        worker_registry = SharedSpec.attach(shared_name).registry()
+    else:
+        worker_registry = SpecRegistry(load_spec_rows(spec_path))
+
+
+def find_inputs(paths, suffixes=(".txt",)):
+    """Expand directories and globs into a sorted list of lab export files.
+
+    Directories are searched recursively for files ending in one of
+    suffixes, compared case-insensitively as iter_pas_paths does.
+    """
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for suffix in suffixes:
+                inputs.extend(iter_pas_paths(path, suffix))
+        elif glob.has_magic(path):
+            inputs.extend(glob.glob(path, recursive=True))
+        else:
+            inputs.append(path)
+    return sorted(set(inputs))
+
+
+def error_report(e):
+    """A ValidationReport with one "error" failure for an exception."""
+    report = ValidationReport()
+    if isinstance(e, SystemExit):
+        report.add(None, "error", None, str(e))
+    else:
+        report.add(None, "error", None, "ERROR: %s: %s" % (type(e).__name__, e))
+    return report
+
+
+def check_sample(sample, pas_type=None, raw=True, stats=None):
+    """Validate one sample dict in the current worker.
+
+    raw samples, such as read_export returns, go through PAS.format_data
+    first; others are used as PAS.data. Returns the PAS type and PAS.data
+    the sample was checked as, both None if it could not be checked, and
+    its ValidationReport. If stats is a RuleStats, the checks are counted
+    in it.
+    """
+    if worker_registry is None:
+        init_worker(SPEC_PATH)
+
+    try:
+        pas = worker_registry.validator(pas_type or detect_pas_type(sample.get("PASTYPE.")))
+        if raw:
+            pas.format_data(sample)
+        else:
+            pas.data = sample
+        if stats is None:
+            return pas.pas_type, pas.data, pas.check_pas_data(collect=True)
+        with stats.attached(pas):
+            return pas.pas_type, pas.data, pas.check_pas_data(collect=True)
+    except (SystemExit, Exception) as e:
+        return None, None, error_report(e)
+
+
+def validate_file(path, pas_type=None, stats=None):
+    """Validate one tab-delimited lab export or .PAS file in the current worker."""
+    try:
+        if reader_kind(path) == "pas":
+            sample, raw = read_pas(path), False
+        else:
+            sample, raw = read_export(path), True
+    except Exception as e:
+        return path, error_report(e)
+
+    return path, check_sample(sample, pas_type, raw, stats)[2]
+
+
+def validate_files(paths, pas_type=None, workers=None, chunksize=1, spec_path=SPEC_PATH, shared=False):
+    """Validate many lab exports across a process pool.
+
+    Each worker reads spec_path once; with shared=True the spec is compiled
+    once here instead and workers attach to it (see shared_spec). Returns a
+    ValidationReport with every failure tagged by its file and every
+    checked file listed in sources.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    spec = publish_spec(spec_path) if shared else None
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(spec_path, spec and spec.name)
+        ) as executor:
+            results = executor.map(validate_file, paths, repeat(pas_type), chunksize=chunksize)
+            return ValidationReport.merge(results)
+    finally:
+        if spec is not None:
+            spec.close()
+
+
+if __name__ == "__main__":
+    report = validate_files(find_inputs(sys.argv[1:]))
+
+    for failure in report:
+        print("%s: %s" % (failure.source, failure.message))
+
+    sys.exit(0 if report.ok else 1)
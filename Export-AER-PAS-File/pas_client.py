@@ -0,0 +1,94 @@
+"""Thin client for a running pas_daemon.
+
+    with PASClient() as client:
+        report = client.validate(read_pas("sample.PAS"))
+        reports = client.validate_export(open("lab_export.txt").read())
+
+A client keeps one HTTP/1.1 connection to the daemon and reuses it for
+every call, reconnecting once if the daemon closed it in between. Only the
+standard library and export_to_pas are imported, so scripts that just
+validate a sample start quickly. Not thread-safe; use one client per thread.
+"""
+import json
+import http.client
+from urllib.parse import urlencode
+
+from export_to_pas import ValidationReport
+
+HOST = "127.0.0.1"
+PORT = 8731
+TSV = "text/tab-separated-values"
+
+
+class PASClient:
+    def __init__(self, host=HOST, port=PORT, timeout=30.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def request(self, method, path, body=None, content_type="application/json"):
+        """Send one request and return the decoded JSON answer.
+
+        Validation has no side effects, so a request whose connection turns
+        out to be stale is simply sent again on a new one.
+        """
+        headers = {"Content-Type": content_type} if body is not None else {}
+        for retry in (False, True):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                payload = json.loads(response.read())
+                break
+            except (ConnectionError, http.client.HTTPException):
+                self.close()
+                if retry:
+                    raise
+
+        if response.status == 400:
+            raise ValueError(payload["error"])
+        if response.status != 200:
+            raise RuntimeError("ERROR: pas-daemon answered %d: %s" % (response.status, payload.get("error")))
+        return payload
+
+    def health(self):
+        """The daemon's validator version, spec path and PAS types."""
+        return self.request("GET", "/health")
+
+    def post(self, body, content_type, pas_type, raw):
+        query = {"type": pas_type} if pas_type else {}
+        if raw:
+            query["format"] = 1
+        path = "/validate" + ("?" + urlencode(query) if query else "")
+        results = self.request("POST", path, body.encode("utf-8"), content_type)["results"]
+        return [ValidationReport.from_dicts(result["failures"]) for result in results]
+
+    def validate(self, sample, pas_type=None, raw=False):
+        """Validate one mnemonic -> value dict.
+
+        sample is a PAS.data dict as pas_reader.read_pas returns, or with
+        raw=True unformatted lab values that the daemon runs through
+        PAS.format_data first. The type comes from PASTYPE. unless given.
+        """
+        return self.validate_many([sample], pas_type, raw)[0]
+
+    def validate_many(self, samples, pas_type=None, raw=False):
+        """validate for a list of samples in one request; one report each."""
+        return self.post(json.dumps(list(samples)), "application/json", pas_type, raw)
+
+    def validate_export(self, text, pas_type=None):
+        """Validate every row of a tab-delimited lab export given as text."""
+        return self.post(text, TSV, pas_type, True)
@@ -0,0 +1,193 @@
+"""pas-daemon: a long-running local validator with the spec kept compiled.
+
+    python pas_daemon.py [--host 127.0.0.1] [--port 8731] [--spec pas_lookup.csv]
+
+Every PAS type's plan is compiled once at start-up, so a request costs only
+the checks themselves. The daemon speaks HTTP/1.1 with keep-alive on
+localhost, which works on Windows too; pas_client.PASClient is the client.
+
+    GET  /health                  {"version", "spec", "types"}
+    POST /validate[?type=WAN][&format=1]
+
+A /validate body is either JSON (one sample object or a list of them) or,
+with Content-Type text/tab-separated-values, a lab export with one sample
+per row. JSON samples are taken as PAS.data dicts unless format=1 asks for
+PAS.format_data first; export rows are always formatted. The answer is
+{"results": [{"ok", "failures", "seconds"}, ...]}, one result per sample in
+order. A sample that cannot be checked gets an "error" failure, as in
+pas_validate; a body that cannot be parsed gets status 400.
+
+Connections are served on their own threads. PAS objects keep the sample
+being checked, so each thread borrows one from a ValidatorPool and hands
+it back; the pool only grows to the number of concurrent requests.
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from export_to_pas import PAS, VALIDATOR_VERSION, detect_pas_type
+from parallel_validate import error_report
+from pas_client import HOST, PORT, TSV
+from pas_reader import iter_export_rows
+from spec_cache import SPEC_PATH, load_spec_rows
+from spec_registry import SpecRegistry
+
+
+class ValidatorPool:
+    """Compiled plans of every PAS type and idle PAS objects for each."""
+
+    def __init__(self, registry):
+        self.plans = {pas_type: registry.validator(pas_type).plan for pas_type in registry.types()}
+        self.idle = {pas_type: [registry.validator(pas_type)] for pas_type in self.plans}
+        self.lock = threading.Lock()
+
+    def types(self):
+        return list(self.plans)
+
+    def acquire(self, pas_type):
+        if pas_type not in self.plans:
+            sys.exit("ERROR: Cannot find PAS type [%s]." % pas_type)
+
+        with self.lock:
+            if self.idle[pas_type]:
+                return self.idle[pas_type].pop()
+
+        pas = PAS(None)
+        pas.use_plan(pas_type, self.plans[pas_type])
+        return pas
+
+    def release(self, pas):
+        with self.lock:
+            self.idle[pas.pas_type].append(pas)
+
+    def validate(self, sample, pas_type=None, raw=False):
+        """Check one sample dict; errors come back as "error" failures."""
+        try:
+            pas = self.acquire(pas_type or detect_pas_type(sample.get("PASTYPE.")))
+            try:
+                if raw:
+                    pas.format_data(sample)
+                else:
+                    pas.data = sample
+                return pas.check_pas_data(collect=True)
+            finally:
+                self.release(pas)
+        except (SystemExit, Exception) as e:
+            return error_report(e)
+
+
+def read_samples(body, content_type):
+    """The sample dicts of a /validate body and whether they must be formatted."""
+    if content_type == TSV:
+        return list(iter_export_rows(body.decode("utf-8").splitlines())), True
+
+    samples = json.loads(body)
+    if isinstance(samples, dict):
+        samples = [samples]
+    if not isinstance(samples, list) or not all(isinstance(sample, dict) for sample in samples):
+        raise ValueError("expected a sample object or a list of them")
+    return samples, False
+
+
+class ValidationHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "pas-daemon/%d" % VALIDATOR_VERSION
+    # Headers and body go out in two writes; with Nagle on, the body then
+    # waits for the client's delayed ACK, about 40 ms per request.
+    disable_nagle_algorithm = True
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/health":
+            self.send_json(404, {"error": "unknown path %s" % self.path})
+            return
+
+        self.send_json(
+            200, {"version": VALIDATOR_VERSION, "spec": self.server.spec_path, "types": self.server.pool.types()}
+        )
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if url.path != "/validate":
+            self.send_json(404, {"error": "unknown path %s" % self.path})
+            return
+
+        query = parse_qs(url.query)
+        pas_type = query.get("type", [None])[0]
+        try:
+            samples, raw = read_samples(body, self.headers.get_content_type())
+        except ValueError as e:
+            self.send_json(400, {"error": "ERROR: cannot read samples: %s" % e})
+            return
+        raw = raw or query.get("format", ["0"])[0] not in ("", "0", "false")
+
+        results = []
+        for sample in samples:
+            start = time.perf_counter()
+            report = self.server.pool.validate(sample, pas_type, raw)
+            results.append(
+                {
+                    "ok": report.ok,
+                    "failures": [
+                        {key: value for key, value in failure.items() if key != "source"}
+                        for failure in report.to_dicts()
+                    ],
+                    "seconds": round(time.perf_counter() - start, 6),
+                }
+            )
+        self.send_json(200, {"results": results})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ValidationServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, registry, spec_path=None, verbose=False):
+        self.pool = ValidatorPool(registry)
+        self.spec_path = spec_path
+        self.verbose = verbose
+        super().__init__(address, ValidationHandler)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="pas-daemon", description="Serve PAS validation on localhost.")
+    parser.add_argument("--host", default=HOST, help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=PORT, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--spec", default=SPEC_PATH, help="pas_lookup.csv to validate against")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request to stderr")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = ValidationServer(
+        (args.host, args.port), SpecRegistry(load_spec_rows(args.spec)), args.spec, args.verbose
+    )
+    print("pas-daemon listening on %s:%d" % server.server_address[:2], file=sys.stderr, flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+
+# YYYY MM DD, YYYY MM DD HHHH and YYYY MM DD HHHH:SS
+DAY_PATTERN = r"^(\d{4}) (\d{2}) (\d{2})(?: (\d{2})(\d{2})(?::(\d{2}))?)?$"
+DAY_REGEX = re.compile(DAY_PATTERN)
+DAY_LAYOUT = "YYYY MM DD"
+# FIELD SIZE of a DAY field -> number of DAY_PATTERN groups its values fill.
+DAY_PARTS = {"YYYY MM DD": 3, "YYYY MM DD HHHH": 5, "YYYY MM DD HHHH:SS": 6}
+
+
+def day_parts(layout):
+    """The DAY_PARTS of a FIELD SIZE such as "YYYY MM DD HHHH", or None for any layout."""
+    return None if layout is None else DAY_PARTS.get(" ".join(str(layout).split()))
+
+
+@lru_cache(maxsize=65536)
+def parse_day(value, parts=None):
+    """Parse one PAS day string to a datetime, or None if it is not a real date.
+
+    With parts from day_parts, only values in that layout are accepted.
+    """
+    match = DAY_REGEX.match(str(value).strip())
+    if match is None:
+        return None
+
+    groups = [int(part) for part in match.groups() if part is not None]
+    if parts is not None and len(groups) != parts:
+        return None
+
+    try:
+        return datetime(*groups)
+    except ValueError:
+        return None
+
+
+def parse_unique_days(strings, parts=None):
+    """Vectorized parse of distinct day strings into datetime64[s] (NaT if invalid)."""
+    import numpy as np
+    import pandas as pd
+
+    groups = pd.Series(strings, dtype=object).astype(str).str.strip().str.extract(DAY_PATTERN)
+    matched = groups[0].notna().to_numpy()
+    if parts is not None:
+        matched &= groups.notna().sum(axis=1).to_numpy() == parts
+    year, month, day, hour, minute, second = groups.fillna("0").astype(np.int64).to_numpy().T
+
+    valid = matched & (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+    month = np.where(valid, month, 1)
+
+    month_start = (
+        (np.where(valid, year, 1970) - 1970).astype("timedelta64[Y]") + np.datetime64("1970", "Y")
+    ).astype("datetime64[M]") + (month - 1).astype("timedelta64[M]")
+    month_days = ((month_start + 1).astype("datetime64[D]") - month_start.astype("datetime64[D]")).astype(np.int64)
+    valid &= (day <= month_days) & (hour < 24) & (minute < 60) & (second < 60)
+
+    parsed = (
+        month_start.astype("datetime64[s]")
+        + (day - 1).astype("timedelta64[D]")
+        + hour.astype("timedelta64[h]")
+        + minute.astype("timedelta64[m]")
+        + second.astype("timedelta64[s]")
+    )
+    parsed[~valid] = np.datetime64("NaT")
+    return parsed
+
+
+def parse_days(values, parts=None):
+    """Parse an array (any shape) of PAS day strings into datetime64[s].
+
+    Each distinct string is parsed once; nulls, invalid calendar dates and,
+    with parts, values in another layout become NaT.
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = np.asarray(values, dtype=object)
+    codes, uniques = pd.factorize(values.ravel())
+
+    parsed = np.full(codes.shape, np.datetime64("NaT"), dtype="datetime64[s]")
+    if len(uniques):
+        found = codes >= 0
+        parsed[found] = parse_unique_days(np.asarray(uniques, dtype=object), parts)[codes[found]]
+
+    return parsed.reshape(values.shape)
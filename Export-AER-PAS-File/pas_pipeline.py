@@ -0,0 +1,263 @@
+"""pas-pipeline: turn folders of lab exports into validated PAS files.
+
+    python pas_pipeline.py --output out [--jobs N] [--readers 4] [--writers 2] DROP_FOLDER...
+
+Every *.txt lab export under the drop folders goes through three asyncio
+stages joined by bounded queues:
+
+    read      read_export in a thread pool (--readers batches at a time)
+    validate  format_data and check_pas_data in a process pool of --jobs
+              workers (--validators batches in flight, default 2 * jobs)
+    write     PASWriter.write_file in the thread pool (--writers batches at a time)
+
+Each queue holds at most --queue-size items, so a stage that falls behind,
+a slow disk or a batch of large GAN files, holds the stages before it back
+instead of filling memory, while the other workers of a stage keep going.
+Each stage hands its pool whatever items are already queued, up to
+--batch-size, in one call: a round trip to a worker per sample costs more
+than reading, checking or writing it, so a steady stream moves in batches
+while a trickle still goes through one file at a time.
+
+Samples that pass are written to OUTPUT/<drop folder name>/<relative path>
+with a .PAS suffix; failed samples are not written. The report is one JSON
+line per export on stdout, as from pas_validate plus an "output" path, in
+completion order, then a summary line. Exit status is as for pas_validate.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from parallel_validate import check_sample, error_report, find_inputs, init_worker
+from pas_reader import read_export
+from pas_validate import EXIT_ERROR, EXIT_FAILED, EXIT_OK, result_record
+from pas_writer import PASWriter
+from spec_cache import SPEC_PATH, load_spec
+
+# Put on a queue once per downstream worker when a stage is finished.
+DONE = None
+
+
+def read_exports(paths):
+    """(sample, None) or (None, error report) for each export path."""
+    results = []
+    for path in paths:
+        try:
+            results.append((read_export(path), None))
+        except Exception as e:
+            results.append((None, error_report(e)))
+    return results
+
+
+def timed_checks(samples, pas_type=None):
+    """check_sample plus the seconds it took for each of samples, in a worker."""
+    results = []
+    for sample in samples:
+        start = time.perf_counter()
+        results.append(check_sample(sample, pas_type) + (time.perf_counter() - start,))
+    return results
+
+
+def drop_root(folder):
+    """The folder exports found under folder are named relative to."""
+    folder = os.path.normpath(folder)
+    return folder if os.path.isdir(folder) else os.path.dirname(folder)
+
+
+def output_path(output, root, path):
+    """Where the PAS file of the export at path, found under drop_root root, goes."""
+    relative = os.path.splitext(os.path.relpath(path, root))[0] + ".PAS"
+    return os.path.join(output, os.path.basename(os.path.abspath(root)), relative)
+
+
+async def run_stage(work, inbox, outbox, workers, downstream, batch=1):
+    """Run workers tasks that pass the items of inbox through work to outbox.
+
+    work takes a list of up to batch items, those already waiting in inbox,
+    and returns a list of results. A worker stops at DONE. Once every
+    worker has stopped, downstream DONEs are put on outbox for the next
+    stage.
+    """
+
+    async def worker():
+        while True:
+            items = [await inbox.get()]
+            while len(items) < batch and items[-1] is not DONE and not inbox.empty():
+                items.append(inbox.get_nowait())
+
+            finished = items[-1] is DONE
+            if finished:
+                items.pop()
+            if items:
+                for result in await work(items):
+                    if outbox is not None:
+                        await outbox.put(result)
+            if finished:
+                return
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    if outbox is not None:
+        for _ in range(downstream):
+            await outbox.put(DONE)
+
+
+class Pipeline:
+    """The three stages over one thread pool, one process pool and a PASWriter.
+
+    Results are handed to on_result(record) in completion order.
+    """
+
+    def __init__(
+        self,
+        output,
+        pas_type=None,
+        jobs=1,
+        readers=4,
+        validators=None,
+        writers=2,
+        queue_size=64,
+        batch_size=16,
+        spec_path=SPEC_PATH,
+        on_result=None,
+    ):
+        self.output = output
+        self.pas_type = pas_type
+        self.jobs = jobs
+        self.readers = readers
+        self.validators = validators or 2 * jobs
+        self.writers = writers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.spec_path = spec_path
+        self.on_result = on_result or (lambda record: None)
+
+        self.writer = PASWriter(load_spec(spec_path))
+        for analysis in self.writer.pt["ANALYSIS"].unique():
+            self.writer.compile(analysis)
+
+    async def run(self, folders):
+        loop = asyncio.get_running_loop()
+        paths, samples, checked = (asyncio.Queue(self.queue_size) for _ in range(3))
+
+        with ThreadPoolExecutor(self.readers + self.writers) as io, ProcessPoolExecutor(
+            self.jobs, initializer=init_worker, initargs=(self.spec_path,)
+        ) as pool:
+
+            async def find():
+                for folder in folders:
+                    root = drop_root(folder)
+                    for path in await loop.run_in_executor(io, find_inputs, [folder]):
+                        await paths.put((root, path))
+                for _ in range(self.readers):
+                    await paths.put(DONE)
+
+            async def read(items):
+                results = await loop.run_in_executor(io, read_exports, [path for _, path in items])
+                return [item + result for item, result in zip(items, results)]
+
+            async def validate(items):
+                readable = [item for item in items if item[3] is None]
+                checks = await loop.run_in_executor(pool, timed_checks, [item[2] for item in readable], self.pas_type)
+                results = [(root, path, None, None, report, 0.0) for root, path, _, report in items if report]
+                results += [item[:2] + check for item, check in zip(readable, checks)]
+                return results
+
+            async def write(items):
+                outputs = await loop.run_in_executor(io, self.write_files, items)
+                for (root, path, pas_type, data, report, seconds), (output, error) in zip(items, outputs):
+                    record = result_record(path, error or report, seconds)
+                    record["output"] = output
+                    self.on_result(record)
+                return []
+
+            await asyncio.gather(
+                find(),
+                run_stage(read, paths, samples, self.readers, self.validators, self.batch_size),
+                run_stage(validate, samples, checked, self.validators, self.writers, self.batch_size),
+                run_stage(write, checked, None, self.writers, 0, self.batch_size),
+            )
+
+    def write_files(self, items):
+        """Write the PAS file of each checked item that passed.
+
+        Returns (output path or None, error report or None) for each item.
+        """
+        results = []
+        for root, path, pas_type, data, report, seconds in items:
+            if not report.ok:
+                results.append((None, None))
+                continue
+
+            output = output_path(self.output, root, path)
+            try:
+                os.makedirs(os.path.dirname(output), exist_ok=True)
+                self.writer.write_file(output, pas_type, data)
+                results.append((output, None))
+            except (OSError, ValueError) as e:
+                results.append((None, error_report(e)))
+        return results
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="pas-pipeline", description="Validate lab exports and write PAS files.")
+    parser.add_argument("folders", nargs="+", help="drop folders searched recursively for *.txt exports")
+    parser.add_argument("-o", "--output", required=True, help="folder to write the PAS files to")
+    parser.add_argument("-t", "--type", dest="pas_type", help="PAS type to use instead of each file's PASTYPE.")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="validation processes")
+    parser.add_argument("--readers", type=int, default=4, help="files read at a time")
+    parser.add_argument("--validators", type=int, help="samples being validated at a time (default: 2 * jobs)")
+    parser.add_argument("--writers", type=int, default=2, help="PAS files written at a time")
+    parser.add_argument("--queue-size", type=int, default=64, help="items each queue holds before backpressure")
+    parser.add_argument("--batch-size", type=int, default=16, help="most samples sent to a worker in one call")
+    parser.add_argument("--spec", default=SPEC_PATH, help="pas_lookup.csv to validate against")
+    args = parser.parse_args(argv)
+
+    for name in ("jobs", "readers", "validators", "writers", "queue_size", "batch_size"):
+        value = getattr(args, name)
+        if value is not None and value < 1:
+            parser.error("--%s must be at least 1" % name.replace("_", "-"))
+    return args
+
+
+def main(argv=None, out=None):
+    args = parse_args(argv)
+    out = out or sys.stdout
+    start = time.perf_counter()
+    summary = {"files": 0, "failed": 0, "errors": 0, "written": 0}
+
+    def on_result(record):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+        summary["files"] += 1
+        summary["failed"] += not record["ok"]
+        summary["errors"] += record["error"]
+        summary["written"] += record["output"] is not None
+
+    pipeline = Pipeline(
+        args.output,
+        args.pas_type,
+        args.jobs,
+        args.readers,
+        args.validators,
+        args.writers,
+        args.queue_size,
+        args.batch_size,
+        args.spec,
+        on_result,
+    )
+    asyncio.run(pipeline.run(args.folders))
+
+    summary["seconds"] = round(time.perf_counter() - start, 6)
+    out.write(json.dumps({"summary": summary}) + "\n")
+    out.flush()
+
+    if summary["errors"] or not summary["files"]:
+        return EXIT_ERROR
+    return EXIT_FAILED if summary["failed"] else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import os
+import csv
+
+from spec_cache import NA_VALUES
+
+
+def parse_line(line):
+    """Split a ~SECTION,MNEMONIC,VALUE,DESCRIPTION line into its four parts.
+
+    Returns None for comments and ~DT table lines. Values may contain spaces
+    (2021 11 25) but not commas, which PASWriter rejects; the description is
+    everything after the value and may contain commas.
+    """
+    if not line.startswith("~") or line.startswith("~DT"):
+        return None
+
+    section, mnemonic, rest = line.rstrip("\r\n").split(",", 2)
+    value, _, description = rest.partition(",")
+    return section[1:], mnemonic.strip(), value, description
+
+
+def reader_kind(path):
+    """"pas" if path is read with read_pas, "export" if with read_export."""
+    return "pas" if path.upper().endswith(".PAS") else "export"
+
+
+def read_pas(path):
+    """Read one .PAS file into a PAS.data-compatible dict of mnemonic -> value."""
+    data = {}
+
+    with open(path, newline="") as f:
+        for line in f:
+            fields = parse_line(line)
+            if fields is not None:
+                value = fields[2].strip()
+                data[fields[1]] = value if value != "" else None
+
+    return data
+
+
+def read_export(path):
+    """Read the first sample of a tab-delimited lab export into a dict.
+
+    Values stay as the raw strings in the file; missing values (the same
+    tokens pandas.read_csv treats as NaN) become None. The result can be
+    passed to PAS.format_data in place of a DataFrame.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f, delimiter="\t")
+        columns = next(reader)
+        row = next(reader, [])
+
+    return export_row(columns, row)
+
+
+def export_row(columns, row):
+    return {
+        column: value if value not in NA_VALUES else None
+        for column, value in zip(columns, row + [""] * (len(columns) - len(row)))
+    }
+
+
+def iter_export_rows(lines):
+    """Yield every sample of tab-delimited export lines as read_export reads the first.
+
+    lines is any iterable of lines, such as an open file or str.splitlines();
+    blank rows are skipped.
+    """
+    reader = csv.reader(lines, delimiter="\t")
+    columns = next(reader, None)
+    if columns is None:
+        return
+
+    for row in reader:
+        if row:
+            yield export_row(columns, row)
+
+
+def iter_export_chunks(path, chunksize=10000):
+    """Yield a large tab-delimited lab export as DataFrames of chunksize samples.
+
+    Only one chunk is held at a time. Values are read as text, with the
+    same missing-value tokens as read_export, and the index numbers the
+    samples from 0 across the whole file.
+    """
+    import pandas as pd
+
+    yield from pd.read_csv(path, sep="\t", dtype=str, chunksize=chunksize)
+
+
+def iter_pas_paths(directory, suffix=".PAS"):
+    """Lazily walk a directory tree for PAS files, in sorted order per directory."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.upper().endswith(suffix.upper()):
+                yield os.path.join(root, name)
+
+
+def iter_pas_files(paths):
+    """Yield (path, data) for each PAS file, reading one file at a time."""
+    for path in paths:
+        yield path, read_pas(path)
+
+
+def iter_pas_frames(paths, batch_size=10000):
+    """Yield DataFrames of at most batch_size PAS files, one row per file.
+
+    The frames are indexed by path and can be passed to PAS.validate_frame.
+    """
+    import pandas as pd
+
+    batch, index = [], []
+
+    for path, data in iter_pas_files(paths):
+        batch.append(data)
+        index.append(path)
+
+        if len(batch) == batch_size:
+            yield pd.DataFrame(batch, index=index)
+            batch, index = [], []
+
+    if batch:
+        yield pd.DataFrame(batch, index=index)
@@ -0,0 +1,330 @@
+"""Cross-field rules for every PAS type, as data.
+
+Each Rule picks the plan entries it applies to (by section, by mnemonic or
+both, less exclude), the conditions on other fields under which it fires,
+and what it then asks of the entry's own value:
+
+    null      the value must be null
+    required  the value must not be null
+    range     the value must be a number in (arg[0], arg[1])
+    equal     the value must be the number arg
+
+A condition is (mnemonic, op) or (mnemonic, op, value) with op one of
+"==", "!=", "in", "not in", ">", "not >", "present" and "null"; a rule
+fires when all of its conditions hold. Conditions on a NUMB field compare
+numbers, others compare the text; a ZERO_FILLED code is padded with leading
+zeros to its field width first, so "3" matches "03". A rule with skip=True also turns off the
+per-value checks of the entry wherever it fires, as for a section the
+sample does not include.
+
+PAS.compile_rule attaches the compiled rules of each entry as entry.gates;
+check_entry tests them one sample at a time and validate_frame as boolean
+masks over a whole batch. Rules whose conditions read a field the PAS type
+does not have are left out.
+"""
+import math
+from collections import namedtuple
+
+FS_HEADER = {"~ HEADER DATA - FIRST STAGE SEPARATOR GAS ANALYSIS"}
+SS_SECTIONS = {
+    "~ HEADER DATA - SECOND STAGE SEPARATOR - GAS ANALYSIS",
+    "~ SECOND STAGE SEPARATOR - GAS ANALYSIS",
+}
+CL_SECTIONS = {
+    "~ HEADER DATA - CONDENSATE / LIQUID ANALYSIS",
+    "~ CONDENSATE / LIQUID ANALYSIS - DATA PROPERTIES",
+}
+RECOMBINED_SECTIONS = {
+    "~ RECOMBINED GAS ANALYSIS - DATA PROPERTIES",
+    "~ RECOMBINED GAS PROPERTIES",
+}
+RECOMBINED_COMPOSITION = "~ RECOMBINED GAS COMPOSITION"
+RECOMBINED_OPTIONAL = {"R-PPC.KPAA", "R-PTC.DEGK", "SS-GAS.E3M3/D"}
+
+Rule = namedtuple(
+    "Rule",
+    ["types", "action", "when", "fields", "mnemonics", "exclude", "arg", "skip"],
+    defaults=[None, None, None, None, False],
+)
+
+# A compiled Rule for one plan entry.
+Gate = namedtuple("Gate", ["action", "conditions", "arg", "skip"])
+Condition = namedtuple("Condition", ["mnemonic", "op", "value", "numeric", "negate"])
+
+NEGATIONS = {"!=": "==", "not in": "in", "not >": ">", "null": "present"}
+NUMERIC_ACTIONS = {"range", "equal"}
+
+# CHAR codes the spec accepts with or without a leading zero -> field width.
+ZERO_FILLED = {"TTYP.": 2}
+
+GAN = {"GAN"}
+TEST_TYPES = {"03", "13"}
+AOF = ("AOFTY.", "present")
+
+RULES = (
+    # GAN sections that depend on the sample type and separator conditions.
+    Rule(GAN, "null", (("STYP.", "==", "C"),), fields=FS_HEADER, skip=True),
+    Rule(GAN, "null", (("SEPCOND.", "!=", "B"),), fields=SS_SECTIONS, skip=True),
+    # SS-SPRES. and SS-STEMP. are required from SS-SDAT.DAY via date_dependency instead.
+    Rule(
+        GAN, "required", (("SEPCOND.", "==", "B"),),
+        fields=SS_SECTIONS, exclude={"SS-SPRES.KPAA", "SS-STEMP.DEGC"},
+    ),
+    Rule(GAN, "null", (("HYDLP.", "==", "N"),), fields=CL_SECTIONS, skip=True),
+    Rule(GAN, "required", (("HYDLP.", "!=", "N"),), fields=CL_SECTIONS, mnemonics={"H2SLP.", "LIQRDN."}),
+    Rule(GAN, "range", (("HYDLP.", "!=", "N"),), fields=CL_SECTIONS, mnemonics={"LIQRDN."}, arg=(-math.inf, 1)),
+    Rule(GAN, "null", (("STYP.", "!=", "R"),), fields=RECOMBINED_SECTIONS),
+    Rule(GAN, "required", (("STYP.", "==", "R"),), fields=RECOMBINED_SECTIONS, exclude=RECOMBINED_OPTIONAL),
+    Rule(
+        GAN, "required", (("STYP.", "==", "R"), ("SEPCOND.", "==", "B")),
+        fields=RECOMBINED_SECTIONS, mnemonics={"SS-GAS.E3M3/D"},
+    ),
+    Rule(GAN, "required", (("STYP.", "==", "R"),), fields={RECOMBINED_COMPOSITION}),
+    Rule(GAN, "required", (("STYP.", "==", "R"),), mnemonics={"GLR.M3/M3"}),
+    Rule(GAN, "null", (("H2SLC.", "==", "L"),), mnemonics={"FLDH2S.PPM", "H2SMT."}),
+    Rule(GAN, "required", (("H2SLC.", "!=", "L"),), mnemonics={"FLDH2S.PPM", "H2SMT."}),
+    Rule(GAN, "equal", (("H2SLC.", "!=", "L"), ("H2SMT.", "==", "N")), mnemonics={"FLDH2S.PPM"}, arg=0),
+    Rule(GAN, "required", (("H2SLC.", "!=", "F"),), mnemonics={"LABH2S.FRAC"}),
+
+    # DST
+    Rule({"DST"}, "required", (("PRPS.", "==", "I"),), mnemonics={"WTYP.", "STGR.KPA/M"}),
+    Rule({"DST"}, "required", (("MSRN.", "==", "N"),), mnemonics={"PRGA.KPAA", "PRFFG.KPAA"}),
+    Rule(
+        {"DST"}, "required", (("TTYP.", "in", ("08", "18")),),
+        mnemonics={"CCCO.", "SDPT.KPAA/MIN", "PSUR.KPAA", "QCCLIQ.M3/D", "QCCGAS.E3M3/D"},
+    ),
+    Rule({"DST"}, "required", (("QGFF.E3M3/D", ">", 0),), mnemonics={"QGMX.E3M3/D"}),
+    Rule({"DST"}, "required", (("QOFF.M3/D", ">", 0),), mnemonics={"QOMX.M3/D"}),
+    Rule({"DST"}, "required", (("QWFF.M3/D", ">", 0),), mnemonics={"QWMX.M3/D"}),
+    Rule({"DST"}, "required", (("QGMX.E3M3/D", ">", 0),), mnemonics={"TFGS.MIN"}),
+    Rule({"DST"}, "null", (("QGMX.E3M3/D", "not >", 0),), mnemonics={"TFGS.MIN"}),
+    Rule({"DST"}, "required", (("QOMX.M3/D", ">", 0),), mnemonics={"TFOS.MIN"}),
+    Rule({"DST"}, "null", (("QOMX.M3/D", "not >", 0),), mnemonics={"TFOS.MIN"}),
+    Rule({"DST"}, "required", (("QWMX.M3/D", ">", 0),), mnemonics={"TFWS.MIN"}),
+    Rule({"DST"}, "null", (("QWMX.M3/D", "not >", 0),), mnemonics={"TFWS.MIN"}),
+    Rule({"DST"}, "required", (("CUTP.", "==", 3),), mnemonics={"CUGP.KPAA"}),
+    Rule(
+        {"DST"}, "required", (("CUTP.", "present"), ("CUTP.", "not in", (0, 3))),
+        mnemonics={"CUIL.M", "LCGR.KPA/M"},
+    ),
+    Rule({"DST"}, "required", (("RPXX.", "in", ("V", "H")),), mnemonics={"RXXD."}),
+    Rule({"DST"}, "required", (("WTYP.", "in", ("D", "H")),), mnemonics={"SDGT.M"}),
+
+    # PRD
+    Rule({"PRD"}, "required", (("MDTYPE.", "==", "O"),), mnemonics={"TAP.", "TAPL."}),
+    Rule({"PRD"}, "required", (("MDTYPE.", "==", "T"),), mnemonics={"TCON.PULSES/M3", "TRBG.PULSE"}),
+    Rule({"PRD"}, "null", (("MDTYPE.", "!=", "T"),), mnemonics={"TRBG.PULSE"}),
+    Rule({"PRD"}, "required", (("MDTYPE.", "==", "i"),), mnemonics={"ICON."}),
+    Rule({"PRD"}, "required", (("MDTYPE.", "==", "V"),), mnemonics={"BETA.", "MCOF."}),
+    Rule({"PRD"}, "required", (("MDTYPE.", "in", ("C", "O")),), mnemonics={"PLATE.MM"}),
+    Rule({"PRD"}, "null", (("MDTYPE.", "not in", ("C", "O")),), mnemonics={"PLATE.MM"}),
+    Rule({"PRD"}, "required", (("MDTYPE.", "in", ("C", "O", "i", "V")),), mnemonics={"DIFG.KPA"}),
+    Rule({"PRD"}, "required", (("LQMTYP.", "==", "T"),), mnemonics={"TCON.PULSE/M3", "TRBF.PULSE"}),
+    Rule({"PRD"}, "required", (("LQMTYP.", "in", ("L", "V")),), mnemonics={"TMEA.", "GNVF.M3"}),
+    Rule({"PRD"}, "required", (("LQMTYP.", "==", "L"),), mnemonics={"TEQU.", "GNLF.MM"}),
+    Rule({"PRD"}, "required", (("LIQT.", "==", "O"),), mnemonics={"BSW.FRAC", "OILRATE.M3/D"}),
+    Rule({"PRD"}, "required", (("LIQT.", "==", "C"),), mnemonics={"CONRATE.M3/D"}),
+    Rule({"PRD"}, "required", (("LIQT.", "==", "W"),), mnemonics={"WTRRATE.M3/D"}),
+    Rule({"PRD"}, "required", (("CSPS.KPAA", "null"),), mnemonics={"TUPS.KPAA"}),
+    Rule({"PRD"}, "required", (("TUPS.KPAA", "null"),), mnemonics={"CSPS.KPAA"}),
+    Rule({"PRD"}, "required", (("VTGAS.E3M3", ">", 0),), mnemonics={"QTGAS.E3M3/D"}),
+    Rule({"PRD"}, "required", (("VTOIL.M3", ">", 0),), mnemonics={"QTOIL.M3/D"}),
+    Rule({"PRD"}, "required", (("VTCON.M3", ">", 0),), mnemonics={"QTCON.M3/D"}),
+    Rule({"PRD"}, "required", (("VTWTR.M3", ">", 0),), mnemonics={"QTWTR.M3/D"}),
+
+    # GRD
+    Rule(
+        {"GRD"}, "required", (("AFLO.", "in", ("T", "B")), ("TTYP.", "in", TEST_TYPES)),
+        mnemonics={"TUPS.KPAA", "FTUPS.KPAA"},
+    ),
+    Rule(
+        {"GRD"}, "required", (("AFLO.", "in", ("A", "C", "B")), ("TTYP.", "in", TEST_TYPES)),
+        mnemonics={"CSPS.KPAA", "FCSPS.KPAA"},
+    ),
+    Rule({"GRD"}, "required", (("TTYP.", "in", ("10", "23", "33")),), mnemonics={"TSUR.DEGC", "PSUR.KPAA"}),
+    Rule({"GRD"}, "required", (("TTYP.", "==", "10"),), mnemonics={"QGAS.E3M3/D", "QOIL.M3/D", "QWTR.M3/D", "LLVL.M"}),
+    Rule({"GRD"}, "required", (("TTYP.", "in", ("10", "33")),), mnemonics={"METHC."}),
+    Rule({"GRD"}, "required", (("TTYP.", "==", "10"), ("PRPS.", "==", "A")), mnemonics={"DPTS."}),
+    Rule(
+        {"GRD"}, "required", (("TTYP.", "in", TEST_TYPES),),
+        mnemonics={"SDGAL.M", "PRGA.KPAA", "PRCOR.KPA", "GRSDL.KPA/M", "TGA.DEGC", "GONB.DAY/HR/SS", "GOFB.DAY/HR/SS"},
+    ),
+    Rule(
+        {"GRD"}, "required", (("TTYP.", "in", TEST_TYPES), ("WTYP.", "in", ("D", "H"))),
+        mnemonics={"SDGAT.M", "GRSDT.KPA/M"},
+    ),
+    Rule({"GRD"}, "required", (("TTYP.", "present"), ("TTYP.", "!=", "10")), mnemonics={"TCUM.HR"}),
+    Rule({"GRD"}, "required", (("WSFL.", "in", (1, 6, 17)),), mnemonics={"PLIND."}),
+    Rule({"GRD"}, "required", (("SLGR.KPA/M", ">", 0),), mnemonics={"SLIND."}),
+    Rule({"GRD"}, "required", (("PLIND.", "present"),), mnemonics={"PLGR.KPA/M"}),
+    Rule({"GRD"}, "required", (("SLIND.", "present"),), mnemonics={"SLGR.KPA/M"}),
+    Rule({"GRD"}, "required", (("PRPS.", "present"), ("PRPS.", "!=", "O")), mnemonics={"GRGAS.KPA/M", "GRLIQ.KPA/M"}),
+
+    # TRG
+    Rule({"TRG"}, "required", (("TULD.", "==", "Y"), ("AFLO.", "in", ("T", "B"))), mnemonics={"TUBS.MM"}),
+    Rule({"TRG"}, "required", (("AFLO.", "in", ("A", "C", "B")),), mnemonics={"PCID.MM"}),
+    Rule(
+        {"TRG"}, "required", (("AFLO.", "in", ("T", "B")), ("PRSTY.", "!=", 34)),
+        mnemonics={"TUPS.KPAA", "FTUPS.KPAA"},
+    ),
+    Rule(
+        {"TRG"}, "required", (("AFLO.", "in", ("A", "C", "B")), ("PRSTY.", "!=", 34)),
+        mnemonics={"CSPS.KPAA", "FCSPS.KPAA"},
+    ),
+    Rule({"TRG"}, "required", (AOF,), mnemonics={"AIN.", "LIT.", "QGLM.E3M3/D", "QGST.E3M3/D"}),
+    Rule(
+        {"TRG"}, "required", (AOF, ("AOFTY.", "!=", 31)),
+        mnemonics={"AOFEXT.E3M3/D", "AOFSF.E3M3/D", "PFSF.KPAA", "LMPFSF.KPAA", "PAVG.KPAA"},
+    ),
+    Rule({"TRG"}, "null", (("AOFTY.", "==", 31),), mnemonics={"AOFEXT.E3M3/D", "AOFSF.E3M3/D", "NSF."}),
+    Rule(
+        {"TRG"}, "required", (("AOFTY.", "==", 31),),
+        mnemonics={"AOFWEX.E3M3/D", "AOFWH.E3M3/D", "PFWH.KPAA", "WPRE.KPAA", "LMPFWH.KPAA"},
+    ),
+    Rule(
+        {"TRG"}, "required", (("AOFTY.", "==", 41),),
+        mnemonics={"QOLM.M3/D", "QOST.M3/D", "IPRST.M3/D", "IPRMAX.M3/D"},
+    ),
+    Rule({"TRG"}, "required", (("QCON.M3/D", ">", 0),), mnemonics={"CONGR.M3/E-3M3", "GEQV.E3M3/D", "QRGAS.E3M3/D"}),
+    Rule({"TRG"}, "required", (("INTRP.", "==", "Y"),), mnemonics={"ANCO.", "SKIN.", "KH.MDM", "PEXTR.KPAA"}),
+    Rule({"TRG"}, "null", (("INTRP.", "!=", "Y"),), mnemonics={"PEXTR.KPAA"}),
+    Rule(
+        {"TRG"}, "required", (("PRSTY.", "==", 50), ("INTRP.", "==", "Y")),
+        mnemonics={
+            "GRPEXTR.KPA/M", "PRISIP.KPAA", "GRISIP.KPA/M", "INJFL.", "QDFIT.M3/MINUTE", "VTDFIT.M3", "LLDFIT.M",
+        },
+    ),
+    Rule({"TRG"}, "required", (("PRSTY.", "in", (11, 12)),), mnemonics={"METHC.", "LLVL.M"}),
+    Rule({"TRG"}, "required", (("WTYP.", "==", "H"),), mnemonics={"HZFL.M"}),
+    Rule({"TRG"}, "null", (("WTYP.", "==", "V"),), mnemonics={"HZFL.M"}),
+    Rule({"TRG"}, "required", (("WTYP.", "in", ("D", "H")),), mnemonics={"LLVT.M"}),
+    Rule({"TRG"}, "required", (("WSFL.", "==", 2),), mnemonics={"RDGAS."}),
+    Rule({"TRG"}, "required", (("WSFL.", "==", 1),), mnemonics={"PBP.KPAA", "BO.RM3/M3", "RS.M3/M3"}),
+    Rule({"TRG"}, "required", (("WSFL.", "in", (1, 17)),), mnemonics={"GROIL.KPA/M"}),
+    Rule({"TRG"}, "required", (("QWTR.M3/D", ">", 0),), mnemonics={"GRWTR.KPA/M"}),
+    Rule({"TRG"}, "equal", (("SURBTM.", "==", "S"),), mnemonics={"RDGAL.M"}, arg=0),
+)
+
+
+def compile_condition(condition, kinds):
+    mnemonic, op = condition[0], condition[1]
+    value = condition[2] if len(condition) > 2 else None
+    negate = op in NEGATIONS
+    op = NEGATIONS.get(op, op)
+
+    numeric = kinds[mnemonic] == "NUMB"
+    if op == ">" and not numeric:
+        raise ValueError("%s is not a NUMB field" % mnemonic)
+    if op == "in":
+        value = tuple(float(v) if numeric else str(v) for v in value)
+    elif op != "present":
+        value = float(value) if numeric else str(value)
+
+    return Condition(mnemonic, op, value, numeric, negate)
+
+
+def compile_gates(pas_type, mnemonic, field, kind, kinds, rules=RULES):
+    """The Gates of rules that apply to one plan entry, in table order.
+
+    kinds maps every mnemonic of the PAS type to "DAY", "CHAR" or "NUMB".
+    """
+    gates = []
+    for rule in rules:
+        if pas_type not in rule.types:
+            continue
+        if rule.fields is not None and field not in rule.fields:
+            continue
+        if rule.mnemonics is not None and mnemonic not in rule.mnemonics:
+            continue
+        if rule.exclude is not None and mnemonic in rule.exclude:
+            continue
+        if rule.action in NUMERIC_ACTIONS and kind != "NUMB":
+            continue
+        if any(condition[0] not in kinds for condition in rule.when):
+            continue
+        conditions = tuple(compile_condition(condition, kinds) for condition in rule.when)
+        gates.append(Gate(rule.action, conditions, rule.arg, rule.skip))
+    return tuple(gates)
+
+
+def to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def condition_text(mnemonic, value):
+    """value as text conditions compare it: as text, padded if ZERO_FILLED."""
+    if value is None:
+        return None
+    width = ZERO_FILLED.get(mnemonic)
+    return str(value) if width is None else str(value).zfill(width)
+
+
+def condition_holds(condition, data):
+    """Whether condition holds for one sample dict."""
+    value = data.get(condition.mnemonic)
+
+    if condition.op == "present":
+        result = value is not None
+    elif condition.numeric:
+        number = to_number(value)
+        if number is None:
+            result = False
+        elif condition.op == "==":
+            result = number == condition.value
+        elif condition.op == "in":
+            result = number in condition.value
+        else:
+            result = number > condition.value
+    elif condition.op == "==":
+        result = condition_text(condition.mnemonic, value) == condition.value
+    else:
+        result = condition_text(condition.mnemonic, value) in condition.value
+
+    return result != condition.negate
+
+
+def condition_mask(condition, frame):
+    """Rows of a FrameData where condition holds."""
+    import numpy as np
+
+    mnemonic = condition.mnemonic
+
+    if condition.op == "present":
+        mask = ~frame.null[mnemonic]
+    elif condition.numeric:
+        number = frame.numbers[mnemonic]
+        if condition.op == "==":
+            mask = number == condition.value
+        elif condition.op == "in":
+            mask = np.isin(number, condition.value)
+        else:
+            mask = number > condition.value
+    elif frame.null[mnemonic].all():
+        # Null rows never match a text condition; skip converting the column.
+        mask = np.zeros(frame.size, dtype=bool)
+    else:
+        # As condition_text, a column at a time.
+        text = frame.text(mnemonic, ZERO_FILLED.get(mnemonic))
+        if condition.op == "==":
+            mask = (text == condition.value).to_numpy()
+        else:
+            mask = text.isin(condition.value).to_numpy()
+        mask &= ~frame.null[mnemonic]
+
+    return ~mask if condition.negate else mask
+
+
+def gate_holds(gate, data):
+    return all(condition_holds(condition, data) for condition in gate.conditions)
+
+
+def gate_mask(gate, frame):
+    import numpy as np
+
+    mask = np.ones(frame.size, dtype=bool)
+    for condition in gate.conditions:
+        mask &= condition_mask(condition, frame)
+    return mask
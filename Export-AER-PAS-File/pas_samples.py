@@ -0,0 +1,346 @@
+import os
+import math
+import random
+import string
+import argparse
+import numpy as np
+
+from rule_graph import RuleGraph
+
+# Stand-in range for NUMB fields with no units_range/mnemonic_range entry,
+# and for the open ends of ranges such as (-inf, 150000).
+DEFAULT_RANGE = (1.0, 1000.0)
+REPAIR_ROUNDS = 6
+# generate_sample draws SampleGenerator makes per profile before giving up.
+PROFILE_ATTEMPTS = 20
+
+POOL_SIZE = 1024
+CHARS = np.frombuffer((string.ascii_uppercase + string.digits).encode(), dtype=np.uint8)
+
+
+def value_range(entry):
+    """The (low, high) a valid value of a NUMB entry is drawn from.
+
+    Ranges are checked with strict inequalities, so the ends are pulled in
+    by one step of the field's precision.
+    """
+    low, high = DEFAULT_RANGE
+    for rmin, rmax in entry.bounds:
+        low, high = max(low, rmin), min(high, rmax)
+    if low >= high:
+        low = high - 1
+
+    if (entry.non_negative or not entry.allow_zero) and low <= 0 < high:
+        low = min(high / 2, 1.0)
+
+    step = 1 if entry.decimals is None else 10 ** -entry.decimals
+    return low + step, high - step
+
+
+def format_number(entry, value):
+    if entry.decimals is None:
+        return "%02d" % int(value)
+    return "{:.{}f}".format(value, entry.decimals)
+
+
+def valid_value(entry, rng):
+    """A random value that passes check_value for entry on its own."""
+    if entry.codes is not None:
+        return str(rng.choice(sorted(entry.codes, key=str)))
+
+    if entry.kind == "DAY":
+        day = "%04d %02d %02d" % (rng.randint(2005, 2022), rng.randint(1, 12), rng.randint(1, 28))
+        if "HHHH:SS" in entry.size:
+            return day + " %02d%02d:%02d" % (rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59))
+        if "HHHH" in entry.size:
+            return day + " %02d%02d" % (rng.randint(0, 23), rng.randint(0, 59))
+        return day
+
+    if entry.kind == "CHAR":
+        return "".join(rng.choices(string.ascii_uppercase + string.digits, k=min(entry.width, 8)))
+
+    low, high = value_range(entry)
+    if entry.decimals is None:
+        low = math.ceil(max(low, 1))
+        return format_number(entry, rng.randint(low, max(math.floor(high), low)))
+    return format_number(entry, rng.uniform(low, high))
+
+
+def broken_value(entry, rng):
+    """A value check_value rejects for entry, or None if entry accepts anything."""
+    choices = []
+    if not entry.nullable:
+        choices.append(None)
+    if entry.codes is not None:
+        choices.append("999" if entry.kind == "NUMB" else "#")
+    if entry.kind == "DAY":
+        choices.append("2021 02 30")
+    elif entry.kind == "CHAR":
+        choices.append("X" * (entry.width + 1))
+    else:
+        choices.append("abc")
+        if entry.bounds:
+            choices.append(format_number(entry, max(rmax for _, rmax in entry.bounds) + 1))
+    return rng.choice(choices)
+
+
+def repair(pas, data, rng):
+    """Re-draw or null the values pas.check_pas_data flags; True once valid."""
+    for _ in range(REPAIR_ROUNDS):
+        pas.data = data
+        report = pas.check_pas_data(collect=True)
+        if report.ok:
+            return True
+
+        entries = {entry.mnemonic: entry for entry in pas.plan}
+        for failure in report:
+            entry = entries.get(failure.mnemonic)
+            if entry is None:
+                continue
+            if failure.rule == "required_null":
+                data[entry.mnemonic] = None
+            elif failure.rule == "num_equal":
+                data[entry.mnemonic] = format_number(entry, 0)
+            elif failure.rule == "num_range":
+                # Only the GAN LIQRDN. range rule (< 1) is not covered by entry.bounds.
+                data[entry.mnemonic] = format_number(entry, rng.uniform(0.1, 0.9))
+            elif failure.rule == "less_than":
+                top, base = pas.depths
+                data[top], data[base] = sorted([data[top], data[base]], key=float)
+            else:
+                data[entry.mnemonic] = valid_value(entry, rng)
+    return False
+
+
+def generate_sample(pas, rng, broken=False):
+    """One synthetic sample for a subset PAS as a PAS.data dict of strings.
+
+    Values are drawn per plan entry from its codes, field size and ranges,
+    then repaired against pas.check_pas_data until the cross-field rules
+    (section gates, DSTLOC, depths) hold. With broken=True one value is then
+    replaced by one the validator rejects. Returns None if no valid sample
+    could be made from the draw.
+    """
+    data = {entry.mnemonic: valid_value(entry, rng) for entry in pas.plan}
+    if "PASTYPE." in data:
+        data["PASTYPE."] = "PAS-%s" % pas.pas_type
+    if not repair(pas, data, rng):
+        return None
+
+    if broken:
+        entries = list(pas.plan)
+        rng.shuffle(entries)
+        for entry in entries:
+            sample = dict(data, **{entry.mnemonic: broken_value(entry, rng)})
+            pas.data = sample
+            if not pas.check_pas_data(collect=True).ok:
+                return sample
+    return data
+
+
+def pinned_mnemonics(pas):
+    """Mnemonics read by some other rule (gates, pairs, depths, sample dates).
+
+    Values a gate constrains beyond null/not null (range and equal rules,
+    e.g. LIQRDN. < 1) and PASTYPE., which readers detect the type from, are
+    included too.
+    """
+    graph = RuleGraph(pas)
+    extra = len(graph) - len(pas.plan)
+    pinned = {"PASTYPE."}
+    for entry in pas.plan:
+        if any(gate.action in {"range", "equal"} for gate in entry.gates):
+            pinned.add(entry.mnemonic)
+    for index, inputs in enumerate(graph.inputs):
+        own = {pas.plan[index - extra].mnemonic} if index >= extra else set()
+        pinned |= inputs - own
+    return pinned
+
+
+def value_pool(entry, rng, size=POOL_SIZE):
+    """An object array of valid formatted values for entry, drawn with NumPy."""
+    if entry.codes is not None:
+        return np.array([str(c) for c in sorted(entry.codes, key=str)], dtype=object)
+
+    if entry.kind == "DAY":
+        days = rng.choice(np.arange(np.datetime64("2005-01-01"), np.datetime64("2023-01-01")), size)
+        values = np.char.replace(np.datetime_as_string(days), "-", " ").astype(object)
+        if "HHHH" in entry.size:
+            hours, minutes, seconds = rng.integers(0, 24, size), rng.integers(0, 60, size), rng.integers(0, 60, size)
+            values = [
+                "%s %02d%02d" % (day, hh, mm) + (":%02d" % ss if "HHHH:SS" in entry.size else "")
+                for day, hh, mm, ss in zip(values, hours, minutes, seconds)
+            ]
+        return np.array(values, dtype=object)
+
+    if entry.kind == "CHAR":
+        width = min(entry.width, 8)
+        codes = CHARS[rng.integers(0, len(CHARS), (size, width))]
+        return codes.view("S%d" % width).ravel().astype(str).astype(object)
+
+    low, high = value_range(entry)
+    if entry.decimals is None:
+        low = math.ceil(max(low, 1))
+        numbers = rng.integers(low, max(math.floor(high), low) + 1, size)
+    else:
+        numbers = rng.uniform(low, high, size)
+    return np.array([format_number(entry, n) for n in numbers], dtype=object)
+
+
+def broken_constant(entry):
+    """A non-null value check_value rejects for entry whatever the gates say."""
+    if entry.codes is not None:
+        return "999" if entry.kind == "NUMB" else "#"
+    if entry.kind == "DAY":
+        return "2021 02 30"
+    if entry.kind == "CHAR":
+        return "X" * (entry.width + 1)
+    return "abc"
+
+
+class SampleGenerator:
+    """Vectorized synthetic samples for a subset PAS.
+
+    A few valid "profiles" are built with generate_sample; they fix the
+    gate columns (STYP., SEPCOND., HYDLP., H2SLC., SPNT., ...), the null
+    pattern those gates imply and the values in pinned_mnemonics. Every
+    other non-null value is redrawn per row from a NumPy-generated pool of
+    valid values, so rows differ while staying valid. Broken rows get one
+    non-null value replaced by broken_constant. ValueError is raised if
+    PROFILE_ATTEMPTS draws per profile do not give enough valid samples,
+    e.g. when the type's rules cannot all be met.
+    """
+
+    def __init__(self, pas, profiles=64, seed=0):
+        self.pas = pas
+        self.rng = np.random.default_rng(seed)
+        self.entries = {}
+        for entry in pas.plan:
+            self.entries.setdefault(entry.mnemonic, entry)
+        self.mnemonics = list(self.entries)
+
+        scalar_rng = random.Random(seed)
+        samples = []
+        for _ in range(profiles * PROFILE_ATTEMPTS):
+            if len(samples) == profiles:
+                break
+            sample = generate_sample(pas, scalar_rng)
+            if sample is not None:
+                samples.append(sample)
+
+        if len(samples) < profiles:
+            # pas.data holds the last draw repair gave up on.
+            raise ValueError(
+                "Cannot generate %d valid %s samples in %d draws; the last one still fails with: %s"
+                % (profiles, pas.pas_type, profiles * PROFILE_ATTEMPTS, pas.check_pas_data(collect=True).messages())
+            )
+
+        self.profiles = {
+            m: np.array([sample.get(m) for sample in samples], dtype=object) for m in self.mnemonics
+        }
+        self.present = {m: np.array([v is not None for v in values]) for m, values in self.profiles.items()}
+        pinned = pinned_mnemonics(pas)
+        self.pools = {
+            m: value_pool(entry, self.rng) for m, entry in self.entries.items() if m not in pinned
+        }
+        self.broken = {m: broken_constant(entry) for m, entry in self.entries.items()}
+
+    def draw(self, size, broken_fraction=0.0):
+        """Return ({mnemonic: object array}, {mnemonic: non-null mask}, broken row mask)."""
+        profile = self.rng.integers(0, len(self.present[self.mnemonics[0]]), size)
+        columns, present = {}, {}
+        for mnemonic in self.mnemonics:
+            column = self.profiles[mnemonic][profile]
+            present[mnemonic] = self.present[mnemonic][profile]
+            if mnemonic in self.pools:
+                rows = np.flatnonzero(present[mnemonic])
+                pool = self.pools[mnemonic]
+                column[rows] = pool[self.rng.integers(0, len(pool), len(rows))]
+            columns[mnemonic] = column
+
+        broken = self.rng.random(size) < broken_fraction
+        rows = np.flatnonzero(broken)
+        if len(rows):
+            # A random non-null column per broken row: random keys, -1 where null.
+            mask = np.column_stack([present[m][rows] for m in self.mnemonics])
+            picked = np.where(mask, self.rng.random(mask.shape), -1.0).argmax(axis=1)
+            for index in np.unique(picked):
+                mnemonic = self.mnemonics[index]
+                columns[mnemonic][rows[picked == index]] = self.broken[mnemonic]
+
+        return columns, present, broken
+
+    def columns(self, size, broken_fraction=0.0):
+        """Return ({mnemonic: object array}, broken row mask) for size samples."""
+        columns, _, broken = self.draw(size, broken_fraction)
+        return columns, broken
+
+    def frame(self, size, broken_fraction=0.0):
+        """(DataFrame with one sample per row, broken row mask)."""
+        import pandas as pd
+
+        columns, broken = self.columns(size, broken_fraction)
+        return pd.DataFrame(columns, columns=self.mnemonics), broken
+
+    def iter_rows(self, size, broken_fraction=0.0, chunk_size=100000):
+        """Yield (sample dict, broken) for size samples, chunk_size at a time."""
+        for offset in range(0, size, chunk_size):
+            columns, broken = self.columns(min(chunk_size, size - offset), broken_fraction)
+            for values, row_broken in zip(zip(*columns.values()), broken):
+                yield dict(zip(self.mnemonics, values)), bool(row_broken)
+
+    def write_export(self, path, size, broken_fraction=0.0, chunk_size=100000):
+        """Write size samples as one tab-delimited lab export, one sample per row."""
+        with open(path, "w", newline="") as f:
+            f.write("\t".join(self.mnemonics) + "\n")
+            for offset in range(0, size, chunk_size):
+                columns, present, _ = self.draw(min(chunk_size, size - offset), broken_fraction)
+                text = []
+                for mnemonic, column in columns.items():
+                    column[~present[mnemonic]] = ""
+                    text.append(column)
+                f.write("".join("\t".join(row) + "\n" for row in zip(*text)))
+
+    def write_files(self, directory, size, broken_fraction=0.0, writer=None, chunk_size=100000):
+        """Write one file per sample: .PAS through a PASWriter, else a one-row export."""
+        os.makedirs(directory, exist_ok=True)
+        pas_type = self.pas.pas_type
+        paths = []
+
+        for i, (sample, _) in enumerate(self.iter_rows(size, broken_fraction, chunk_size)):
+            if writer is not None:
+                path = os.path.join(directory, "%s_%07d.PAS" % (pas_type, i))
+                writer.write_file(path, pas_type, sample)
+            else:
+                path = os.path.join(directory, "%s_%07d.txt" % (pas_type, i))
+                with open(path, "w", newline="") as f:
+                    f.write("\t".join(self.mnemonics) + "\n")
+                    f.write("\t".join("" if sample[m] is None else sample[m] for m in self.mnemonics) + "\n")
+            paths.append(path)
+
+        return paths
+
+
+if __name__ == "__main__":
+    from spec_cache import SPEC_PATH, load_spec, load_spec_rows
+    from spec_registry import SpecRegistry
+
+    parser = argparse.ArgumentParser(description="Generate synthetic PAS samples.")
+    parser.add_argument("pas_type", choices=["OAN", "WAN", "GAN"])
+    parser.add_argument("count", type=int)
+    parser.add_argument("output", help="export file (.txt) or directory of per-sample files")
+    parser.add_argument("--format", choices=["export", "pas", "txt"], default="export")
+    parser.add_argument("--broken-fraction", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pas = SpecRegistry(load_spec_rows(SPEC_PATH)).validator(args.pas_type)
+    generator = SampleGenerator(pas, seed=args.seed)
+
+    if args.format == "export":
+        generator.write_export(args.output, args.count, args.broken_fraction)
+    else:
+        from pas_writer import PASWriter
+
+        writer = PASWriter(load_spec(SPEC_PATH)) if args.format == "pas" else None
+        generator.write_files(args.output, args.count, args.broken_fraction, writer)
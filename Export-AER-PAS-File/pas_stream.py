@@ -0,0 +1,183 @@
+"""pas-stream: validate a very large tab-delimited lab export chunk by chunk.
+
+    python pas_stream.py [--chunksize 10000] [--type WAN] [--spec pas_lookup.csv] EXPORT.txt
+
+The export is read chunksize samples at a time (pas_reader.iter_export_chunks)
+and each chunk is formatted with PAS.format_frame and checked with
+PAS.validate_frame, so memory depends on the chunk size and not on the file,
+and the first results are out as soon as the first chunk is done. Each line
+on stdout is a JSON object for one chunk:
+
+    {"chunk", "first_row", "rows", "failed", "errors", "failures", "seconds"}
+
+where failures lists {"row", "mnemonic", "message"} for every failed value,
+rows numbered from 0 in file order; the last line is a summary. As in
+validate_frame, a value is listed once, with the first rule it fails, so a
+sample can have fewer failures here than check_sample reports. Each sample
+is checked as its PASTYPE. says unless --type is given. A sample that cannot
+be formatted, such as text in a NUMB field, gets one "error" failure with
+the message validate_file would give it; the rest of its chunk is checked
+as usual. Exit status is as for pas_validate.
+"""
+import sys
+import json
+import time
+import argparse
+
+from export_to_pas import detect_pas_type
+from parallel_validate import error_report
+from pas_reader import iter_export_chunks
+from pas_validate import EXIT_ERROR, EXIT_FAILED, EXIT_OK
+from spec_cache import SPEC_PATH, load_spec_rows
+from spec_registry import SpecRegistry
+
+
+def numeric_chunk(pas, chunk):
+    """chunk with its NUMB columns as floats, and the rows that lost a value.
+
+    A row is lost if one of its NUMB values is not a finite number, which
+    format_frame cannot format. The floats format exactly as the strings
+    they were read from, so format_frame does not convert them again.
+    """
+    import numpy as np
+    import pandas as pd
+
+    bad = np.zeros(len(chunk), dtype=bool)
+    converted = {}
+    for mnemonic in dict.fromkeys(entry.mnemonic for entry in pas.plan if entry.kind == "NUMB"):
+        if mnemonic in chunk.columns:
+            column = chunk[mnemonic]
+            try:
+                numbers = column.to_numpy(dtype=object).astype(float)
+            except (TypeError, ValueError):
+                numbers = pd.to_numeric(column, errors="coerce").to_numpy(dtype=float)
+            bad |= column.notna().to_numpy() & ~np.isfinite(numbers)
+            converted[mnemonic] = numbers
+    return chunk.assign(**converted), bad
+
+
+def format_chunk(pas, chunk):
+    """Format the rows of chunk for pas; returns the frame and {row: error failure}.
+
+    Rows format_frame cannot convert are formatted one at a time with
+    format_data instead, which either succeeds or raises the error the
+    scalar path reports.
+    """
+    import pandas as pd
+
+    numeric, bad = numeric_chunk(pas, chunk)
+    formatted = pas.format_frame(numeric[~bad])
+    if not bad.any():
+        return formatted, {}
+
+    errors, rows = {}, {}
+    for row, sample in chunk[bad].iterrows():
+        try:
+            pas.format_data({mnemonic: None if value != value else value for mnemonic, value in sample.items()})
+            rows[row] = pas.data
+        except Exception as e:
+            errors[row] = error_report(e).to_dicts()[0]
+
+    if rows:
+        formatted = pd.concat([formatted, pd.DataFrame.from_dict(rows, orient="index")]).sort_index()
+    return formatted, errors
+
+
+def validate_chunk(registry, chunk, pas_type=None):
+    """[(row, mnemonic, message)] for every failed value in chunk, by row.
+
+    Each value has the message of the first rule it fails only.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if pas_type is not None:
+        types = [pas_type] * len(chunk)
+    elif "PASTYPE." in chunk.columns:
+        types = [detect_pas_type(None if value != value else value) for value in chunk["PASTYPE."]]
+    else:
+        types = [detect_pas_type(None)] * len(chunk)
+    types = np.array(types, dtype=object)
+
+    failures = []
+    for analysis in dict.fromkeys(types):
+        rows = chunk[types == analysis]
+        try:
+            pas = registry.validator(analysis)
+        except SystemExit as e:
+            failures.extend((row, None, str(e)) for row in rows.index)
+            continue
+
+        formatted, errors = format_chunk(pas, rows)
+        failures.extend((row, None, failure["message"]) for row, failure in errors.items())
+
+        messages = pas.validate_frame(formatted)
+        values = messages.to_numpy(dtype=object)
+        for i, j in zip(*np.nonzero(pd.notna(values))):
+            failures.append((messages.index[i], messages.columns[j], values[i, j]))
+
+    failures.sort(key=lambda failure: failure[0])
+    return failures
+
+
+def iter_chunk_records(path, registry, pas_type=None, chunksize=10000):
+    """Yield one record per chunk of the export at path, as each is done."""
+    for number, chunk in enumerate(iter_export_chunks(path, chunksize)):
+        start = time.perf_counter()
+        failures = validate_chunk(registry, chunk, pas_type)
+
+        yield {
+            "chunk": number,
+            "first_row": int(chunk.index[0]),
+            "rows": len(chunk),
+            "failed": len({row for row, _, _ in failures}),
+            "errors": len({row for row, mnemonic, _ in failures if mnemonic is None}),
+            "failures": [
+                {"row": int(row), "mnemonic": mnemonic, "message": message} for row, mnemonic, message in failures
+            ],
+            "seconds": round(time.perf_counter() - start, 6),
+        }
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="pas-stream", description="Validate a large lab export in chunks.")
+    parser.add_argument("path", help="tab-delimited lab export, one sample per row")
+    parser.add_argument("-c", "--chunksize", type=int, default=10000, help="samples per chunk (default: 10000)")
+    parser.add_argument("-t", "--type", dest="pas_type", help="PAS type to use instead of each row's PASTYPE.")
+    parser.add_argument("--spec", default=SPEC_PATH, help="pas_lookup.csv to validate against")
+    args = parser.parse_args(argv)
+
+    if args.chunksize < 1:
+        parser.error("--chunksize must be at least 1")
+    return args
+
+
+def main(argv=None, out=None):
+    args = parse_args(argv)
+    out = out or sys.stdout
+    start = time.perf_counter()
+    registry = SpecRegistry(load_spec_rows(args.spec))
+    summary = {"chunks": 0, "rows": 0, "failed": 0, "errors": 0}
+
+    try:
+        for record in iter_chunk_records(args.path, registry, args.pas_type, args.chunksize):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            summary["chunks"] += 1
+            for key in ("rows", "failed", "errors"):
+                summary[key] += record[key]
+    except (OSError, ValueError) as e:
+        summary["errors"] += 1
+        out.write(json.dumps({"error": "ERROR: %s: %s" % (type(e).__name__, e)}) + "\n")
+
+    summary["seconds"] = round(time.perf_counter() - start, 6)
+    out.write(json.dumps({"summary": summary}) + "\n")
+    out.flush()
+
+    if summary["errors"] or not summary["rows"]:
+        return EXIT_ERROR
+    return EXIT_FAILED if summary["failed"] else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""pas-validate: check PAS submissions and lab exports, one JSON line per file.
+
+    python pas_validate.py [--jobs N] [--type WAN] [--spec pas_lookup.csv] PATH...
+
+PATH may be a file, a glob or a directory (searched recursively for .PAS
+and .txt files, in any case). With --cache results.sqlite, files whose
+bytes, spec and validator version are unchanged since a previous run are
+answered from the cache instead of being validated again. With --stats
+stats.json, call, failure and time counters per rule and per mnemonic are
+written there once every file is done (see rule_stats.py). With --shared
+the spec is compiled once and handed to the workers in shared memory (see
+shared_spec.py) instead of each worker loading it. Each line on stdout is
+a JSON object for one file, written as soon as that file is done; the last
+line is a summary. Exit status is 0 if every file passed, 1 if any file
+failed validation and 2 if no files were found or a file could not be
+read.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from parallel_validate import find_inputs, init_worker, validate_file
+from pas_reader import reader_kind
+from result_cache import ResultCache, sample_hash
+from rule_stats import RuleStats
+from shared_spec import publish_spec
+from spec_cache import SPEC_PATH, file_hash
+
+SUFFIXES = (".PAS", ".txt")
+EXIT_OK, EXIT_FAILED, EXIT_ERROR = 0, 1, 2
+
+
+def timed_validate(path, pas_type=None, stats=None):
+    """validate_file plus the seconds it took, measured in the worker."""
+    start = time.perf_counter()
+    path, report = validate_file(path, pas_type, stats)
+    return path, report, time.perf_counter() - start
+
+
+def profiled_validate(path, pas_type=None):
+    """timed_validate plus the RuleStats.to_dict() of this one file."""
+    stats = RuleStats()
+    return timed_validate(path, pas_type, stats) + (stats.to_dict(),)
+
+
+def iter_results(paths, pas_type=None, jobs=1, spec_path=SPEC_PATH, stats=None, shared=False):
+    """Yield (path, report, seconds) for each path in completion order.
+
+    jobs=1 validates in this process. Otherwise a process pool is used and
+    at most 4 * jobs files are queued at a time, so huge folders do not
+    build a future per file up front. If stats is a RuleStats, every file's
+    rule counters are merged into it. shared=True publishes the compiled
+    spec to the pool through shared memory.
+    """
+    for result in iter_validated(paths, pas_type, jobs, spec_path, stats is not None, shared):
+        if stats is not None:
+            stats.merge(result[3])
+        yield result[:3]
+
+
+def iter_validated(paths, pas_type, jobs, spec_path, profile, shared=False):
+    validate = profiled_validate if profile else timed_validate
+
+    if jobs == 1:
+        init_worker(spec_path)
+        for path in paths:
+            yield validate(path, pas_type)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    paths = iter(paths)
+    spec = publish_spec(spec_path) if shared else None
+    initargs = (spec_path, spec and spec.name)
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=initargs) as executor:
+            pending = set()
+            for path in paths:
+                pending.add(executor.submit(validate, path, pas_type))
+                if len(pending) >= 4 * jobs:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        if spec is not None:
+            spec.close()
+
+
+def iter_cached(paths, cache, pas_type=None, jobs=1, spec_path=SPEC_PATH, stats=None, shared=False):
+    """Like iter_results, with a trailing cached flag.
+
+    Samples already in cache are yielded first without being validated;
+    the rest are validated and their reports stored.
+    """
+    keys, todo = {}, []
+    for path in paths:
+        key = sample_hash(path), reader_kind(path)
+        report = cache.get(*key)
+        if report is None:
+            keys[path] = key
+            todo.append(path)
+        else:
+            yield path, report, 0.0, True
+
+    jobs = min(jobs, max(len(todo), 1))
+    for path, report, seconds in iter_results(todo, pas_type, jobs, spec_path, stats, shared):
+        cache.put(*keys[path], report)
+        yield path, report, seconds, False
+
+
+def result_record(path, report, seconds, cached=False):
+    failures = [
+        {key: value for key, value in failure.items() if key != "source"}
+        for failure in report.to_dicts()
+    ]
+
+    return {
+        "path": path,
+        "ok": report.ok,
+        "error": any(failure["rule"] == "error" for failure in failures),
+        "failures": failures,
+        "seconds": round(seconds, 6),
+        "cached": cached,
+    }
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="pas-validate", description="Validate AER PAS files and lab exports.")
+    parser.add_argument("paths", nargs="+", help="files, globs or directories")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("-t", "--type", dest="pas_type", help="PAS type to use instead of each file's PASTYPE.")
+    parser.add_argument("--spec", default=SPEC_PATH, help="pas_lookup.csv to validate against")
+    parser.add_argument("--cache", help="SQLite file of earlier results to skip unchanged samples")
+    parser.add_argument("--stats", help="write per-rule and per-mnemonic counters to this JSON file")
+    parser.add_argument("--shared", action="store_true", help="compile the spec once and share it with the workers")
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+
+def main(argv=None, out=None):
+    args = parse_args(argv)
+    out = out or sys.stdout
+    start = time.perf_counter()
+
+    paths = find_inputs(args.paths, SUFFIXES)
+    stats = RuleStats() if args.stats else None
+
+    if args.cache:
+        cache = ResultCache(args.cache, file_hash(args.spec), args.pas_type)
+        results = iter_cached(paths, cache, args.pas_type, args.jobs, args.spec, stats, args.shared)
+    else:
+        cache = None
+        jobs = min(args.jobs, max(len(paths), 1))
+        results = iter_results(paths, args.pas_type, jobs, args.spec, stats, args.shared)
+
+    files = failed = errors = cached = 0
+    try:
+        for result in results:
+            record = result_record(*result)
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+            files += 1
+            failed += not record["ok"]
+            errors += record["error"]
+            cached += record["cached"]
+    finally:
+        if cache is not None:
+            cache.close()
+
+    summary = {"files": files, "failed": failed, "errors": errors, "cached": cached}
+    summary["seconds"] = round(time.perf_counter() - start, 6)
+    out.write(json.dumps({"summary": summary}) + "\n")
+    out.flush()
+
+    if stats is not None:
+        with open(args.stats, "w") as f:
+            f.write(stats.to_json(indent=2))
+
+    if errors or not paths:
+        return EXIT_ERROR
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import io
+import re
+
+
+class PASWriter:
+    """Write ~SECTION,MNEMONIC,VALUE,DESCRIPTION lines for formatted PAS data.
+
+    Line templates are compiled once per PAS type from the spec's FIELD,
+    MNEMONIC NAME and DATA ELEMENT DESCRIPTION columns, so writing a file only
+    joins precomputed prefixes and suffixes around each value.
+    """
+
+    def __init__(self, pas_spec):
+        self.pt = pas_spec
+        self.templates = {}
+
+    def compile(self, pas_type):
+        if pas_type not in self.templates:
+            pt = self.pt[self.pt["ANALYSIS"] == pas_type]
+            self.templates[pas_type] = tuple(
+                (
+                    (field, mnemonic),
+                    mnemonic,
+                    "~%s,%s," % (field.lstrip("~ "), mnemonic),
+                    ",%s\n" % str(description).strip(),
+                )
+                for mnemonic, field, description in zip(
+                    pt["MNEMONIC NAME"], pt["FIELD"], pt["DATA ELEMENT DESCRIPTION"]
+                )
+            )
+        return self.templates[pas_type]
+
+    def lines(self, pas_type, data, descriptions=None, extra=None):
+        """Yield the lines of one PAS file.
+
+        data maps mnemonic (or (FIELD, mnemonic) for repeated mnemonics) to a
+        formatted value or None. descriptions overrides the spec description
+        the same way, and extra maps (FIELD, mnemonic) to lines, such as
+        comments or ~DT tables, written after that row. A value containing a
+        comma raises ValueError, since the comma would end the value.
+        """
+        descriptions = descriptions or {}
+        extra = extra or {}
+
+        for key, mnemonic, prefix, suffix in self.compile(pas_type):
+            value = data[key] if key in data else data.get(mnemonic)
+
+            if key in descriptions or mnemonic in descriptions:
+                description = descriptions.get(key, descriptions.get(mnemonic))
+                suffix = ",%s\n" % description
+
+            value = "" if value is None else str(value)
+            if "," in value:
+                raise ValueError("%s value %r contains a comma." % (mnemonic, value))
+
+            yield prefix + value + suffix
+
+            for line in extra.get(key, ()):
+                yield line if line.endswith("\n") else line + "\n"
+
+    def write(self, fp, pas_type, data, descriptions=None, extra=None):
+        fp.write("".join(self.lines(pas_type, data, descriptions, extra)))
+
+    def write_file(self, path, pas_type, data, descriptions=None, extra=None, buffering=io.DEFAULT_BUFFER_SIZE * 8):
+        with open(path, "w", newline="", buffering=buffering) as fp:
+            self.write(fp, pas_type, data, descriptions, extra)
+
+
+def file_name(pas_type, company, uwi, day):
+    """Name a PAS file like the examples, e.g. WAN_Company_100163003910W50_2021-11-25.PAS."""
+    return "%s_%s_%s_%s.PAS" % (
+        pas_type,
+        company,
+        re.sub(r"[^0-9A-Za-z]", "", uwi),
+        "-".join(day.split()),
+    )
@@ -0,0 +1,97 @@
+import json
+import sqlite3
+
+from export_to_pas import VALIDATOR_VERSION, ValidationReport
+from spec_cache import file_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    sample_hash TEXT NOT NULL,
+    reader TEXT NOT NULL,
+    spec_hash TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    pas_type TEXT NOT NULL,
+    failures TEXT NOT NULL,
+    PRIMARY KEY (sample_hash, reader, spec_hash, version, pas_type)
+)
+"""
+
+
+def sample_hash(path):
+    """SHA-256 of a sample file's bytes, or None if it cannot be read."""
+    try:
+        return file_hash(path)
+    except OSError:
+        return None
+
+
+class ResultCache:
+    """SQLite store of ValidationReports keyed by sample, spec and validator.
+
+    A result is reused only for the same sample bytes read by the same
+    reader (pas_reader.reader_kind), the same pas_lookup.csv hash, the same
+    VALIDATOR_VERSION and the same forced PAS type (an empty string when the
+    type came from PASTYPE.). Writes are committed every commit_every puts
+    and on close.
+    """
+
+    def __init__(self, path, spec_hash, pas_type=None, version=VALIDATOR_VERSION, commit_every=1000):
+        self.key = (spec_hash, version, pas_type or "")
+        self.commit_every = commit_every
+        self.pending = 0
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(results)")]
+        if columns and "reader" not in columns:
+            # Results cached before the reader was part of the key may be wrong.
+            self.connection.execute("DROP TABLE results")
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, digest, reader):
+        """The cached ValidationReport for a sample hash and reader kind, or None."""
+        if digest is None:
+            return None
+
+        row = self.connection.execute(
+            "SELECT failures FROM results"
+            " WHERE sample_hash = ? AND reader = ? AND spec_hash = ? AND version = ? AND pas_type = ?",
+            (digest, reader) + self.key,
+        ).fetchone()
+        if row is None:
+            return None
+
+        return ValidationReport.from_dicts(json.loads(row[0]))
+
+    def put(self, digest, reader, report):
+        """Store a report. Reports with "error" failures are not cached."""
+        if digest is None or any(failure.rule == "error" for failure in report):
+            return
+
+        failures = [
+            {key: value for key, value in failure.items() if key != "source"}
+            for failure in report.to_dicts()
+        ]
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, reader) + self.key + (json.dumps(failures),),
+        )
+
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self.connection.commit()
+        self.pending = 0
+
+    def close(self):
+        self.commit()
+        self.connection.close()
@@ -0,0 +1,83 @@
+from functools import partial
+
+from export_to_pas import ValidationReport
+
+
+def check_hydlp(pas):
+    pas.checks.check_required("HYDLP.", pas.data.get("HYDLP."), report=pas.report)
+
+
+class RuleGraph:
+    """Which rules of a subset PAS read which mnemonics.
+
+    The rules are the units check_pas_data runs, in the same order: the
+    DSTLOC check, the GAN HYDLP. check, then one unit per plan entry.
+    dependents maps each mnemonic to the indices of the rules that read it.
+    """
+
+    def __init__(self, pas):
+        self.rules = []
+        self.inputs = []
+
+        if pas.pas_type in pas.sample_points:
+            spnt = pas.sample_points[pas.pas_type]
+            self.add(lambda: pas.checks.check_dstloc(spnt, pas.data, report=pas.report), {spnt, "DSTLOC."})
+
+        if pas.pas_type == "GAN":
+            self.add(partial(check_hydlp, pas), {"HYDLP."})
+
+        for entry in pas.plan:
+            self.add(partial(pas.check_entry, entry), pas.rule_inputs(entry))
+
+        self.dependents = {}
+        for index, inputs in enumerate(self.inputs):
+            for mnemonic in inputs:
+                self.dependents.setdefault(mnemonic, []).append(index)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def add(self, rule, inputs):
+        self.rules.append(rule)
+        self.inputs.append(frozenset(inputs))
+
+    def affected(self, mnemonic):
+        """Indices of the rules to re-run after mnemonic changes."""
+        return self.dependents.get(mnemonic, [])
+
+
+class LiveValidation:
+    """A sample under edit, re-checking only the rules an edit can change.
+
+    Failures are kept per rule, so report() after any sequence of update()
+    calls equals check_pas_data(collect=True) on the current data.
+    """
+
+    def __init__(self, pas, data, graph=None):
+        self.pas = pas
+        self.graph = graph or RuleGraph(pas)
+        self.data = dict(data)
+        self.failures = [self.run(index) for index in range(len(self.graph))]
+
+    def run(self, index):
+        self.pas.data = self.data
+        self.pas.report = ValidationReport()
+        try:
+            self.graph.rules[index]()
+        finally:
+            report, self.pas.report = self.pas.report, None
+        return report.failures
+
+    def update(self, mnemonic, value):
+        """Set one value and re-run the rules that read it; returns report()."""
+        self.data[mnemonic] = value
+        for index in self.graph.affected(mnemonic):
+            self.failures[index] = self.run(index)
+        return self.report()
+
+    def report(self):
+        report = ValidationReport()
+        for failures in self.failures:
+            for failure in failures:
+                report.add(failure.mnemonic, failure.rule, failure.value, failure.message)
+        return report
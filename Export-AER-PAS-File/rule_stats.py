@@ -0,0 +1,160 @@
+"""Optional per-rule counters for the validator.
+
+    stats = RuleStats()
+    with stats.attached(pas):
+        pas.check_pas_data(collect=True)
+        pas.validate_frame(frame)
+    print(stats.to_json())
+
+attach() gives one PAS counting copies of the check_* helpers through
+PAS.checks, and itself as PAS.stats for validate_frame; detach() puts the
+plain ones back. Only that PAS is affected: other PAS objects, other threads
+and the export_to_pas module keep the uncounted helpers, so validation
+without stats costs exactly what it did before. A RuleStats is not locked;
+give each thread its own and merge() them afterwards.
+
+In check_pas_data, times are inclusive and a rule is counted where PAS calls
+it: check_depths also times the check_numeric and check_less_than calls it
+makes, and those are not counted under their own rules. In validate_frame, a
+rule's calls are the rows it ran over, its failures the values it was first
+to fail, and its seconds the time since the rule before it; building the
+FrameData is counted as "frame_data".
+"""
+import json
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from export_to_pas import CHECKS
+
+# check_* helper -> rule name, matching the rule passed to fail() where there is one.
+RULES = {
+    "check_valid_day_format": "day_format",
+    "check_char_size": "char_size",
+    "check_required_null": "required_null",
+    "check_required": "required",
+    "check_required_two": "required_two",
+    "check_numeric": "numeric",
+    "check_zero": "zero",
+    "check_negative": "negative",
+    "check_num_range": "num_range",
+    "check_code": "code",
+    "check_num_equal": "num_equal",
+    "check_less_than": "less_than",
+    "check_units_range": "units_range",
+    "check_depths": "depths",
+    "check_dstloc": "dstloc",
+}
+
+
+def rule_mnemonic(name, args):
+    """The mnemonic a check_* call is about, taken from its first argument."""
+    if name == "check_dstloc":
+        return "DSTLOC."
+    first = args[0] if args else None
+    if isinstance(first, tuple):
+        return first[0]
+    return first
+
+
+class CountingReport:
+    """A ValidationReport stand-in that counts the failures added to it."""
+
+    def __init__(self, report):
+        self.report = report
+        self.added = 0
+
+    def add(self, *args):
+        self.added += 1
+        self.report.add(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.report, name)
+
+
+class RuleStats:
+    """Calls, failures and cumulative seconds per rule and per mnemonic."""
+
+    def __init__(self):
+        self.rules = {}
+        self.mnemonics = {}
+        self.clock = None
+        self.checks = SimpleNamespace(**{name: self.wrap(name, getattr(CHECKS, name)) for name in RULES})
+
+    def record(self, rule, mnemonic, seconds, failed, calls=1):
+        tables = ((self.rules, rule),) if mnemonic is None else ((self.rules, rule), (self.mnemonics, mnemonic))
+        for table, key in tables:
+            counts = table.get(key)
+            if counts is None:
+                counts = table[key] = [0, 0, 0.0]
+            counts[0] += calls
+            counts[1] += failed
+            counts[2] += seconds
+
+    def wrap(self, name, check):
+        rule = RULES[name]
+
+        def counted(*args, report=None, **kwargs):
+            counting = None if report is None else CountingReport(report)
+            failed = False
+            start = time.perf_counter()
+            try:
+                return check(*args, report=counting, **kwargs)
+            except SystemExit:
+                failed = True
+                raise
+            finally:
+                failed = failed or (counting is not None and counting.added > 0)
+                self.record(rule, rule_mnemonic(name, args), time.perf_counter() - start, failed)
+
+        return counted
+
+    def tick(self, rule=None, mnemonic=None, failures=0, calls=0):
+        """Record the time since the last tick under rule; no rule just starts the clock."""
+        now = time.perf_counter()
+        if rule is not None:
+            self.record(rule, mnemonic, now - self.clock, failures, calls)
+        self.clock = now
+
+    def attach(self, pas):
+        if pas.stats is not None:
+            raise RuntimeError("PAS already has RuleStats attached")
+        pas.checks, pas.stats = self.checks, self
+        return pas
+
+    def detach(self, pas):
+        if pas.stats is self:
+            pas.checks, pas.stats = CHECKS, None
+        return pas
+
+    @contextmanager
+    def attached(self, pas):
+        self.attach(pas)
+        try:
+            yield pas
+        finally:
+            self.detach(pas)
+
+    def merge(self, other):
+        """Add the counts of another RuleStats or of its to_dict() output."""
+        if isinstance(other, RuleStats):
+            other = other.to_dict()
+        for table, counts in ((self.rules, other["rules"]), (self.mnemonics, other["mnemonics"])):
+            for key, entry in counts.items():
+                mine = table.setdefault(key, [0, 0, 0.0])
+                mine[0] += entry["calls"]
+                mine[1] += entry["failures"]
+                mine[2] += entry["seconds"]
+        return self
+
+    def to_dict(self):
+        def table(counts):
+            return {
+                key: {"calls": calls, "failures": failures, "seconds": round(seconds, 9)}
+                for key, (calls, failures, seconds) in sorted(counts.items(), key=lambda item: str(item[0]))
+            }
+
+        return {"rules": table(self.rules), "mnemonics": table(self.mnemonics)}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
@@ -0,0 +1,394 @@
+"""The compiled spec in one shared memory block for worker processes.
+
+    with publish_spec(spec_path) as shared:
+        # in each worker
+        registry = SharedSpec.attach(shared.name).registry()
+
+publish_spec compiles the plan of every PAS type once, in the parent, and
+packs the MnemonicRules into a multiprocessing.shared_memory block as flat
+arrays: one row per plan entry for the kinds, flags, widths and text ids,
+plus the bounds, code tables, gates and conditions they point into, and
+one table of every distinct string and number. Workers attach by name and
+read the arrays in place through memoryviews, so no worker parses
+pas_lookup.csv or compiles a rule, and the block is mapped once however
+many workers there are. A worker's registry decodes the MnemonicRules of a
+type from the arrays the first time that type is asked for.
+
+The block starts with MAGIC, the header length and a JSON header giving
+the offset, typecode and length of each array; arrays are 8-byte aligned.
+Only the process that published a block unlinks it.
+"""
+import sys
+import json
+import struct
+from array import array
+from multiprocessing import shared_memory
+
+from compact_spec import KINDS
+from export_to_pas import PAS, MnemonicRule, VALIDATOR_VERSION
+from pas_rules import Condition, Gate
+from spec_cache import SPEC_PATH, load_spec_rows
+from spec_registry import SpecRegistry
+
+MAGIC = b"PASS"
+PREFIX = struct.Struct("<4sI")
+ALIGN = 8
+
+# Marks "no value" in any id array; numbers are ids with NUMBER (float) or
+# INTEGER set, indexing the numbers array, other ids index the strings.
+NONE = 0xFFFFFFFF
+NUMBER = 0x80000000
+INTEGER = 0xC0000000
+TAGS = 0xC0000000
+
+# entry_flags bits.
+NULLABLE, ALLOW_ZERO, NON_NEGATIVE, DEPTH, HAS_CODES = 1, 2, 4, 8, 16
+# condition_flags bits.
+NUMERIC, NEGATE = 1, 2
+
+ACTIONS = ("null", "required", "range", "equal")
+OPS = ("==", "in", ">", "present")
+
+# Array name -> typecode. *_starts arrays hold one more item than the rows
+# they index: row i owns items starts[i] to starts[i + 1] of the target.
+SECTIONS = {
+    "string_data": "B",
+    "string_starts": "I",
+    "numbers": "d",
+    "type_names": "I",
+    "type_starts": "I",
+    "entry_mnemonic": "I",
+    "entry_field": "I",
+    "entry_size": "I",
+    "entry_rule": "I",
+    "entry_kind": "B",
+    "entry_flags": "B",
+    "entry_width": "i",
+    "entry_decimals": "i",
+    "entry_pair": "I",
+    "entry_date_dependency": "I",
+    "bound_starts": "I",
+    "bounds": "d",
+    "code_starts": "I",
+    "codes": "I",
+    "gate_starts": "I",
+    "gate_action": "B",
+    "gate_skip": "B",
+    "gate_arg_starts": "I",
+    "gate_args": "I",
+    "condition_starts": "I",
+    "condition_mnemonic": "I",
+    "condition_op": "B",
+    "condition_flags": "B",
+    "condition_value_starts": "I",
+    "condition_values": "I",
+}
+# Rows of these arrays are read back through values(); the starts array of each.
+VALUE_STARTS = {
+    "codes": "code_starts",
+    "gate_args": "gate_arg_starts",
+    "condition_values": "condition_value_starts",
+}
+
+
+class SpecPacker:
+    """Builds the SECTIONS arrays for the plans of a SpecRegistry."""
+
+    def __init__(self):
+        self.arrays = {name: array(typecode) for name, typecode in SECTIONS.items()}
+        self.strings = {}
+        self.number_ids = {}
+        for name in SECTIONS:
+            if name.endswith("_starts"):
+                self.arrays[name].append(0)
+
+    def text(self, value):
+        if value is None:
+            return NONE
+        if value not in self.strings:
+            self.strings[value] = len(self.strings)
+            data = self.arrays["string_data"]
+            data.frombytes(value.encode("utf-8"))
+            self.arrays["string_starts"].append(len(data))
+        return self.strings[value]
+
+    def value(self, value):
+        """The id of a str, int or float value."""
+        if value is None or isinstance(value, str):
+            return self.text(value)
+
+        key = (type(value) is int, float(value))
+        if key not in self.number_ids:
+            self.number_ids[key] = len(self.arrays["numbers"])
+            self.arrays["numbers"].append(float(value))
+        return self.number_ids[key] | (INTEGER if key[0] else NUMBER)
+
+    def add_type(self, pas_type, plan):
+        a = self.arrays
+        a["type_names"].append(self.text(pas_type))
+        for entry in plan:
+            self.add_entry(entry)
+        a["type_starts"].append(len(a["entry_kind"]))
+
+    def add_entry(self, entry):
+        a = self.arrays
+        a["entry_mnemonic"].append(self.text(entry.mnemonic))
+        a["entry_field"].append(self.text(entry.field))
+        a["entry_size"].append(self.text(entry.size))
+        a["entry_rule"].append(self.text(entry.rule))
+        a["entry_kind"].append(KINDS.index(entry.kind))
+        a["entry_flags"].append(
+            NULLABLE * entry.nullable
+            | ALLOW_ZERO * entry.allow_zero
+            | NON_NEGATIVE * entry.non_negative
+            | DEPTH * entry.depth
+            | HAS_CODES * (entry.codes is not None)
+        )
+        a["entry_width"].append(-1 if entry.width is None else entry.width)
+        a["entry_decimals"].append(-1 if entry.decimals is None else entry.decimals)
+        a["entry_pair"].extend(self.text(m) for m in entry.pair or (None, None))
+        a["entry_date_dependency"].append(self.text(entry.date_dependency))
+
+        a["bounds"].extend(number for bound in entry.bounds for number in bound)
+        a["bound_starts"].append(len(a["bounds"]))
+        codes = sorted(entry.codes or (), key=lambda code: (type(code).__name__, code))
+        a["codes"].extend(self.value(code) for code in codes)
+        a["code_starts"].append(len(a["codes"]))
+
+        for gate in entry.gates:
+            self.add_gate(gate)
+        a["gate_starts"].append(len(a["gate_action"]))
+
+    def add_gate(self, gate):
+        a = self.arrays
+        a["gate_action"].append(ACTIONS.index(gate.action))
+        a["gate_skip"].append(gate.skip)
+        args = gate.arg if isinstance(gate.arg, tuple) else () if gate.arg is None else (gate.arg,)
+        a["gate_args"].extend(self.value(arg) for arg in args)
+        a["gate_arg_starts"].append(len(a["gate_args"]))
+
+        for condition in gate.conditions:
+            a["condition_mnemonic"].append(self.text(condition.mnemonic))
+            a["condition_op"].append(OPS.index(condition.op))
+            a["condition_flags"].append(NUMERIC * condition.numeric | NEGATE * condition.negate)
+            if condition.op == "in":
+                values = condition.value
+            else:
+                values = () if condition.value is None else (condition.value,)
+            a["condition_values"].extend(self.value(value) for value in values)
+            a["condition_value_starts"].append(len(a["condition_values"]))
+        a["condition_starts"].append(len(a["condition_mnemonic"]))
+
+
+def pack_registry(registry):
+    """The SECTIONS arrays of every plan in registry, compiling them if needed."""
+    packer = SpecPacker()
+    for pas_type in registry.types():
+        packer.add_type(pas_type, registry.validator(pas_type).plan)
+    return packer.arrays
+
+
+def layout(arrays):
+    """(header bytes, {name: (offset, typecode, length)}, total size) for arrays."""
+    header = b""
+    # The header holds the offsets and the offsets depend on its length, so
+    # lay the arrays out again until the header stops growing.
+    while True:
+        sections = {}
+        start = offset = align(PREFIX.size + len(header))
+        for name, values in arrays.items():
+            sections[name] = (offset, values.typecode, len(values))
+            offset = align(offset + len(values) * values.itemsize)
+        header = json.dumps({"version": VALIDATOR_VERSION, "sections": sections}).encode()
+        if align(PREFIX.size + len(header)) <= start:
+            break
+    return header, sections, offset
+
+
+def align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+class SharedSpec:
+    """Read-only views of a published spec block.
+
+    Use publish or attach rather than the constructor. close() releases the
+    views and, for the publisher, unlinks the block.
+    """
+
+    def __init__(self, memory, owner=False):
+        self.memory = memory
+        self.owner = owner
+
+        magic, size = PREFIX.unpack_from(memory.buf)
+        if magic != MAGIC:
+            raise ValueError("%s is not a shared PAS spec" % memory.name)
+        header = json.loads(bytes(memory.buf[PREFIX.size:PREFIX.size + size]))
+        if header["version"] != VALIDATOR_VERSION:
+            raise ValueError("%s was published by validator version %s" % (memory.name, header["version"]))
+
+        self.arrays = {}
+        for name, (offset, typecode, length) in header["sections"].items():
+            itemsize = array(typecode).itemsize
+            self.arrays[name] = memory.buf[offset:offset + length * itemsize].cast(typecode)
+
+        self.strings = [None] * (len(self.arrays["string_starts"]) - 1)
+        names = [self.text(i) for i in self.arrays["type_names"]]
+        starts = self.arrays["type_starts"]
+        self.types = {name: range(starts[i], starts[i + 1]) for i, name in enumerate(names)}
+
+    @classmethod
+    def publish(cls, registry):
+        arrays = pack_registry(registry)
+        header, sections, size = layout(arrays)
+
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            PREFIX.pack_into(memory.buf, 0, MAGIC, len(header))
+            memory.buf[PREFIX.size:PREFIX.size + len(header)] = header
+            for name, values in arrays.items():
+                offset = sections[name][0]
+                data = values.tobytes()
+                memory.buf[offset:offset + len(data)] = data
+            return cls(memory, owner=True)
+        except BaseException:
+            memory.close()
+            memory.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    @property
+    def size(self):
+        return self.memory.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in self.arrays.values():
+            view.release()
+        self.arrays = {}
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def text(self, i):
+        if i == NONE:
+            return None
+        if self.strings[i] is None:
+            starts = self.arrays["string_starts"]
+            data = self.arrays["string_data"][starts[i]:starts[i + 1]]
+            self.strings[i] = sys.intern(bytes(data).decode("utf-8"))
+        return self.strings[i]
+
+    def value(self, i):
+        tag = i & TAGS
+        if i == NONE or not tag & NUMBER:
+            return self.text(i)
+        number = self.arrays["numbers"][i & ~TAGS]
+        return int(number) if tag == INTEGER else number
+
+    def values(self, name, row):
+        starts = self.arrays[VALUE_STARTS[name]]
+        return [self.value(i) for i in self.arrays[name][starts[row]:starts[row + 1]]]
+
+    def plan(self, pas_type):
+        """The MnemonicRules of pas_type, decoded from the arrays."""
+        return tuple(self.entry(i) for i in self.types[pas_type])
+
+    def entry(self, i):
+        a = self.arrays
+        flags = a["entry_flags"][i]
+        width, decimals = a["entry_width"][i], a["entry_decimals"][i]
+        bounds = a["bounds"][a["bound_starts"][i]:a["bound_starts"][i + 1]]
+        pair = tuple(self.text(m) for m in a["entry_pair"][2 * i:2 * i + 2])
+        gates = a["gate_starts"]
+
+        return MnemonicRule(
+            mnemonic=self.text(a["entry_mnemonic"][i]),
+            field=self.text(a["entry_field"][i]),
+            size=self.text(a["entry_size"][i]),
+            rule=self.text(a["entry_rule"][i]),
+            kind=KINDS[a["entry_kind"][i]],
+            width=None if width < 0 else width,
+            decimals=None if decimals < 0 else decimals,
+            nullable=bool(flags & NULLABLE),
+            allow_zero=bool(flags & ALLOW_ZERO),
+            non_negative=bool(flags & NON_NEGATIVE),
+            codes=frozenset(self.values("codes", i)) if flags & HAS_CODES else None,
+            bounds=tuple(tuple(bounds[j:j + 2]) for j in range(0, len(bounds), 2)),
+            pair=pair if pair[0] is not None else None,
+            date_dependency=self.text(a["entry_date_dependency"][i]),
+            depth=bool(flags & DEPTH),
+            gates=tuple(self.gate(g) for g in range(gates[i], gates[i + 1])),
+        )
+
+    def gate(self, g):
+        a = self.arrays
+        action = ACTIONS[a["gate_action"][g]]
+        args = self.values("gate_args", g)
+        conditions = a["condition_starts"]
+
+        return Gate(
+            action,
+            tuple(self.condition(c) for c in range(conditions[g], conditions[g + 1])),
+            tuple(args) if action == "range" else args[0] if args else None,
+            bool(a["gate_skip"][g]),
+        )
+
+    def condition(self, c):
+        a = self.arrays
+        op = OPS[a["condition_op"][c]]
+        flags = a["condition_flags"][c]
+        values = self.values("condition_values", c)
+
+        return Condition(
+            self.text(a["condition_mnemonic"][c]),
+            op,
+            tuple(values) if op == "in" else values[0] if values else None,
+            bool(flags & NUMERIC),
+            bool(flags & NEGATE),
+        )
+
+    def registry(self):
+        return SharedRegistry(self)
+
+
+class SharedRegistry:
+    """The validator side of SpecRegistry over a SharedSpec.
+
+    validator() builds one PAS per type on first use from the shared plan.
+    """
+
+    def __init__(self, shared):
+        self.shared = shared
+        self.validators = {}
+
+    def types(self):
+        return list(self.shared.types)
+
+    def validator(self, pas_type):
+        if pas_type not in self.validators:
+            if pas_type not in self.shared.types:
+                sys.exit("ERROR: Cannot find PAS type [%s]." % pas_type)
+            pas = PAS(None)
+            pas.use_plan(pas_type, self.shared.plan(pas_type))
+            self.validators[pas_type] = pas
+        return self.validators[pas_type]
+
+    validate = SpecRegistry.validate
+
+
+def publish_spec(spec_path=SPEC_PATH):
+    """Compile spec_path and publish it; close the result to unlink the block."""
+    return SharedSpec.publish(SpecRegistry(load_spec_rows(spec_path)))
@@ -0,0 +1,101 @@
+import os
+import sys
+import csv
+import pickle
+import hashlib
+
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "unittest", "pas_lookup.csv")
+CACHE_SUFFIX = ".cache"
+CACHE_VERSION = 2
+
+# The strings pandas.read_csv treats as missing by default. The spec is
+# written by pandas, so empty rules come out as "nan".
+NA_VALUES = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_spec_csv(path):
+    """Read pas_lookup.csv into its column names and rows of plain str/None.
+
+    Values are interned, so repeated section names, sizes and rule texts
+    are one object each in memory and in the pickled cache.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        columns = next(reader)
+        rows = [tuple(None if v in NA_VALUES else sys.intern(v) for v in row) for row in reader]
+    return columns, rows
+
+
+def read_cache(cache_path):
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def write_cache(cache_path, cache):
+    tmp_path = "%s.%d.tmp" % (cache_path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_spec_rows(path=SPEC_PATH):
+    """Load the column names and rows of pas_lookup.csv through a cache.
+
+    The cache is a pickle of plain Python lists kept next to the CSV. It is
+    trusted while the CSV's size and mtime are unchanged, and otherwise only
+    if the CSV's SHA-256 still matches. Any mismatch re-reads the CSV and
+    rewrites the cache.
+    """
+    stat = os.stat(path)
+    cache_path = path + CACHE_SUFFIX
+    cache = read_cache(cache_path)
+
+    if cache is not None and cache.get("version") == CACHE_VERSION:
+        if (cache["size"], cache["mtime"]) == (stat.st_size, stat.st_mtime_ns):
+            return cache["columns"], cache["rows"]
+
+        digest = file_hash(path)
+        if cache["hash"] == digest:
+            cache.update(size=stat.st_size, mtime=stat.st_mtime_ns)
+            write_cache(cache_path, cache)
+            return cache["columns"], cache["rows"]
+    else:
+        digest = file_hash(path)
+
+    columns, rows = read_spec_csv(path)
+    write_cache(
+        cache_path,
+        {
+            "version": CACHE_VERSION,
+            "hash": digest,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "columns": columns,
+            "rows": rows,
+        },
+    )
+    return columns, rows
+
+
+def load_spec(path=SPEC_PATH):
+    """Load pas_lookup.csv as the DataFrame PAS expects, via the cache."""
+    import pandas as pd
+
+    columns, rows = load_spec_rows(path)
+    return pd.DataFrame(rows, columns=columns)
@@ -0,0 +1,74 @@
+import sys
+
+from compact_spec import CompactSpec
+from export_to_pas import PAS, detect_pas_type
+
+RULE_COLUMNS = ["MNEMONIC NAME", "FIELD", "FIELD SIZE", "BUSINESS RULES AND EDITS"]
+SPEC_COLUMNS = RULE_COLUMNS + ["ANALYSIS"]
+
+
+class SpecRegistry:
+    """Per-ANALYSIS partitions of the spec with one reusable PAS each.
+
+    The spec is grouped by ANALYSIS once; asking for a validator compiles
+    that type's plan the first time and hands back the same PAS afterwards.
+    A PAS holds the sample being checked in PAS.data, so share a registry
+    between threads only if each thread has its own.
+
+    pas_spec is the spec DataFrame, a (columns, rows) pair as returned by
+    spec_cache.load_spec_rows or a CompactSpec; the latter two keep pandas
+    out of the process until a DataFrame view is asked for. The spec is
+    held as a CompactSpec of SPEC_COLUMNS, which is also all a registry
+    pickles to; views have those columns only.
+    """
+
+    def __init__(self, pas_spec):
+        if isinstance(pas_spec, CompactSpec):
+            self.compact = pas_spec
+        elif isinstance(pas_spec, tuple):
+            self.compact = CompactSpec(*pas_spec, keep=SPEC_COLUMNS)
+        else:
+            rows = (
+                tuple(None if v != v else v for v in row)
+                for row in pas_spec.itertuples(index=False, name=None)
+            )
+            self.compact = CompactSpec(pas_spec.columns, rows, keep=SPEC_COLUMNS)
+
+        self.columns = self.compact.columns
+        self.views = {}
+        self.validators = {}
+
+    def __getstate__(self):
+        return self.compact
+
+    def __setstate__(self, compact):
+        self.__init__(compact)
+
+    def types(self):
+        return self.compact.types()
+
+    def spec(self, pas_type):
+        if pas_type not in self.compact.partitions:
+            sys.exit("ERROR: Cannot find PAS type [%s]." % pas_type)
+        return self.compact.rows(pas_type)
+
+    def view(self, pas_type):
+        """The spec rows of pas_type as a categorical DataFrame, built on first use."""
+        if pas_type not in self.views:
+            self.spec(pas_type)
+            self.views[pas_type] = self.compact.frame(pas_type)
+        return self.views[pas_type]
+
+    def validator(self, pas_type):
+        if pas_type not in self.validators:
+            self.spec(pas_type)
+            pas = PAS(None)
+            pas.use_rows(pas_type, self.compact.rows(pas_type, RULE_COLUMNS))
+            self.validators[pas_type] = pas
+        return self.validators[pas_type]
+
+    def validate(self, data, pas_type=None, collect=True):
+        """Check one PAS.data dict, detecting its type from PASTYPE. if not given."""
+        pas = self.validator(pas_type or detect_pas_type(data.get("PASTYPE.")))
+        pas.data = data
+        return pas.check_pas_data(collect=collect)
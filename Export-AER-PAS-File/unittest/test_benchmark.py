@@ -0,0 +1,27 @@
+import sys
+import unittest
+
+sys.path.insert(1, "../")
+from benchmark import regressions, run
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_run(self):
+        document = run(sizes=[1, 3], types=["WAN"], profiles=4, scalar_limit=2, file_limit=2, jobs=1)
+        results = {(r["mode"], r["size"]): r for r in document["results"]}
+
+        self.assertEqual(
+            {mode for mode, _ in results},
+            {"subset", "format_data", "check_pas_data", "format_frame", "validate_frame", "validate_files"},
+        )
+        self.assertEqual(results["check_pas_data", 3]["timed"], 2)
+        self.assertEqual(results["validate_frame", 3]["timed"], 3)
+        self.assertIn("validator_version", document["meta"])
+
+        slower = dict(document, results=[dict(r, per_sample=r["per_sample"] * 2) for r in document["results"]])
+        self.assertEqual(regressions(document, document), [])
+        self.assertEqual(len(regressions(slower, document)), len(document["results"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import sys
+import pickle
+import unittest
+
+sys.path.insert(1, "../")
+from compact_spec import CHAR, DAY, KINDS, NUMB, CompactSpec, kind_code
+from export_to_pas import PAS
+from spec_cache import read_spec_csv
+from spec_registry import SPEC_COLUMNS, SpecRegistry
+
+
+class TestCompactSpec(unittest.TestCase):
+    columns, rows = read_spec_csv("pas_lookup.csv")
+    spec = CompactSpec(columns, rows)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.spec), 670)
+        self.assertEqual(self.spec.rows(), self.rows)
+        self.assertEqual(sorted(self.spec.types()), ["DST", "GAN", "GRD", "OAN", "PRD", "TRG", "WAN"])
+        self.assertEqual(len(self.spec.rows("GAN")), sum(row[-1] == "GAN" for row in self.rows))
+
+    def test_categories_are_shared(self):
+        field = self.spec.column("FIELD")
+
+        self.assertLess(len(self.spec.categories[field]), len(self.spec) / 5)
+        first, second = self.spec.rows("WAN", ["FIELD"])[:2]
+        self.assertIs(first[0], second[0])
+
+    def test_records(self):
+        records = {record.mnemonic: record for record in self.spec.records("WAN")}
+        pas = PAS(None)
+        pas.use_rows("WAN", [record.row() for record in self.spec.records("WAN")])
+
+        self.assertEqual(records["UWI."].kind, CHAR)
+        self.assertEqual(records["SDAT.DAY"].kind, DAY)
+        self.assertEqual(records["NA.MG/L"].kind, NUMB)
+        for record in records.values():
+            self.assertEqual(KINDS[record.kind], pas.kinds[record.mnemonic])
+        with self.assertRaises(AttributeError):
+            records["UWI."].extra = 1
+
+    def test_kind_code_matches_field_kind(self):
+        pas = PAS(None)
+        for size in {row[self.columns.index("FIELD SIZE")] for row in self.rows}:
+            self.assertEqual(KINDS[kind_code(size)], pas.field_kind(size), size)
+        with self.assertRaises(TypeError):
+            pas.field_kind(None)
+        with self.assertRaises(TypeError):
+            kind_code(None)
+
+    def test_frame(self):
+        frame = self.spec.frame("OAN")
+
+        self.assertEqual(len(frame), 113)
+        self.assertEqual(str(frame["FIELD"].dtype), "category")
+        self.assertTrue(frame["ANALYSIS"].eq("OAN").all())
+
+    def test_registry_pickles_compact_spec(self):
+        registry = SpecRegistry((self.columns, self.rows))
+        registry.validator("WAN")
+
+        copy = pickle.loads(pickle.dumps(registry))
+
+        self.assertEqual(copy.columns, SPEC_COLUMNS)
+        self.assertEqual(copy.validators, {})
+        self.assertEqual(len(copy.validator("GAN").plan), len(registry.validator("GAN").plan))
+        self.assertLess(len(pickle.dumps(registry)), len(pickle.dumps((self.columns, self.rows))) * 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
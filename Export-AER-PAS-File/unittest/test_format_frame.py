@@ -0,0 +1,55 @@
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+
+
+class TestFormatFrame(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    rows = pd.DataFrame(
+        {
+            "UWI.": ["100/16-30-039-10W5/0", None, "100/02-17-039-10W5/0"],
+            "SDAT.DAY": ["2021 11 25", "2022 03 15", None],
+            "SPNT.": [35, 5.9, None],
+            "NA.MG/L": [4903, 1.005, -2.675],
+            "TTOPL.M": [2876.3, None, 0.123456],
+            "RDWTR.": ["1.01", None, "1"],
+        },
+        index=[10, 11, 12],
+    )
+
+    def setUp(self):
+        self.pas = PAS(self.file.copy())
+        self.pas.subset("WAN")
+
+    def test_formats(self):
+        result = self.pas.format_frame(self.rows)
+
+        self.assertEqual(list(result.index), [10, 11, 12])
+        self.assertEqual(list(result["SPNT."]), ["35", "05", None])
+        self.assertEqual(list(result["NA.MG/L"]), ["4903.00", "1.00", "-2.67"])
+        self.assertEqual(list(result["TTOPL.M"]), ["2876.30", None, "0.12"])
+        self.assertEqual(list(result["RDWTR."]), ["1.010", None, "1.000"])
+        self.assertEqual(list(result["SDAT.DAY"]), ["2021 11 25", "2022 03 15", None])
+        self.assertTrue(result["WANC."].isna().all())
+
+    def test_matches_format_data(self):
+        result = self.pas.format_frame(self.rows)
+
+        for i in range(len(self.rows)):
+            self.pas.format_data(self.rows.iloc[[i]].reset_index(drop=True))
+            self.assertEqual(result.iloc[i].to_dict(), self.pas.data)
+
+    def test_spaced_decimal_size(self):
+        pas = PAS(self.file.copy())
+        pas.subset("GAN")
+
+        result = pas.format_frame(pd.DataFrame({"LIQRDN.": [0.7281]}))
+
+        self.assertEqual(result.loc[0, "LIQRDN."], "0.728")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import pickle
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from format_pas_specification_file import (
+    cached_specification,
+    format_pas_analysis,
+    format_pas_specification,
+    spec_diff,
+    spec_rows,
+)
+from spec_cache import read_spec_csv
+
+
+class TestFormatPasSpecification(unittest.TestCase):
+    xls = "../PASFileFormats.xls"
+
+    def test_matches_lookup(self):
+        spec = format_pas_specification(self.xls)
+        lookup = pd.read_csv("pas_lookup.csv", sep=",", header=0, dtype=str, keep_default_na=False)
+
+        self.assertEqual(list(spec.columns), list(lookup.columns))
+        pd.testing.assert_frame_equal(spec.fillna(""), lookup)
+
+    def test_sections(self):
+        gan = format_pas_analysis(self.xls, "GAN")
+
+        self.assertFalse(gan["MNEMONIC NAME"].str.startswith("~").any())
+        self.assertTrue(gan["FIELD"].str.startswith("~").all())
+        self.assertEqual(gan["FIELD"].iloc[0], "~ VERSION")
+        self.assertTrue((gan["ANALYSIS"] == "GAN").all())
+
+    def test_cached_rebuild(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, "sheets.cache")
+
+            spec, rebuilt = cached_specification(self.xls, cache_path)
+            self.assertEqual(len(rebuilt), 7)
+
+            spec_again, rebuilt = cached_specification(self.xls, cache_path)
+            self.assertEqual(rebuilt, [])
+            pd.testing.assert_frame_equal(spec, spec_again)
+
+            with open(cache_path, "rb") as f:
+                cache = pickle.load(f)
+            cache["sheets"]["GAN"]["hash"] = "stale"
+            with open(cache_path, "wb") as f:
+                pickle.dump(cache, f)
+
+            spec_again, rebuilt = cached_specification(self.xls, cache_path)
+            self.assertEqual(rebuilt, ["GAN"])
+            pd.testing.assert_frame_equal(spec, spec_again)
+
+    def test_spec_diff(self):
+        columns, rows = read_spec_csv("pas_lookup.csv")
+        self.assertEqual(spec_diff((columns, rows), spec_rows(format_pas_specification(self.xls))),
+                         {"added": [], "removed": [], "changed": []})
+
+        rule = columns.index("BUSINESS RULES AND EDITS")
+        edited = [list(row) for row in rows[1:]]
+        edited[0][rule] = "must be null."
+        edited.append(["NEW."] + edited[-1][1:])
+        diff = spec_diff((columns, rows), (columns, [tuple(row) for row in edited]))
+
+        self.assertEqual([row["mnemonic"] for row in diff["removed"]], [rows[0][0]])
+        self.assertEqual([row["mnemonic"] for row in diff["added"]], ["NEW."])
+        self.assertEqual(len(diff["changed"]), 1)
+        self.assertEqual(diff["changed"][0]["column"], "BUSINESS RULES AND EDITS")
+        self.assertEqual(diff["changed"][0]["new"], "must be null.")
+
+
+if __name__ == "__main__":
+    unittest.main()
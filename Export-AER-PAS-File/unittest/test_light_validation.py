@@ -0,0 +1,81 @@
+import os
+import sys
+import glob
+import shutil
+import tempfile
+import unittest
+import subprocess
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+from pas_reader import read_export, read_pas
+from spec_cache import read_spec_csv
+from spec_registry import SpecRegistry
+
+
+class TestLightValidation(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    wan = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read_spec_csv_matches_pandas(self):
+        columns, rows = read_spec_csv("pas_lookup.csv")
+        pt = pd.read_csv("pas_lookup.csv", sep=",", header=0, dtype=str)
+
+        self.assertEqual(columns, list(pt.columns))
+        self.assertEqual(
+            rows,
+            [tuple(None if pd.isnull(v) else v for v in row) for row in pt.itertuples(index=False, name=None)],
+        )
+
+    def test_format_data_from_export(self):
+        data = dict(self.wan)
+        data["PHTMP.DEGC"] = None
+        path = os.path.join(self.directory, "sample.txt")
+        pd.DataFrame([data]).to_csv(path, sep="\t", index=False)
+
+        pas = PAS(self.file.copy())
+        pas.subset("WAN")
+        pas.format_data(pd.read_csv(path, sep="\t"))
+        from_frame = pas.data
+        pas.format_data(read_export(path))
+
+        self.assertEqual(pas.data, from_frame)
+
+    def test_registry_from_rows(self):
+        light = SpecRegistry(read_spec_csv("pas_lookup.csv"))
+        heavy = SpecRegistry(self.file)
+
+        self.assertEqual(light.types(), heavy.types())
+        for path in sorted(glob.glob("../example/*.PAS")):
+            data = read_pas(path)
+            self.assertEqual(light.validate(data).messages(), heavy.validate(data).messages(), path)
+
+    def test_no_pandas_import(self):
+        path = os.path.join(self.directory, "sample.txt")
+        pd.DataFrame([self.wan]).to_csv(path, sep="\t", index=False)
+        script = (
+            "import sys; sys.path.insert(1, '..')\n"
+            "from parallel_validate import validate_file\n"
+            "for path in sys.argv[1:]: assert validate_file(path)[1].ok, path\n"
+            "print(sorted({'numpy', 'pandas'} & set(sys.modules)))\n"
+        )
+
+        output = subprocess.run(
+            [sys.executable, "-c", script, path] + sorted(glob.glob("../example/[OW]AN*.PAS")),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+        self.assertEqual(output.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from parallel_validate import find_inputs, validate_files
+from pas_reader import read_pas
+
+
+class TestParallelValidate(unittest.TestCase):
+    wan = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = []
+
+        for i in range(8):
+            data = dict(self.wan)
+            if i % 4 == 3:
+                data["UWI."] = None
+            path = os.path.join(self.directory, "sample_%d.txt" % i)
+            pd.DataFrame([data]).to_csv(path, sep="\t", index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_find_inputs(self):
+        self.assertEqual(find_inputs([self.directory]), sorted(self.paths))
+
+        os.makedirs(os.path.join(self.directory, "upper"))
+        extra = [os.path.join(self.directory, "upper", name) for name in ("SAMPLE.TXT", "sample.pas", "notes.csv")]
+        for path in extra:
+            open(path, "w").close()
+
+        self.assertEqual(find_inputs([self.directory]), sorted(self.paths + extra[:1]))
+        self.assertEqual(find_inputs([self.directory], (".PAS", ".txt")), sorted(self.paths + extra[:2]))
+
+    def test_merged_report(self):
+        report = validate_files(self.paths, workers=2, chunksize=3)
+
+        self.assertEqual(report.sources, self.paths)
+        self.assertEqual(
+            [(f.source, f.mnemonic) for f in report],
+            [(self.paths[3], "UWI."), (self.paths[7], "UWI.")],
+        )
+
+    def test_bad_input_is_reported(self):
+        path = os.path.join(self.directory, "broken.txt")
+        pd.DataFrame([{"PASTYPE.": "PAS-XYZ"}]).to_csv(path, sep="\t", index=False)
+
+        report = validate_files([path], workers=1)
+
+        self.assertEqual(report.messages(), ["ERROR: Cannot find PAS type [XYZ]."])
+
+
+if __name__ == "__main__":
+    unittest.main()
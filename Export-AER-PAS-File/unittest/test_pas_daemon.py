@@ -0,0 +1,95 @@
+import sys
+import glob
+import socket
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(1, "../")
+from pas_client import PASClient
+from pas_daemon import ValidationServer
+from pas_reader import read_pas
+from spec_cache import load_spec_rows
+from spec_registry import SpecRegistry
+
+
+class TestPasDaemon(unittest.TestCase):
+    registry = SpecRegistry(load_spec_rows("pas_lookup.csv"))
+    samples = {path: read_pas(path) for path in sorted(glob.glob("../example/*.PAS"))}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ValidationServer(("127.0.0.1", 0), SpecRegistry(load_spec_rows("pas_lookup.csv")))
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def client(self):
+        client = PASClient(port=self.server.server_address[1])
+        self.addCleanup(client.close)
+        return client
+
+    def expected(self, data):
+        return self.registry.validate(dict(data)).messages()
+
+    def test_samples(self):
+        client = self.client()
+
+        self.assertEqual(sorted(client.health()["types"]), sorted(self.registry.types()))
+        connection = client.connection
+        for path, data in self.samples.items():
+            self.assertEqual(client.validate(data).messages(), self.expected(data), path)
+        self.assertIs(client.connection, connection)
+
+        reports = client.validate_many(self.samples.values())
+        self.assertEqual([r.messages() for r in reports], [self.expected(d) for d in self.samples.values()])
+
+    def test_export_rows(self):
+        wan = next(data for path, data in self.samples.items() if "WAN_" in path)
+        columns = list(wan)
+        rows = [[wan[c] or "" for c in columns], [("" if c == "UWI." else wan[c] or "") for c in columns]]
+        text = "\n".join("\t".join(row) for row in [columns] + rows) + "\n"
+
+        reports = self.client().validate_export(text)
+
+        self.assertEqual(len(reports), 2)
+        self.assertTrue(reports[0].ok)
+        self.assertEqual([f.mnemonic for f in reports[1]], ["UWI."])
+
+    def test_errors(self):
+        client = self.client()
+
+        report = client.validate({"PASTYPE.": "PAS-XYZ"})
+        self.assertEqual(report.messages(), ["ERROR: Cannot find PAS type [XYZ]."])
+        with self.assertRaises(ValueError):
+            client.request("POST", "/validate", b"[1, 2]")
+        with self.assertRaises(RuntimeError):
+            client.request("GET", "/missing")
+        self.assertTrue(client.validate(self.samples[sorted(self.samples)[-1]]).ok)
+
+    def test_reconnects(self):
+        client = self.client()
+        data = self.samples[sorted(self.samples)[-1]]
+
+        client.validate(data)
+        client.connection.sock.shutdown(socket.SHUT_RDWR)
+        self.assertTrue(client.validate(data).ok)
+
+    def test_concurrent_clients(self):
+        items = list(self.samples.items()) * 6
+
+        def check(item):
+            with PASClient(port=self.server.server_address[1]) as client:
+                return item[0], client.validate(item[1]).messages()
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            for path, messages in executor.map(check, items):
+                self.assertEqual(messages, self.expected(self.samples[path]), path)
+
+
+if __name__ == "__main__":
+    unittest.main()
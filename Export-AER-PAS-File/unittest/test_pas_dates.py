@@ -0,0 +1,116 @@
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS, check_valid_day_format, is_date_greater
+from pas_dates import day_parts, parse_day, parse_days
+from pas_reader import read_pas
+from datetime import date, datetime
+
+
+class TestPasDates(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    gan = read_pas("../example/GAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+    def test_parse_day(self):
+        self.assertEqual(parse_day("2021 11 25"), datetime(2021, 11, 25))
+        self.assertEqual(parse_day("2021 11 25 1430"), datetime(2021, 11, 25, 14, 30))
+        self.assertEqual(parse_day("2021 11 25 1430:15"), datetime(2021, 11, 25, 14, 30, 15))
+        self.assertEqual(parse_day("0005 03 12"), datetime(5, 3, 12))
+        for value in ["2021 02 29", "2021 13 01", "2021 11 25 2460", "2021-11-25", "21 11 25", ""]:
+            self.assertIsNone(parse_day(value), value)
+
+    def test_layouts(self):
+        day, hour, second = day_parts("YYYY MM DD"), day_parts("YYYY MM DD HHHH"), day_parts("YYYY MM DD HHHH:SS")
+
+        self.assertEqual(parse_day("2021 11 25", day), datetime(2021, 11, 25))
+        self.assertIsNone(parse_day("2021 11 25 1430", day))
+        self.assertIsNone(parse_day("2021 11 25", hour))
+        self.assertEqual(parse_day("2021 11 25 1430", hour), datetime(2021, 11, 25, 14, 30))
+        self.assertIsNone(parse_day("2021 11 25 1430:15", hour))
+        self.assertEqual(parse_day("2021 11 25 1430:15", second), datetime(2021, 11, 25, 14, 30, 15))
+        self.assertIsNone(day_parts("CHAR 10"))
+
+        values = np.array(["2021 11 25", "2021 11 25 1430", "2021 11 25 1430:15", None], dtype=object)
+        for parts in (None, day, hour, second):
+            expected = [parse_day(v, parts) if v else None for v in values]
+            parsed = parse_days(values, parts)
+            self.assertEqual([None if np.isnat(d) else d.astype(datetime) for d in parsed], expected)
+
+    def test_parse_days_matches_parse_day(self):
+        values = np.array(
+            [
+                ["2021 11 25", "2020 02 29", None],
+                ["2021 02 29", "2020 02 29 1230:45", "2021 11 25"],
+                ["0005 03 12", "bad", np.nan],
+            ],
+            dtype=object,
+        )
+        parsed = parse_days(values)
+
+        self.assertEqual(parsed.shape, values.shape)
+        for value, day in zip(values.ravel(), parsed.ravel()):
+            expected = parse_day(value) if isinstance(value, str) else None
+            if expected is None:
+                self.assertTrue(np.isnat(day), value)
+            else:
+                self.assertEqual(day, np.datetime64(expected, "s"))
+
+    def test_scalar_checks(self):
+        check_valid_day_format("SDAT.DAY", "2020 02 29")
+        with self.assertRaises(SystemExit) as cm:
+            check_valid_day_format("SDAT.DAY", "2021 02 29")
+        self.assertEqual(str(cm.exception), "ERROR: SDAT.DAY must be in [YYYY MM DD] format.")
+
+        self.assertTrue(is_date_greater("2004 10 01", date(2004, 9, 30)))
+        self.assertFalse(is_date_greater("2004 09 30", date(2004, 9, 30)))
+        self.assertFalse(is_date_greater("2004 02 30", date(2004, 9, 30)))
+        self.assertFalse(is_date_greater("2004 09 30 1200", date(2004, 9, 30), "YYYY MM DD HHHH"))
+        self.assertFalse(is_date_greater("2004 10 01 1200", date(2004, 9, 30), "YYYY MM DD"))
+
+        with self.assertRaises(SystemExit) as cm:
+            check_valid_day_format("TIME.DAY/HR/SS", "2021 11 25", layout="YYYY MM DD HHHH:SS")
+        self.assertEqual(str(cm.exception), "ERROR: TIME.DAY/HR/SS must be in [YYYY MM DD HHHH:SS] format.")
+
+    def test_validate_frame_dates(self):
+        rows = [dict(self.gan) for _ in range(3)]
+        rows[0]["FS-SDAT.DAY"] = "2021 02 30"
+        rows[1]["FS-SDAT.DAY"] = "2003 01 01"
+        rows[1]["FS-SPRES.KPAA"] = None
+        rows[2]["FS-SPRES.KPAA"] = None
+
+        pas = PAS(self.file.copy())
+        pas.subset("GAN")
+        result = pas.validate_frame(pd.DataFrame(rows))
+
+        self.assertEqual(result.loc[0, "FS-SDAT.DAY"], "ERROR: FS-SDAT.DAY must be in [YYYY MM DD] format.")
+        self.assertIsNone(result.loc[1, "FS-SPRES.KPAA"])
+        self.assertEqual(result.loc[2, "FS-SPRES.KPAA"], "ERROR: FS-SPRES.KPAA must not be null.")
+
+    def test_frame_matches_scalar(self):
+        rows = [dict(self.gan, **{"FS-SPRES.KPAA": None}) for _ in range(4)]
+        rows[0]["FS-SDAT.DAY"] = "2021 11 25 1430"
+        rows[1]["FS-SDAT.DAY"] = "2004 09 30"
+        rows[2]["FS-SDAT.DAY"] = "2004 10 01"
+        rows[3]["FS-ADAT.DAY"] = "2021 11 25 1430:15"
+
+        pas = PAS(self.file.copy())
+        pas.subset("GAN")
+        result = pas.validate_frame(pd.DataFrame(rows))
+
+        self.assertEqual(result.loc[0, "FS-SDAT.DAY"], "ERROR: FS-SDAT.DAY must be in [YYYY MM DD] format.")
+        self.assertIsNone(result.loc[1, "FS-SPRES.KPAA"])
+        self.assertEqual(result.loc[2, "FS-SPRES.KPAA"], "ERROR: FS-SPRES.KPAA must not be null.")
+        for i, row in enumerate(rows):
+            pas.data = dict(row)
+            report = pas.check_pas_data(collect=True)
+            first = {}
+            for failure in report:
+                first.setdefault(failure.mnemonic, failure.message)
+            self.assertEqual(first, {m: v for m, v in result.loc[i].items() if v is not None}, i)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from pas_pipeline import drop_root, main, output_path
+from pas_reader import read_pas
+from pas_validate import EXIT_ERROR, EXIT_FAILED
+from spec_cache import load_spec_rows
+from spec_registry import SpecRegistry
+
+
+class TestPasPipeline(unittest.TestCase):
+    wan = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, "out")
+        self.folders = [os.path.join(self.directory, "lab_a"), os.path.join(self.directory, "lab_b")]
+
+        for n, folder in enumerate(self.folders):
+            os.makedirs(os.path.join(folder, "2022"))
+            for i in range(5):
+                data = dict(self.wan, **({"UWI.": None} if i == 4 else {}))
+                self.export(os.path.join(folder, "2022", "sample_%d%d.txt" % (n, i)), data)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def export(self, path, data):
+        pd.DataFrame([data]).to_csv(path, sep="\t", index=False)
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        status = main(["--spec", "pas_lookup.csv", "--output", self.output] + list(argv), out=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        return status, lines[:-1], lines[-1]["summary"]
+
+    def test_output_path(self):
+        path = os.path.join(self.folders[0], "2022", "sample_00.txt")
+
+        self.assertEqual(drop_root(self.folders[0] + os.sep), self.folders[0])
+        self.assertEqual(drop_root(path), os.path.dirname(path))
+        self.assertEqual(
+            output_path("out", drop_root(self.folders[0]), path), os.path.join("out", "lab_a", "2022", "sample_00.PAS")
+        )
+
+    def test_folders(self):
+        status, records, summary = self.run_cli(
+            "--jobs", "2", "--readers", "2", "--writers", "1", "--queue-size", "1", *self.folders
+        )
+
+        self.assertEqual(status, EXIT_FAILED)
+        self.assertEqual(summary["files"], 10)
+        self.assertEqual(summary["failed"], 2)
+        self.assertEqual(summary["written"], 8)
+
+        registry = SpecRegistry(load_spec_rows("pas_lookup.csv"))
+        for record in records:
+            name = os.path.basename(record["path"])
+            self.assertEqual(record["ok"], not name.endswith("4.txt"), name)
+            if not record["ok"]:
+                self.assertIsNone(record["output"])
+                self.assertEqual([f["mnemonic"] for f in record["failures"]], ["UWI."])
+                continue
+
+            folder = os.path.basename(os.path.dirname(os.path.dirname(record["path"])))
+            self.assertEqual(record["output"], os.path.join(self.output, folder, "2022", name[:-4] + ".PAS"))
+            written = read_pas(record["output"])
+            self.assertEqual(written["UWI."], self.wan["UWI."])
+            self.assertTrue(registry.validate(written).ok)
+
+    def test_unreadable_samples(self):
+        self.export(os.path.join(self.folders[0], "bad.txt"), {"PASTYPE.": "PAS-XYZ"})
+
+        status, records, summary = self.run_cli("--jobs", "1", self.folders[0])
+
+        self.assertEqual(status, EXIT_ERROR)
+        self.assertEqual(summary["errors"], 1)
+        bad = [record for record in records if record["error"]]
+        self.assertEqual(bad[0]["failures"][0]["message"], "ERROR: Cannot find PAS type [XYZ].")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+from parallel_validate import validate_files
+from pas_reader import parse_line, read_pas, iter_pas_paths, iter_pas_frames
+
+
+class TestPASReader(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    wan = "../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS"
+
+    def test_parse_line(self):
+        self.assertEqual(
+            parse_line("~TEST DATA,SDAT.DAY,2021 11 25,DATE SAMPLED\n"),
+            ("TEST DATA", "SDAT.DAY", "2021 11 25", "DATE SAMPLED"),
+        )
+        self.assertEqual(
+            parse_line("~PRESSURE RESULTS - SUMMARY,PRCL.KPAA,,CLOSURE PRESSURE, BOTTOM HOLE\n"),
+            ("PRESSURE RESULTS - SUMMARY", "PRCL.KPAA", "", "CLOSURE PRESSURE, BOTTOM HOLE"),
+        )
+        self.assertIsNone(parse_line("# COMPANY NAME: Sansum Energy Inc.\n"))
+        self.assertIsNone(parse_line("~DTCL,COMPCOM,MOLC,MASS,VOL\n"))
+
+    def test_read_pas(self):
+        data = read_pas(self.wan)
+
+        self.assertEqual(len(data), 70)
+        self.assertEqual(data["PASTYPE."], "PAS-WAN")
+        self.assertEqual(data["SDAT.DAY"], "2021 11 25")
+        self.assertIsNone(data["SPRES.KPAA"])
+        self.assertTrue(data["GCOM."].startswith("N.D. - Not Detected    Pres."))
+
+    def test_read_pas_validates(self):
+        pas = PAS(self.file.copy())
+        pas.subset("WAN")
+        pas.data = read_pas(self.wan)
+
+        self.assertTrue(pas.check_pas_data(collect=True).ok)
+
+    def test_iter_pas_frames(self):
+        paths = list(iter_pas_paths("../example"))
+        frames = list(iter_pas_frames(paths, batch_size=2))
+
+        self.assertEqual(len(paths), 5)
+        self.assertEqual([len(frame) for frame in frames], [2, 2, 1])
+        self.assertEqual(list(frames[0].index), paths[:2])
+
+    def test_validate_pas_files(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "WAN.PAS")
+            shutil.copy(self.wan, path)
+
+            report = validate_files([path], workers=1)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertTrue(report.ok)
+        self.assertEqual(report.sources, [path])
+
+
+if __name__ == "__main__":
+    unittest.main()
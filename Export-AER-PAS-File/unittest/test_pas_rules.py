@@ -0,0 +1,120 @@
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+from pas_rules import RULES
+
+
+class TestPasRules(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+
+    def subset(self, analysis):
+        pas = PAS(self.file.copy())
+        pas.subset(analysis)
+        return pas
+
+    def test_table_matches_spec(self):
+        for rule in RULES:
+            for analysis in rule.types:
+                pas = self.subset(analysis)
+                entries = [
+                    entry for entry in pas.plan
+                    if (rule.fields is None or entry.field in rule.fields)
+                    and (rule.mnemonics is None or entry.mnemonic in rule.mnemonics)
+                ]
+
+                self.assertTrue(entries, rule)
+                for condition in rule.when:
+                    self.assertIn(condition[0], pas.kinds, rule)
+                for mnemonic in rule.mnemonics or ():
+                    self.assertIn(mnemonic, pas.kinds, rule)
+                self.assertTrue(any(entry.gates for entry in entries), rule)
+
+    def test_gates_compiled_once(self):
+        pas = self.subset("GAN")
+        entries = {(entry.mnemonic, entry.field): entry for entry in pas.plan}
+
+        liqrdn = entries[("LIQRDN.", "~ CONDENSATE / LIQUID ANALYSIS - DATA PROPERTIES")]
+        self.assertEqual([gate.action for gate in liqrdn.gates], ["null", "required", "range"])
+        self.assertTrue(liqrdn.gates[0].skip)
+        self.assertEqual(liqrdn.gates[0].conditions[0].mnemonic, "HYDLP.")
+        self.assertEqual(pas.rule_inputs(liqrdn), frozenset({"LIQRDN.", "HYDLP."}))
+
+        self.assertEqual(entries[("UWI.", "~ WELL INFORMATION")].gates, ())
+
+    def check(self, analysis, data):
+        pas = self.subset(analysis)
+        pas.data = data
+        report = pas.check_pas_data(collect=True)
+
+        frame = pas.validate_frame(pd.DataFrame([data]))
+        self.assertEqual(
+            {message for message in frame.loc[0] if message is not None}, set(report.messages())
+        )
+        return {(failure.mnemonic, failure.rule) for failure in report}
+
+    def test_prd(self):
+        data = {"MDTYPE.": "O", "TRBG.PULSE": "10", "TUPS.KPAA": None, "CSPS.KPAA": None}
+        failures = self.check("PRD", data)
+
+        self.assertIn(("TAP.", "required"), failures)
+        self.assertIn(("PLATE.MM", "required"), failures)
+        self.assertIn(("TRBG.PULSE", "required_null"), failures)
+        self.assertIn(("TUPS.KPAA", "required"), failures)
+        self.assertNotIn(("ICON.", "required"), failures)
+
+    def test_trg(self):
+        data = {"AOFTY.": "31", "AOFEXT.E3M3/D": "400.0", "SURBTM.": "S", "RDGAL.M": "12.00", "WSFL.": "02"}
+        failures = self.check("TRG", data)
+
+        self.assertIn(("AOFEXT.E3M3/D", "required_null"), failures)
+        self.assertIn(("AOFWEX.E3M3/D", "required"), failures)
+        self.assertIn(("AIN.", "required"), failures)
+        self.assertIn(("RDGAL.M", "num_equal"), failures)
+        self.assertIn(("RDGAS.", "required"), failures)
+        self.assertNotIn(("PBP.KPAA", "required"), failures)
+
+    def test_dst_numeric_conditions(self):
+        failures = self.check("DST", {"QGFF.E3M3/D": "1.50", "QGMX.E3M3/D": None, "TFGS.MIN": "5", "TTYP.": "08"})
+
+        self.assertIn(("QGMX.E3M3/D", "required"), failures)
+        self.assertIn(("TFGS.MIN", "required_null"), failures)
+        self.assertIn(("CCCO.", "required"), failures)
+        self.assertNotIn(("TTYP.", "code"), failures)
+
+    def test_grd_test_type_without_leading_zero(self):
+        for ttyp in ("03", "3"):
+            failures = self.check("GRD", {"TTYP.": ttyp, "AFLO.": "T", "WTYP.": "D"})
+
+            self.assertNotIn(("TTYP.", "code"), failures)
+            self.assertIn(("TUPS.KPAA", "required"), failures)
+            self.assertIn(("SDGAL.M", "required"), failures)
+            self.assertIn(("SDGAT.M", "required"), failures)
+
+    def test_typed_frame_matches_check_pas_data(self):
+        frame = pd.DataFrame(
+            {
+                "TTYP.": [10, 3, 13, 10],
+                "AFLO.": ["T", "B", "A", "T"],
+                "WTYP.": ["D", "H", "V", "D"],
+                "PRPS.": ["A", 1, "O", "A"],
+                "SPNT.": [50, "50", 3, None],
+            }
+        )
+        pas = self.subset("GRD")
+
+        result = pas.validate_frame(frame)
+
+        for i, row in frame.iterrows():
+            pas.format_data(row.where(row.notna(), None).to_dict())
+            report = pas.check_pas_data(collect=True)
+            self.assertEqual({message for message in result.loc[i] if message is not None}, set(report.messages()), i)
+        self.assertEqual(result.loc[0, "TSUR.DEGC"], "ERROR: TSUR.DEGC must not be null.")
+        self.assertEqual(result.loc[1, "TUPS.KPAA"], "ERROR: TUPS.KPAA must not be null.")
+        self.assertEqual(result.loc[2, "CSPS.KPAA"], "ERROR: CSPS.KPAA must not be null.")
+
+
+if __name__ == "__main__":
+    unittest.main()
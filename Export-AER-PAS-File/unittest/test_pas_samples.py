@@ -0,0 +1,94 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+from parallel_validate import validate_file
+from pas_samples import SampleGenerator, generate_sample
+from pas_writer import PASWriter
+
+
+class TestPasSamples(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def pas(self, analysis):
+        pas = PAS(self.file.copy())
+        pas.subset(analysis)
+        return pas
+
+    def check(self, pas, data):
+        pas.data = data
+        return pas.check_pas_data(collect=True).ok
+
+    def test_generate_sample(self):
+        for analysis in ["OAN", "WAN", "GAN"]:
+            pas = self.pas(analysis)
+            rng = random.Random(15)
+
+            for broken in [False, True]:
+                sample = None
+                while sample is None:
+                    sample = generate_sample(pas, rng, broken=broken)
+                self.assertEqual(self.check(pas, sample), not broken, analysis)
+
+    def test_frame(self):
+        for analysis in ["OAN", "WAN", "GAN"]:
+            pas = self.pas(analysis)
+            frame, broken = SampleGenerator(pas, profiles=8, seed=16).frame(500, broken_fraction=0.3)
+
+            self.assertEqual(len(frame.drop_duplicates()), 500)
+            self.assertTrue(0 < broken.sum() < 500)
+
+            flagged = pas.validate_frame(frame).notna().any(axis=1).to_numpy()
+            self.assertEqual(flagged.tolist(), broken.tolist(), analysis)
+
+            for i in range(50):
+                self.assertEqual(self.check(pas, frame.iloc[i].to_dict()), not broken[i], (analysis, i))
+
+    def test_unsatisfiable_rules(self):
+        pas = self.pas("WAN")
+        pas.use_plan(
+            "WAN",
+            [entry._replace(codes=frozenset({"abc"})) if entry.mnemonic == "SPNT." else entry for entry in pas.plan],
+        )
+
+        with self.assertRaises(ValueError) as cm:
+            SampleGenerator(pas, profiles=2)
+        self.assertIn("SPNT. must be numeric", str(cm.exception))
+
+    def test_seeded(self):
+        pas = self.pas("WAN")
+        first, _ = SampleGenerator(pas, profiles=4, seed=1).frame(20, 0.5)
+        second, _ = SampleGenerator(pas, profiles=4, seed=1).frame(20, 0.5)
+        self.assertTrue(first.equals(second))
+
+    def test_write(self):
+        pas = self.pas("GAN")
+        generator = SampleGenerator(pas, profiles=4, seed=2)
+
+        path = os.path.join(self.directory, "export.txt")
+        generator.write_export(path, 30, chunk_size=7)
+        frame = pd.read_csv(path, sep="\t", dtype=str)
+        self.assertEqual(len(frame), 30)
+        self.assertFalse(pas.validate_frame(frame).notna().any().any())
+
+        paths = generator.write_files(os.path.join(self.directory, "pas"), 3, writer=PASWriter(self.file))
+        paths += generator.write_files(os.path.join(self.directory, "txt"), 3)
+        self.assertEqual(len(paths), 6)
+        for path in paths:
+            self.assertTrue(validate_file(path)[1].ok, path)
+
+
+if __name__ == "__main__":
+    unittest.main()
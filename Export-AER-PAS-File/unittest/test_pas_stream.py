@@ -0,0 +1,84 @@
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from parallel_validate import check_sample
+from pas_reader import iter_export_chunks, read_pas
+from pas_stream import main
+from pas_validate import EXIT_ERROR, EXIT_FAILED, EXIT_OK
+
+
+class TestPasStream(unittest.TestCase):
+    wan = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "export.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def export(self, changes):
+        pd.DataFrame([dict(self.wan, **change) for change in changes]).to_csv(self.path, sep="\t", index=False)
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        status = main(["--spec", "pas_lookup.csv"] + list(argv) + [self.path], out=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        return status, lines[:-1], lines[-1]["summary"]
+
+    def test_iter_export_chunks(self):
+        self.export([{}] * 5)
+
+        chunks = list(iter_export_chunks(self.path, 2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(list(chunks[2].index), [4])
+        self.assertEqual(chunks[0]["UWI."].iloc[0], self.wan["UWI."])
+
+    def test_chunks(self):
+        changes = [{}, {"UWI.": None}, {"NA.MG/L": "abc"}, {}, {"PASTYPE.": "PAS-XYZ"}]
+        self.export(changes)
+
+        status, records, summary = self.run_cli("--chunksize", "2")
+
+        self.assertEqual(status, EXIT_ERROR)
+        self.assertEqual([r["first_row"] for r in records], [0, 2, 4])
+        self.assertEqual(summary["rows"], 5)
+        self.assertEqual(summary["failed"], 3)
+        self.assertEqual(summary["errors"], 2)
+
+        failures = [failure for record in records for failure in record["failures"]]
+        self.assertEqual([(f["row"], f["mnemonic"]) for f in failures], [(1, "UWI."), (2, None), (4, None)])
+        self.assertEqual(failures[2]["message"], "ERROR: Cannot find PAS type [XYZ].")
+
+        self.assertEqual(failures[1]["message"], check_sample(dict(self.wan, **changes[2]))[2].messages()[0])
+
+    def test_type_and_status(self):
+        self.export([{}, {}])
+        self.assertEqual(self.run_cli()[0], EXIT_OK)
+
+        self.export([{}, {"PASTYPE.": "PAS-XYZ"}])
+        self.assertEqual(self.run_cli()[0], EXIT_ERROR)
+        self.assertEqual(self.run_cli("--type", "WAN")[0], EXIT_OK)
+
+        self.export([{}, {"UWI.": None}])
+        status, records, summary = self.run_cli()
+        self.assertEqual(status, EXIT_FAILED)
+        self.assertEqual(len(records), 1)
+        self.assertEqual({f["row"] for f in records[0]["failures"]}, {1})
+
+        os.remove(self.path)
+        status, records, summary = self.run_cli()
+        self.assertEqual(status, EXIT_ERROR)
+        self.assertEqual(records[0]["error"][:24], "ERROR: FileNotFoundError")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(1, "../")
+from pas_validate import EXIT_ERROR, EXIT_FAILED, EXIT_OK, main
+
+
+class TestPasValidate(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in os.listdir("../example"):
+            if name.endswith(".PAS"):
+                shutil.copy(os.path.join("../example", name), self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        status = main(list(argv), out=out)
+        return status, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_directory(self):
+        status, lines = self.run_cli("--jobs", "1", self.directory)
+        records, summary = lines[:-1], lines[-1]["summary"]
+
+        self.assertEqual(status, EXIT_FAILED)
+        self.assertEqual(len(records), 5)
+        self.assertEqual(summary["files"], 5)
+        self.assertEqual(summary["failed"], 3)
+        self.assertEqual(summary["errors"], 0)
+        for record in records:
+            self.assertEqual(record["ok"], not os.path.basename(record["path"]).startswith("GAN"))
+            self.assertEqual(record["ok"], record["failures"] == [])
+            self.assertGreaterEqual(record["seconds"], 0)
+
+    def test_parallel_glob(self):
+        status, lines = self.run_cli("--jobs", "2", os.path.join(self.directory, "[OW]AN*.PAS"))
+
+        self.assertEqual(status, EXIT_OK)
+        self.assertEqual(sorted(os.path.basename(r["path"])[:3] for r in lines[:-1]), ["OAN", "WAN"])
+
+    def test_suffix_case(self):
+        lower = os.path.join(self.directory, "lower")
+        os.mkdir(lower)
+        for name in os.listdir(self.directory):
+            if name.startswith("WAN"):
+                shutil.copy(os.path.join(self.directory, name), os.path.join(lower, "wan.pas"))
+
+        status, lines = self.run_cli("--jobs", "1", lower)
+
+        self.assertEqual(status, EXIT_OK)
+        self.assertEqual([os.path.basename(r["path"]) for r in lines[:-1]], ["wan.pas"])
+
+    def test_errors(self):
+        status, lines = self.run_cli("-j", "1", os.path.join(self.directory, "missing.PAS"))
+
+        self.assertEqual(status, EXIT_ERROR)
+        self.assertTrue(lines[0]["error"])
+        self.assertEqual(lines[0]["failures"][0]["rule"], "error")
+
+        empty = os.path.join(self.directory, "empty")
+        os.mkdir(empty)
+        status, lines = self.run_cli(empty)
+        self.assertEqual(status, EXIT_ERROR)
+        self.assertEqual(lines[-1]["summary"]["files"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
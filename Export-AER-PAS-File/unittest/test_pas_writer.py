@@ -0,0 +1,65 @@
+import io
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from pas_reader import parse_line, read_pas
+from pas_writer import PASWriter, file_name
+
+
+class TestPASWriter(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    writer = PASWriter(file)
+
+    def test_fixture_byte_for_byte(self):
+        data = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+        output = io.StringIO(newline="")
+        self.writer.write(output, "WAN", data)
+
+        with open("pas_writer_wan.PAS", newline="") as f:
+            self.assertEqual(output.getvalue(), f.read())
+
+    def test_round_trip(self):
+        data = read_pas("pas_writer_wan.PAS")
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "wan.PAS")
+
+        self.writer.write_file(path, "WAN", data)
+
+        self.assertEqual(read_pas(path), data)
+
+    def test_commas(self):
+        lines = [line for line in self.writer.lines("TRG", {}) if ",PRCL.KPAA," in line]
+        self.assertEqual(lines, ["~PRESSURE RESULTS - SUMMARY,PRCL.KPAA,,CLOSURE PRESSURE, BOTTOM HOLE\n"])
+        self.assertEqual(parse_line(lines[0])[3], "CLOSURE PRESSURE, BOTTOM HOLE")
+
+        with self.assertRaises(ValueError):
+            list(self.writer.lines("WAN", {"WANC.": "N.D., not detected"}))
+
+    def test_spec_descriptions(self):
+        lines = list(self.writer.lines("WAN", {"PASTYPE.": "PAS-WAN", "UNIT.": "M"}))
+
+        self.assertEqual(lines[0], "~VERSION,PASTYPE.,PAS-WAN,DIGITAL DATA - WATER ANALYSIS\n")
+        self.assertEqual(lines[1], "~VERSION,UNIT.,M,UNITS FLAG\n")
+        self.assertEqual(lines[3], "~WELL INFORMATION,UWI.,,UNIQUE WELL ID\n")
+
+    def test_templates_compiled_once(self):
+        first = self.writer.compile("OAN")
+
+        self.assertIs(self.writer.compile("OAN"), first)
+
+    def test_file_name(self):
+        self.assertEqual(
+            file_name("WAN", "Sansum Energy Inc", "100/16-30-039-10W5/0", "2021 11 25"),
+            "WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
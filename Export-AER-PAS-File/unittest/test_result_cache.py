@@ -0,0 +1,111 @@
+import io
+import os
+import sys
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.insert(1, "../")
+from export_to_pas import ValidationReport
+from pas_validate import main
+from result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db = os.path.join(self.directory, "results.sqlite")
+        self.samples = os.path.join(self.directory, "samples")
+        shutil.copytree("../example", self.samples)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def report(self, *failures):
+        report = ValidationReport()
+        for failure in failures:
+            report.add(*failure)
+        return report
+
+    def test_round_trip(self):
+        report = self.report(("UWI.", "required", None, "ERROR: UWI. must not be null."), ("PHOBS.", "zero", 0.0, "x"))
+
+        with ResultCache(self.db, "spec-a") as cache:
+            self.assertIsNone(cache.get("sample", "pas"))
+            cache.put("sample", "pas", report)
+            cache.put("clean", "pas", ValidationReport())
+
+        with ResultCache(self.db, "spec-a") as cache:
+            self.assertEqual(list(cache.get("sample", "pas")), list(report))
+            self.assertTrue(cache.get("clean", "pas").ok)
+
+    def test_key(self):
+        with ResultCache(self.db, "spec-a") as cache:
+            cache.put("sample", "pas", ValidationReport())
+            cache.put("broken", "pas", self.report((None, "error", None, "ERROR: Cannot find PAS type [XYZ].")))
+
+        for other in [
+            ResultCache(self.db, "spec-b"),
+            ResultCache(self.db, "spec-a", version=-1),
+            ResultCache(self.db, "spec-a", pas_type="WAN"),
+        ]:
+            with other as cache:
+                self.assertIsNone(cache.get("sample", "pas"))
+
+        with ResultCache(self.db, "spec-a") as cache:
+            self.assertIsNone(cache.get("sample", "export"))
+            self.assertIsNone(cache.get("broken", "pas"))
+
+    def test_old_schema_is_dropped(self):
+        connection = sqlite3.connect(self.db)
+        connection.execute(
+            "CREATE TABLE results (sample_hash TEXT, spec_hash TEXT, version INTEGER, pas_type TEXT, failures TEXT)"
+        )
+        connection.execute("INSERT INTO results VALUES ('sample', 'spec-a', 2, '', '[]')")
+        connection.commit()
+        connection.close()
+
+        with ResultCache(self.db, "spec-a", version=2) as cache:
+            self.assertIsNone(cache.get("sample", "pas"))
+            cache.put("sample", "pas", ValidationReport())
+            self.assertTrue(cache.get("sample", "pas").ok)
+
+    def run_cli(self, *paths):
+        out = io.StringIO()
+        main(["--jobs", "1", "--cache", self.db] + list(paths or [self.samples]), out=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        return {r["path"]: r for r in lines[:-1]}, lines[-1]["summary"]
+
+    def test_unchanged_files_are_skipped(self):
+        first, summary = self.run_cli()
+        self.assertEqual(summary["cached"], 0)
+
+        edited = sorted(first)[-1]
+        with open(edited, "a") as f:
+            f.write("# edited\n")
+
+        second, summary = self.run_cli()
+
+        self.assertEqual(summary["cached"], 4)
+        self.assertFalse(second[edited]["cached"])
+        for path, record in second.items():
+            self.assertEqual(record["failures"], first[path]["failures"], path)
+
+    def test_reader_is_part_of_the_key(self):
+        pas = os.path.join(self.samples, sorted(name for name in os.listdir(self.samples) if name.startswith("WAN"))[0])
+        export = os.path.join(self.directory, "same_bytes.txt")
+        shutil.copy(pas, export)
+
+        first, _ = self.run_cli(pas)
+        second, summary = self.run_cli(export)
+
+        self.assertEqual(summary["cached"], 0)
+        self.assertTrue(first[pas]["ok"])
+        self.assertNotEqual(second[export]["failures"], first[pas]["failures"])
+        self.assertTrue(self.run_cli(pas)[0][pas]["cached"])
+
+
+if __name__ == "__main__":
+    unittest.main()
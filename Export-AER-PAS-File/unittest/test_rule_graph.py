@@ -0,0 +1,81 @@
+import sys
+import glob
+import random
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+from pas_reader import read_pas
+from rule_graph import LiveValidation, RuleGraph
+
+
+EDITS = {
+    "STYP.": ["G", "C", "B", "R", None],
+    "SEPCOND.": ["F", "B", None],
+    "HYDLP.": ["Y", "N", None],
+    "H2SLC.": ["F", "L", "B"],
+    "H2SMT.": ["T", "N", None],
+    "SPNT.": ["50", "20", None],
+    "FS-SPNT.": ["50", "20", None],
+    "DSTLOC.": ["T", None],
+    "TSUL.FRAC": ["0.5", None],
+    "TSUL.GM/KG": ["2.0", None],
+    "TTOPL.M": ["1000.0", "3000.0", None],
+    "TBASL.M": ["2000.0", "500.0", None],
+    "FS-SDAT.DAY": ["2003 01 01", "2021 11 25", "2021 02 30", None],
+    "SS-SDAT.DAY": ["2003 01 01", "2021 11 25", None],
+    "FS-SPRES.KPAA": ["100.0", None],
+    "SS-SPRES.KPAA": ["100.0", None],
+    "FLDH2S.PPM": ["0", "12", None],
+    "LIQRDN.": ["0.5", "2", None],
+    "UWI.": ["100163003910W500", None],
+}
+
+
+class TestRuleGraph(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+
+    def pas(self, analysis):
+        pas = PAS(self.file.copy())
+        pas.subset(analysis)
+        return pas
+
+    def full_check(self, pas, data):
+        pas.data = dict(data)
+        return pas.check_pas_data(collect=True).failures
+
+    def test_graph(self):
+        pas = self.pas("WAN")
+        wan = RuleGraph(pas)
+        self.assertEqual(len(wan), 1 + len(pas.plan))
+        self.assertEqual(len(wan.affected("UWI.")), 1)
+        self.assertEqual(len(wan.affected("SPNT.")), 2)
+        self.assertEqual(len(wan.affected("TTOPL.M")), 2)
+
+        gan = RuleGraph(self.pas("GAN"))
+        self.assertGreater(len(gan.affected("STYP.")), 10)
+        self.assertLess(len(gan.affected("STYP.")), len(gan) // 2)
+        self.assertIn(1, gan.affected("HYDLP."))
+
+    def test_matches_full_check(self):
+        rng = random.Random(14)
+
+        for path in sorted(glob.glob("../example/*.PAS")):
+            data = read_pas(path)
+            pas = self.pas(data["PASTYPE."].split("-")[1])
+            live = LiveValidation(pas, data)
+            self.assertEqual(live.report().failures, self.full_check(pas, data), path)
+
+            names = [m for m in EDITS if m in data]
+            for _ in range(60):
+                mnemonic = rng.choice(names)
+                value = rng.choice(EDITS[mnemonic])
+                data[mnemonic] = value
+
+                report = live.update(mnemonic, value)
+                self.assertEqual(report.failures, self.full_check(pas, data), (path, mnemonic, value))
+
+
+if __name__ == "__main__":
+    unittest.main()
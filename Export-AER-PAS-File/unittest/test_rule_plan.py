@@ -0,0 +1,51 @@
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+
+
+class TestRulePlan(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+
+    def plan(self, analysis):
+        pas = PAS(self.file.copy())
+        pas.subset(analysis)
+        return {entry.mnemonic: entry for entry in pas.plan}
+
+    def test_one_entry_per_spec_row(self):
+        pas = PAS(self.file.copy())
+        pas.subset("GAN")
+
+        self.assertEqual(len(pas.plan), len(pas.pt))
+        self.assertIsInstance(pas.plan, tuple)
+
+    def test_field_kinds(self):
+        plan = self.plan("WAN")
+
+        self.assertEqual((plan["UWI."].kind, plan["UWI."].width), ("CHAR", 20))
+        self.assertEqual(plan["SDAT.DAY"].kind, "DAY")
+        self.assertEqual((plan["NA.MG/L"].kind, plan["NA.MG/L"].decimals), ("NUMB", 2))
+        self.assertEqual((plan["SPNT."].kind, plan["SPNT."].decimals), ("NUMB", None))
+
+    def test_flags_and_bounds(self):
+        plan = self.plan("WAN")
+
+        self.assertFalse(plan["UWI."].nullable)
+        self.assertTrue(plan["WANC."].nullable)
+        self.assertFalse(plan["PHOBS."].allow_zero)
+        self.assertTrue(plan["PHOBS."].non_negative)
+        self.assertEqual(plan["SPNT."].codes, frozenset([20, 25, 30, 35, 40, 45, 50, 60, 70]))
+        self.assertEqual(plan["PHTMP.DEGC"].bounds, ((-100.00, 1000.00),))
+        self.assertTrue(plan["TTOPL.M"].depth)
+
+    def test_cross_field_links(self):
+        plan = self.plan("GAN")
+
+        self.assertEqual(plan["FS-SPRES.KPAA"].date_dependency, "FS-SDAT.DAY")
+        self.assertIsNone(plan["UWI."].date_dependency)
+
+
+if __name__ == "__main__":
+    unittest.main()
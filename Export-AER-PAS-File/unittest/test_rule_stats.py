@@ -0,0 +1,138 @@
+import io
+import os
+import sys
+import json
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+import export_to_pas
+from export_to_pas import PAS
+from pas_reader import read_pas
+from pas_validate import main
+from rule_graph import LiveValidation
+from rule_stats import RuleStats
+
+
+class TestRuleStats(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    wan = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+    def pas(self, data=None):
+        pas = PAS(self.file.copy())
+        pas.subset("WAN")
+        pas.data = data
+        return pas
+
+    def test_counts(self):
+        data = dict(self.wan)
+        data["PHOBS."] = "0"
+        data["TTOPL.M"] = "6000"
+        pas = self.pas(data)
+
+        stats = RuleStats()
+        with stats.attached(pas):
+            report = pas.check_pas_data(collect=True)
+        result = stats.to_dict()
+
+        self.assertEqual(result["rules"]["zero"]["failures"], 1)
+        # The depth pair is checked from both TTOPL.M and TBASL.M; the report keeps one.
+        self.assertEqual(result["rules"]["depths"]["failures"], 2)
+        self.assertNotIn("less_than", result["rules"])
+        self.assertEqual(result["rules"]["required"]["failures"], 0)
+        self.assertEqual(result["mnemonics"]["PHOBS."]["failures"], 1)
+        self.assertEqual(result["mnemonics"]["DSTLOC."]["calls"], 1)
+        self.assertEqual(len(report), 2)
+        for counts in result["rules"].values():
+            self.assertGreater(counts["calls"], 0)
+            self.assertGreaterEqual(counts["seconds"], 0)
+
+        self.assertEqual(json.loads(stats.to_json()), result)
+
+    def test_only_the_attached_pas(self):
+        check_required = export_to_pas.check_required
+        pas, other = self.pas(dict(self.wan)), self.pas(dict(self.wan))
+
+        stats = RuleStats()
+        with stats.attached(pas):
+            self.assertIs(export_to_pas.check_required, check_required)
+            self.assertIs(other.checks, export_to_pas.CHECKS)
+            with self.assertRaises(RuntimeError):
+                RuleStats().attach(pas)
+            other.check_pas_data(collect=True)
+        self.assertEqual(stats.to_dict()["rules"], {})
+
+        self.assertIs(pas.checks, export_to_pas.CHECKS)
+        self.assertIsNone(pas.stats)
+        pas.check_pas_data(collect=True)
+        self.assertEqual(stats.to_dict()["rules"], {})
+
+    def test_exit_mode_counts_failure(self):
+        data = dict(self.wan)
+        data["UWI."] = None
+        pas = self.pas(data)
+
+        stats = RuleStats()
+        with stats.attached(pas):
+            with self.assertRaises(SystemExit):
+                pas.check_pas_data()
+
+        self.assertEqual(stats.to_dict()["mnemonics"]["UWI."]["failures"], 1)
+
+    def test_rule_graph(self):
+        pas = self.pas()
+
+        stats = RuleStats()
+        with stats.attached(pas):
+            live = LiveValidation(pas, self.wan)
+            report = live.update("DSTLOC.", "T")
+
+        self.assertEqual(len(report), 1)
+        self.assertEqual(stats.to_dict()["rules"]["dstloc"]["calls"], 2)
+        self.assertEqual(stats.to_dict()["rules"]["dstloc"]["failures"], 1)
+
+    def test_frame(self):
+        rows = [dict(self.wan) for _ in range(4)]
+        rows[1]["PHOBS."] = "0"
+        rows[2]["PHOBS."] = "0"
+        rows[3]["TTOPL.M"] = "6000"
+        pas = self.pas()
+
+        stats = RuleStats()
+        with stats.attached(pas):
+            pas.validate_frame(pd.DataFrame(rows))
+        result = stats.to_dict()
+
+        self.assertEqual(result["rules"]["zero"]["failures"], 2)
+        # One call per row for each mnemonic the rule runs on.
+        self.assertEqual(result["rules"]["zero"]["calls"] % 4, 0)
+        self.assertEqual(result["mnemonics"]["PHOBS."]["failures"], 2)
+        self.assertEqual(result["rules"]["depths"]["failures"], 2)
+        self.assertEqual(result["rules"]["frame_data"]["calls"], 4)
+        self.assertNotIn(None, result["mnemonics"])
+
+    def test_merge(self):
+        pas = self.pas(dict(self.wan))
+        first = RuleStats()
+        with first.attached(pas):
+            pas.check_pas_data(collect=True)
+        merged = RuleStats().merge(first).merge(first.to_dict()).to_dict()
+
+        for rule, counts in first.to_dict()["rules"].items():
+            self.assertEqual(merged["rules"][rule]["calls"], 2 * counts["calls"])
+
+    def test_cli_stats(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.json")
+            main(["--jobs", "1", "--stats", path, "../example"], out=io.StringIO())
+
+            with open(path) as f:
+                result = json.load(f)
+
+        self.assertGreater(result["rules"]["required"]["calls"], 0)
+        self.assertGreater(sum(counts["failures"] for counts in result["rules"].values()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from parallel_validate import validate_files
+from pas_reader import read_pas
+from shared_spec import SharedSpec
+from spec_cache import load_spec_rows
+from spec_registry import SpecRegistry
+
+
+class TestSharedSpec(unittest.TestCase):
+    registry = SpecRegistry(load_spec_rows("pas_lookup.csv"))
+
+    def test_plans_round_trip(self):
+        with SharedSpec.publish(self.registry) as shared:
+            attached = SharedSpec.attach(shared.name)
+            registry = attached.registry()
+
+            self.assertEqual(sorted(registry.types()), sorted(self.registry.types()))
+            for pas_type in self.registry.types():
+                expected, pas = self.registry.validator(pas_type), registry.validator(pas_type)
+                self.assertEqual(pas.plan, expected.plan, pas_type)
+                self.assertEqual(pas.rows, expected.rows, pas_type)
+                self.assertEqual(pas.kinds, expected.kinds, pas_type)
+
+            registry = pas = None
+            attached.close()
+
+    def test_validate_matches(self):
+        data = read_pas("../example/GAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+        with SharedSpec.publish(self.registry) as shared:
+            registry = shared.registry()
+            self.assertEqual(registry.validate(dict(data)).messages(), self.registry.validate(dict(data)).messages())
+            with self.assertRaises(SystemExit):
+                registry.validator("XYZ")
+            registry = None
+
+    def test_unlinked_on_close(self):
+        shared = SharedSpec.publish(self.registry)
+        name = shared.name
+        shared.close()
+
+        with self.assertRaises(FileNotFoundError):
+            SharedSpec.attach(name)
+
+    def test_pool_workers(self):
+        directory = tempfile.mkdtemp()
+        try:
+            wan = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+            paths = []
+            for i in range(4):
+                data = dict(wan, **({"UWI.": None} if i % 2 else {}))
+                path = os.path.join(directory, "sample_%d.txt" % i)
+                pd.DataFrame([data]).to_csv(path, sep="\t", index=False)
+                paths.append(path)
+
+            shared = validate_files(paths, workers=2, spec_path="pas_lookup.csv", shared=True)
+            loaded = validate_files(paths, workers=2, spec_path="pas_lookup.csv")
+
+            self.assertEqual(shared.to_dicts(), loaded.to_dicts())
+            self.assertEqual([f.source for f in shared], [paths[1], paths[3]])
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
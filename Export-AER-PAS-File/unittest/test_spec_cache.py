@@ -0,0 +1,59 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+from pas_reader import read_pas
+from spec_cache import CACHE_SUFFIX, load_spec, read_cache
+
+
+class TestSpecCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "pas_lookup.csv")
+        shutil.copy("pas_lookup.csv", self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_cache_written_next_to_csv(self):
+        spec = load_spec(self.path)
+        cache = read_cache(self.path + CACHE_SUFFIX)
+
+        self.assertEqual(len(spec), 670)
+        self.assertEqual(len(cache["rows"]), 670)
+        self.assertEqual(load_spec(self.path).values.tolist(), spec.values.tolist())
+
+    def test_rebuilt_when_csv_changes(self):
+        load_spec(self.path)
+
+        with open(self.path, "a") as f:
+            f.write("NEW.,CHAR 1,NEW MNEMONIC,,,~ TEST DATA,WAN\n")
+
+        spec = load_spec(self.path)
+
+        self.assertEqual(len(spec), 671)
+        self.assertEqual(spec["MNEMONIC NAME"].iloc[-1], "NEW.")
+
+    def test_touched_csv_keeps_cache(self):
+        load_spec(self.path)
+        digest = read_cache(self.path + CACHE_SUFFIX)["hash"]
+        os.utime(self.path, ns=(0, 0))
+
+        self.assertEqual(len(load_spec(self.path)), 670)
+        self.assertEqual(read_cache(self.path + CACHE_SUFFIX)["mtime"], 0)
+        self.assertEqual(read_cache(self.path + CACHE_SUFFIX)["hash"], digest)
+
+    def test_validates_with_cached_spec(self):
+        pas = PAS(load_spec(self.path))
+        pas.subset("WAN")
+        pas.data = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+        self.assertTrue(pas.check_pas_data(collect=True).ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
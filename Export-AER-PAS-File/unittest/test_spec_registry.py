@@ -0,0 +1,48 @@
+import sys
+import glob
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from pas_reader import read_pas
+from spec_registry import SpecRegistry
+
+
+class TestSpecRegistry(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    registry = SpecRegistry(file)
+
+    def test_partitions(self):
+        self.assertEqual(
+            sorted(self.registry.types()), ["DST", "GAN", "GRD", "OAN", "PRD", "TRG", "WAN"]
+        )
+        self.assertEqual(sum(len(self.registry.view(t)) for t in self.registry.types()), 670)
+        self.assertTrue(self.registry.view("GAN")["ANALYSIS"].eq("GAN").all())
+
+    def test_validator_is_reused(self):
+        self.assertIs(self.registry.validator("WAN"), self.registry.validator("WAN"))
+        self.assertEqual(len(self.registry.validator("OAN").plan), 113)
+
+    def test_repeat_checks(self):
+        data = read_pas("../example/GAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+        first = self.registry.validate(data)
+        second = self.registry.validate(data)
+
+        self.assertGreater(len(first), 0)
+        self.assertEqual(first.messages(), second.messages())
+
+    def test_mixed_batch(self):
+        for path in sorted(glob.glob("../example/*.PAS")):
+            data = read_pas(path)
+            report = self.registry.validate(data)
+
+            self.assertEqual(report.ok, not path.split("/")[-1].startswith("GAN"), path)
+
+    def test_unknown_type(self):
+        with self.assertRaises(SystemExit):
+            self.registry.validator("XYZ")
+
+
+if __name__ == "__main__":
+    unittest.main()
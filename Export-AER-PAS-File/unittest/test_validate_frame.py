@@ -0,0 +1,91 @@
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS
+from pas_reader import read_pas
+
+
+class TestValidateFrame(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    wan = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+    gan = read_pas("../example/GAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+    def validate(self, analysis, rows):
+        pas = PAS(self.file.copy())
+        pas.subset(analysis)
+        return pas.validate_frame(pd.DataFrame(rows))
+
+    def test_valid_rows(self):
+        result = self.validate("WAN", [self.wan] * 3)
+
+        self.assertEqual(result.shape[0], 3)
+        self.assertFalse(result.notna().any().any())
+
+    def test_one_failure_per_row(self):
+        rows = [dict(self.wan) for _ in range(6)]
+        rows[1]["UWI."] = None
+        rows[2]["SPNT."] = "99"
+        rows[3]["PHOBS."] = "0"
+        rows[4]["PHTMP.DEGC"] = "1500"
+        rows[5]["TTOPL.M"] = "6000"
+
+        result = self.validate("WAN", rows)
+
+        self.assertFalse(result.loc[0].notna().any())
+        self.assertEqual(result.loc[1, "UWI."], "ERROR: UWI. must not be null.")
+        self.assertEqual(result.loc[2, "SPNT."], "ERROR: SPNT. must be a valid code.")
+        self.assertEqual(result.loc[3, "PHOBS."], "ERROR: PHOBS. must not be 0.")
+        self.assertEqual(result.loc[4, "PHTMP.DEGC"], "ERROR: PHTMP.DEGC must be in valid range.")
+        self.assertEqual(result.loc[5, "TTOPL.M"], "ERROR: TTOPL.M must be less than TBASL.M.")
+        self.assertEqual(result.loc[5, "TBASL.M"], "ERROR: TTOPL.M must be less than TBASL.M.")
+
+        for i in range(1, 5):
+            self.assertEqual(result.loc[i].notna().sum(), 1)
+
+    def test_dstloc(self):
+        rows = [dict(self.wan), dict(self.wan)]
+        rows[0]["DSTLOC."] = "T"
+        rows[1]["SPNT."] = "50"
+
+        result = self.validate("WAN", rows)
+
+        self.assertEqual(result.loc[0, "DSTLOC."], "ERROR: DSTLOC. must be null.")
+        self.assertEqual(result.loc[1, "DSTLOC."], "ERROR: DSTLOC. must not be null.")
+
+    def test_gan_section_gates(self):
+        rows = [dict(self.gan), dict(self.gan)]
+        rows[0]["HYDLP."] = "N"
+        rows[1]["SEPCOND."] = "B"
+
+        result = self.validate("GAN", rows)
+
+        self.assertEqual(result.loc[0, "CL-SPNT."], "ERROR: CL-SPNT. must be null.")
+        self.assertEqual(result.loc[1, "SS-SPNT."], "ERROR: SS-SPNT. must not be null.")
+        self.assertIsNone(result.loc[1, "CL-SPNT."])
+
+    def test_gate_values_must_be_numeric(self):
+        rows = [dict(self.gan, **{"LIQRDN.": "abc"}), dict(self.gan, **{"H2SMT.": "N", "FLDH2S.PPM": "abc"})]
+
+        result = self.validate("GAN", rows)
+
+        self.assertEqual(result.loc[0, "LIQRDN."], "ERROR: LIQRDN. must be numeric.")
+        self.assertEqual(result.loc[1, "FLDH2S.PPM"], "ERROR: FLDH2S.PPM must be numeric.")
+
+    def test_matches_check_pas_data(self):
+        row = dict(self.wan)
+        row["CL.MG/L"] = None
+
+        result = self.validate("WAN", [row])
+
+        pas = PAS(self.file.copy())
+        pas.subset("WAN")
+        pas.data = row
+        with self.assertRaises(SystemExit) as cm:
+            pas.check_pas_data()
+        self.assertEqual(result.loc[0, "CL.MG/L"], str(cm.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
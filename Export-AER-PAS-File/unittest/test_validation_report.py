@@ -0,0 +1,84 @@
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(1, "../")
+from export_to_pas import PAS, ValidationReport
+from pas_reader import read_pas
+
+
+class TestValidationReport(unittest.TestCase):
+    file = pd.read_csv("pas_lookup.csv", sep=",", header=0)
+    gan = read_pas("../example/GAN_Sansum Energy Inc_100021703910W50_2022-03-15.PAS")
+    wan = read_pas("../example/WAN_Sansum Energy Inc_100163003910W50_2021-11-25.PAS")
+
+    def check(self, analysis, data):
+        pas = PAS(self.file.copy())
+        pas.subset(analysis)
+        pas.data = data
+        return pas.check_pas_data(collect=True)
+
+    def test_valid_data(self):
+        report = self.check("WAN", dict(self.wan))
+
+        self.assertIsInstance(report, ValidationReport)
+        self.assertTrue(report.ok)
+        self.assertEqual(len(report), 0)
+
+    def test_collects_every_failure(self):
+        data = dict(self.wan)
+        data["UWI."] = None
+        data["SPNT."] = "99"
+        data["PHOBS."] = "0"
+        data["RDWTR."] = "abc"
+        data["TTOPL.M"] = "6000"
+
+        report = self.check("WAN", data)
+
+        self.assertFalse(report.ok)
+        self.assertEqual(
+            [(f.mnemonic, f.rule) for f in report],
+            [
+                ("UWI.", "required"),
+                ("TTOPL.M", "less_than"),
+                ("SPNT.", "code"),
+                ("RDWTR.", "numeric"),
+                ("PHOBS.", "zero"),
+            ],
+        )
+        self.assertIn("ERROR: UWI. must not be null.", report.messages())
+
+    def test_non_numeric_spnt(self):
+        data = dict(self.wan, **{"SPNT.": "abc", "DSTLOC.": "T"})
+
+        report = self.check("WAN", data)
+
+        self.assertEqual(report.messages()[:2], ["ERROR: SPNT. must be numeric.", "ERROR: DSTLOC. must be null."])
+        self.assertEqual(report.messages().count("ERROR: SPNT. must be numeric."), 1)
+
+    def test_first_failure_matches_exit(self):
+        data = dict(self.gan)
+
+        report = self.check("GAN", data)
+
+        pas = PAS(self.file.copy())
+        pas.subset("GAN")
+        pas.data = data
+        with self.assertRaises(SystemExit) as cm:
+            pas.check_pas_data()
+
+        self.assertEqual(report.messages()[0], str(cm.exception))
+        self.assertGreater(len(report), 1)
+
+    def test_to_frame(self):
+        data = dict(self.wan)
+        data["UWI."] = None
+
+        frame = self.check("WAN", data).to_frame()
+
+        self.assertEqual(list(frame.columns), ["mnemonic", "rule", "value", "message", "source"])
+        self.assertEqual(frame.loc[0, "mnemonic"], "UWI.")
+
+
+if __name__ == "__main__":
+    unittest.main()